@@ -1,25 +1,46 @@
 import dash
-from dash import Dash, html
+from dash import ALL, Dash, Input, Output, ctx, dcc, html
 import dash_bootstrap_components as dbc
 
+from olist import artifacts, datasets, memory, perf, render_cache, scenario
+
 # BI görünüm: kurumsal + okunaklı bir tema
 THEME = dbc.themes.FLATLY
 
-app = Dash(
-    __name__,
-    use_pages=True,
-    external_stylesheets=[THEME],
-    suppress_callback_exceptions=True,
-)
+# Layout'u istek anında artefakttan kurulan sayfaların verisi: varsayılan veri seti worker açılışında bir kez yüklenir
+WARM_ARTIFACTS = ("financial_index", "product_categories", "customer_segments", "seller_cohorts",
+                  "state_flows", "review_topics", "review_keywords")
+
+# Sayfalar import edilirken ve ısınmada kurulan artefaktlar ham veriyi paylaşır
+# (soğuk açılışta CSV'ler ve özellik hesapları bir kez çalışır)
+with artifacts.shared_build():
+    app = Dash(
+        __name__,
+        use_pages=True,
+        external_stylesheets=[THEME],
+        suppress_callback_exceptions=True,
+    )
+    for name, exc in datasets.warm(WARM_ARTIFACTS).items():
+        print(f"Artefakt yüklenemedi ({name}): {exc}")
+server = app.server  # gunicorn app:server
 
 # Net menü sırası (storytelling) — Set A
 NAV_ITEMS = [
     ("Memnuniyet Sürücüleri", "/memnuniyet"),
     ("Finansal Özet", "/"),
     ("Portföy Optimizasyonu", "/satici-etkisi"),
+    ("Satıcı Listesi", "/satici-listesi"),
+    ("Kategori Kârlılığı", "/kategori-karlilik"),
+    ("Müşteri Segmentleri", "/musteri-segmentleri"),
+    ("Satıcı Kohortları", "/satici-kohortlari"),
+    ("Coğrafi Performans", "/cografya"),
     ("Metodoloji", "/hakkinda"),
 ]
 
+# Veri seti seçimi (?dataset=) bu sayfalarda geçerlidir; diğerleri varsayılan veri setini gösterir
+DATASET_PAGES = {"/", "/kategori-karlilik", "/musteri-segmentleri", "/satici-kohortlari", "/cografya"}
+DATASET_NAMES = datasets.names()
+
 BRAND_STYLE = {
     "fontWeight": "800",
     "letterSpacing": "0.2px",
@@ -35,12 +56,25 @@ navbar = dbc.Navbar(
                 className="me-3",
             ),
 
+            # Veri seti (birden fazla tanımlıysa görünür; OLIST_DATASETS)
+            html.Div(
+                dcc.Dropdown(
+                    id="dataset_select",
+                    options=[{"label": n, "value": n} for n in DATASET_NAMES],
+                    value=datasets.DEFAULT,
+                    clearable=False,
+                    style={"minWidth": "160px"},
+                ),
+                style={"display": "block" if len(DATASET_NAMES) > 1 else "none"},
+            ),
+
             # Sağ taraf: menü (pills)
             dbc.Nav(
                 [
                     dbc.NavItem(
                         dbc.NavLink(
                             label,
+                            id={"type": "nav_link", "path": path},
                             href=path,
                             active="exact",
                             className="px-3",
@@ -72,6 +106,7 @@ navbar = dbc.Navbar(
 # BI standardı: sayfa içeriğini ortala + boşlukları sabitle
 app.layout = html.Div(
     [
+        dcc.Location(id="url", refresh=False),
         navbar,
         html.Div(
             dash.page_container,
@@ -85,5 +120,44 @@ app.layout = html.Div(
     style={"backgroundColor": "#f4f6fb", "minHeight": "100vh"},
 )
 
+# -----------------------------
+# Veri seti: URL (?dataset=) ↔ açılır menü, menü linkleri seçimi korur
+# -----------------------------
+@dash.callback(
+    Output("url", "search"),
+    Output("dataset_select", "value"),
+    Input("url", "search"),
+    Input("dataset_select", "value"),
+)
+def sync_dataset(search, selected):
+    if ctx.triggered_id == "dataset_select":
+        name = datasets.resolve(selected)
+        return ("" if name == datasets.DEFAULT else f"?dataset={name}"), name
+    return dash.no_update, datasets.from_search(search)
+
+@dash.callback(
+    Output({"type": "nav_link", "path": ALL}, "href"),
+    Output("dataset_select", "disabled"),
+    Input("url", "search"),
+    Input("url", "pathname"),
+)
+def update_nav(search, pathname):
+    name = datasets.from_search(search)
+    suffix = "" if name == datasets.DEFAULT else f"?dataset={name}"
+    return [path + suffix for _, path in NAV_ITEMS], pathname not in DATASET_PAGES
+
+# Opt-in performans ölçümü (OLIST_PERF=1): /_perf + Server-Timing başlıkları
+perf.install(app.server)
+
+# Bellek raporu (/_memory) + OLIST_MEMORY_BUDGET_MB aşılırsa worker açılışta durur
+memory.install(app.server)
+memory.enforce_budget()
+
+# Toplu senaryo API'si (/api/scenarios): diğer ekiplerin servisleri ve notebook'lar için
+scenario.install(app.server)
+
+# Önceden render edilmiş sayfalar (register_page(..., render_cache=...)): gzip + ETag, kabukta 304
+render_cache.install(app)
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,74 @@
+"""
+Import-time budget check for dashboard workers.
+
+Each module is imported in a fresh interpreter with `-X importtime`; the check
+fails if its cumulative import time exceeds the budget or if it pulls in a
+plotting / statistics dependency that should only load on first use.
+
+    python -m benchmarks.import_budget            # olist modules only
+    python -m benchmarks.import_budget --app      # also import app.py (needs data/)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# cumulative import time budget per module, in seconds
+BUDGETS = {
+    "olist": 0.05,
+    "olist.utils": 0.05,
+    "olist.data": 1.0,
+    "olist.order": 1.0,
+    "olist.seller_updated": 1.0,
+    "olist.product_updated": 1.0,
+}
+APP_BUDGET = 5.0
+
+# must not be imported just by loading the module
+LAZY_ONLY = ["matplotlib", "seaborn", "statsmodels", "sklearn", "plotly.express"]
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str) -> dict:
+    code = PROBE.format(module=module, lazy=LAZY_ONLY)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", action="store_true", help="also check app.py (loads the datasets)")
+    args = parser.parse_args(argv)
+
+    budgets = dict(BUDGETS)
+    if args.app:
+        budgets["app"] = APP_BUDGET
+
+    failed = False
+    for module, budget in budgets.items():
+        res = measure(module)
+        ok = res["elapsed"] <= budget and not res["loaded"]
+        failed |= not ok
+        extra = f"  eagerly loaded: {', '.join(res['loaded'])}" if res["loaded"] else ""
+        print(f"{'OK  ' if ok else 'FAIL'} {module:<24} {res['elapsed']:.3f}s / {budget:.3f}s{extra}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
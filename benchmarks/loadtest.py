@@ -0,0 +1,422 @@
+"""
+Local load test for the Dash server.
+
+Drives the real callback endpoint (`/_dash-update-component`) the way the
+browser does — same payloads, one HTTP request per callback — with a closed
+loop of N concurrent virtual users, and reports throughput and p50/p95/p99
+latency per callback and per page. Component bounds (slider max, month range,
+state options, table columns) are discovered from the served page layouts, so
+the tool follows whatever dataset the server runs on.
+
+By default a server is started on synthetic data (see benchmarks/synth.py):
+
+    python -m benchmarks.loadtest --concurrency 1 4 16 --duration 20
+    python -m benchmarks.loadtest --scale 10 --workers 4 --threads 2   # gunicorn
+    python -m benchmarks.loadtest --url http://127.0.0.1:8050 --mix slider=1
+    python -m benchmarks.loadtest --distribution hot --json out.json
+
+Virtual users are client threads of this process; at high concurrency run
+the server with --workers so the two do not compete for the same GIL.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import requests
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+
+DISTRIBUTIONS = ("uniform", "hot", "sweep")
+DEFAULT_MIX = {"slider": 5, "home": 2, "leaderboard": 2, "pages": 1}
+
+
+# -----------------------------
+# Dash protocol helpers
+# -----------------------------
+def _parse_outputs(output: str) -> list[dict]:
+    """'..a.figure...b.children..' (multi) or 'a.figure' → [{id, property}]."""
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    return [dict(zip(("id", "property"), p.rsplit(".", 1))) for p in parts]
+
+
+def find_component(tree, component_id: str) -> dict | None:
+    """Depth-first search of a serialized layout for the props of `component_id`."""
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            props = node.get("props")
+            if isinstance(props, dict) and props.get("id") == component_id:
+                return props
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+class DashClient:
+    """Thread-safe client: one keep-alive session per thread."""
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+        self.dependencies = self.session.get(f"{self.url}/_dash-dependencies", timeout=timeout).json()
+
+    @property
+    def session(self) -> requests.Session:
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = self._local.session = requests.Session()
+        return s
+
+    def dependency(self, input_key: str) -> dict:
+        """Callback spec triggered by `id.property`."""
+        for dep in self.dependencies:
+            if any(f"{i['id']}.{i['property']}" == input_key for i in dep["inputs"]):
+                return dep
+        raise KeyError(f"no callback has input {input_key}")
+
+    def callback(self, dep: dict, values: dict, changed: list[str] | None = None) -> requests.Response:
+        def props(specs):
+            return [{**s, "value": values.get(f"{s['id']}.{s['property']}")} for s in specs]
+
+        outputs = _parse_outputs(dep["output"])
+        payload = {
+            "output": dep["output"],
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": props(dep["inputs"]),
+            "state": props(dep["state"]),
+            "changedPropIds": changed if changed is not None else list(values),
+        }
+        return self.session.post(f"{self.url}/_dash-update-component", json=payload, timeout=self.timeout)
+
+    def route(self, pathname: str, search: str = "") -> requests.Response:
+        dep = self.dependency("_pages_location.pathname")
+        return self.callback(dep, {"_pages_location.pathname": pathname, "_pages_location.search": search})
+
+    def page_layout(self, pathname: str):
+        body = self.route(pathname).json()
+        return body["response"]["_pages_content"]["children"]
+
+
+# -----------------------------
+# Scenarios: each call performs one request and returns (name, response)
+# -----------------------------
+class SliderScenario:
+    """Portföy optimizasyonu slider'ı (remove_sellers)."""
+
+    def __init__(self, client: DashClient, distribution: str = "uniform", n_hot: int = 20):
+        props = find_component(client.page_layout("/satici-etkisi"), "remove_sellers")
+        self.max = int(props["max"])
+        self.distribution = distribution
+        self.dep = client.dependency("remove_sellers.value")
+        rng = random.Random(0)
+        self.hot_values = rng.sample(range(self.max + 1), min(n_hot, self.max + 1))
+        # Zipf-like popularity: a few values take most of the traffic
+        self.hot_weights = [1 / (i + 1) for i in range(len(self.hot_values))]
+
+    def value(self, rng: random.Random, state: dict) -> int:
+        if self.distribution == "hot":
+            return rng.choices(self.hot_values, self.hot_weights)[0]
+        if self.distribution == "sweep":
+            # dragging the handle: small steps from the previous position
+            pos = state.get("slider", rng.randint(0, self.max))
+            pos = min(max(pos + rng.randint(-max(self.max // 100, 1), max(self.max // 100, 1)), 0), self.max)
+            state["slider"] = pos
+            return pos
+        return rng.randint(0, self.max)
+
+    def __call__(self, client: DashClient, rng: random.Random, state: dict):
+        v = self.value(rng, state)
+        return "callback:remove_sellers", client.callback(self.dep, {"remove_sellers.value": v})
+
+
+class HomeFilterScenario:
+    """Finansal özet filtreleri (eyalet + ay aralığı)."""
+
+    def __init__(self, client: DashClient):
+        layout = client.page_layout("/")
+        self.states = [o["value"] for o in find_component(layout, "home_states").get("options") or []]
+        self.last_month = int(find_component(layout, "home_months")["max"])
+        self.dep = client.dependency("home_states.value")
+
+    def __call__(self, client: DashClient, rng: random.Random, state: dict):
+        states = rng.sample(self.states, rng.randint(0, min(3, len(self.states)))) or None
+        start = rng.randint(0, self.last_month)
+        end = rng.randint(start, self.last_month)
+        return "callback:home_filters", client.callback(
+            self.dep, {"home_states.value": states, "home_months.value": [start, end],
+                       "home_financing.value": rng.random() < 0.3}
+        )
+
+
+class LeaderboardScenario:
+    """Satıcı listesi: sayfalama, sıralama ve ara sıra filtre."""
+
+    FILTERS = ("", "", "", "{n_orders} > 10", "{review_score} < 3", "{seller_state} contains S")
+
+    def __init__(self, client: DashClient):
+        props = find_component(client.page_layout("/satici-listesi"), "leaderboard_table")
+        self.columns = [c["id"] for c in props["columns"]]
+        self.page_size = props.get("page_size") or 25
+        self.dep = client.dependency("leaderboard_table.page_current")
+
+    def __call__(self, client: DashClient, rng: random.Random, state: dict):
+        # early pages are far more common than deep ones
+        page = min(int(rng.expovariate(0.5)), 200)
+        sort_by = [{"column_id": rng.choice(self.columns), "direction": rng.choice(("asc", "desc"))}]
+        return "callback:leaderboard_table", client.callback(self.dep, {
+            "leaderboard_table.page_current": page,
+            "leaderboard_table.page_size": self.page_size,
+            "leaderboard_table.sort_by": sort_by,
+            "leaderboard_table.filter_query": rng.choice(self.FILTERS),
+        })
+
+
+class PageScenario:
+    """Sayfa açılışı: HTML + sayfa yönlendirme callback'i (layout üretimi)."""
+
+    def __init__(self, client: DashClient):
+        layout = client.session.get(f"{client.url}/_dash-layout", timeout=client.timeout).json()
+        self.paths = sorted({
+            href for href in _walk_props(layout, "href")
+            if isinstance(href, str) and href.startswith("/") and not href.startswith("/_")
+        }) or ["/"]
+
+    def __call__(self, client: DashClient, rng: random.Random, state: dict):
+        path = rng.choice(self.paths)
+        start = time.perf_counter()
+        html = client.session.get(f"{client.url}{path}", timeout=client.timeout)
+        if html.status_code != 200:
+            return f"page:{path}", html
+        resp = client.route(path)
+        resp.elapsed_total = time.perf_counter() - start
+        return f"page:{path}", resp
+
+
+def _walk_props(tree, key: str):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            props = node.get("props")
+            if isinstance(props, dict) and key in props:
+                yield props[key]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+SCENARIOS = {
+    "slider": SliderScenario,
+    "home": HomeFilterScenario,
+    "leaderboard": LeaderboardScenario,
+    "pages": PageScenario,
+}
+
+
+# -----------------------------
+# Load generation
+# -----------------------------
+def run_level(client: DashClient, scenarios: dict, weights: dict, concurrency: int,
+              duration: float, seed: int) -> dict:
+    names = list(scenarios)
+    w = [weights[n] for n in names]
+    samples: dict[str, list] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    out_bytes: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def user(idx: int):
+        rng = random.Random(seed * 1000 + idx)
+        state: dict = {}
+        while time.perf_counter() < deadline:
+            scenario = scenarios[rng.choices(names, w)[0]]
+            start = time.perf_counter()
+            try:
+                name, resp = scenario(client, rng, state)
+                ok = resp.status_code in (200, 204)
+                size = len(resp.content)
+            except requests.RequestException as exc:
+                name, ok, size = f"error:{type(exc).__name__}", False, 0
+            elapsed = getattr(resp, "elapsed_total", None) if ok else None
+            elapsed = elapsed or (time.perf_counter() - start)
+            with lock:
+                if ok:
+                    samples[name].append(elapsed)
+                    out_bytes[name] += size
+                else:
+                    errors[name] += 1
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    report = {}
+    for name in sorted(set(samples) | set(errors)):
+        lat = np.asarray(samples.get(name, []), dtype=float) * 1000
+        n = len(lat)
+        report[name] = {
+            "requests": n,
+            "errors": errors.get(name, 0),
+            "rps": n / wall,
+            "p50_ms": float(np.percentile(lat, 50)) if n else float("nan"),
+            "p95_ms": float(np.percentile(lat, 95)) if n else float("nan"),
+            "p99_ms": float(np.percentile(lat, 99)) if n else float("nan"),
+            "mean_kb": out_bytes.get(name, 0) / n / 1024 if n else 0.0,
+        }
+    total = sum(r["requests"] for r in report.values())
+    return {
+        "concurrency": concurrency,
+        "seconds": wall,
+        "requests": total,
+        "errors": sum(r["errors"] for r in report.values()),
+        "rps": total / wall,
+        "by_name": report,
+    }
+
+
+def print_level(level: dict):
+    print(f"\nconcurrency {level['concurrency']}: {level['requests']} requests, "
+          f"{level['errors']} errors, {level['rps']:.1f} req/s")
+    print(f"  {'name':<32}{'req':>7}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'KB':>8}")
+    for name, r in level["by_name"].items():
+        print(f"  {name:<32}{r['requests']:>7}{r['errors']:>5}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['mean_kb']:>8.1f}")
+
+
+# -----------------------------
+# Local server
+# -----------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(data_dir: Path, workers: int, threads: int, timeout: float) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {**os.environ, "OLIST_DATA_DIR": str(data_dir), "PYTHONPATH": str(PROJECT_ROOT)}
+    if workers:
+        cmd = [sys.executable, "-m", "gunicorn", "app:server", "-w", str(workers), "--threads", str(threads),
+               "-b", f"127.0.0.1:{port}", "--timeout", str(int(timeout))]
+    else:
+        cmd = [sys.executable, "-m", "benchmarks.loadtest", "--serve", str(port)]
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            if requests.get(f"{url}/_dash-dependencies", timeout=2).ok:
+                return proc, url
+        except requests.RequestException:
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"server did not start within {timeout:.0f}s")
+
+
+def serve(port: int):
+    """Flask's threaded server, without the reloader/debugger of app.py's __main__."""
+    import logging
+
+    from app import app
+
+    # per-request access log lines would dominate the report output
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    app.server.run(host="127.0.0.1", port=port, threaded=True)
+
+
+def _parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}, choose from {sorted(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--scale", type=float, default=1.0, help="synthetic dataset scale for the local server")
+    parser.add_argument("--data-dir", type=Path, help="serve this CSV folder instead of synthetic data")
+    parser.add_argument("--workers", type=int, default=0, help="gunicorn workers (0 = Flask threaded server)")
+    parser.add_argument("--threads", type=int, default=1, help="threads per gunicorn worker")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=15, help="seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=3, help="seconds of single-user warmup")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="scenario weights, e.g. slider=5,home=2,leaderboard=2,pages=1")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform",
+                        help="slider values: uniform, hot (few popular values) or sweep (dragging)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--json", type=Path, help="write the full report as JSON")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+
+    proc = None
+    url = args.url
+    if url is None:
+        if args.data_dir:
+            data_dir = args.data_dir
+        else:
+            from benchmarks.run import dataset_dir
+            data_dir = dataset_dir(args.scale, args.seed)
+        print(f"starting server on {data_dir} ...", flush=True)
+        proc, url = start_server(data_dir, args.workers, args.threads, args.startup_timeout)
+
+    try:
+        client = DashClient(url)
+        scenarios = {name: SCENARIOS[name](client) if name != "slider"
+                     else SliderScenario(client, args.distribution) for name in args.mix}
+        if args.warmup:
+            run_level(client, scenarios, args.mix, 1, args.warmup, args.seed)
+
+        levels = []
+        for c in args.concurrency:
+            level = run_level(client, scenarios, args.mix, c, args.duration, args.seed)
+            print_level(level)
+            levels.append(level)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "url": url, "workers": args.workers, "threads": args.threads, "mix": args.mix,
+            "distribution": args.distribution, "levels": levels,
+        }, indent=2))
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Benchmark suite for the feature pipelines and the portfolio callback.
+
+For every scale the synthetic dataset is generated once (cached under
+benchmarks/.data/), then each stage runs in a fresh interpreter pointed at
+it through OLIST_DATA_DIR, so wall time and peak RSS are isolated per stage.
+Results are compared against benchmarks/baseline.json.
+
+    python -m benchmarks.run                         # scale 1
+    python -m benchmarks.run --scales 1 10 100
+    python -m benchmarks.run --scales 1 --update-baseline
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.synth import generate
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+DATA_ROOT = BENCH_DIR / ".data"
+BASELINE = BENCH_DIR / "baseline.json"
+
+# time or memory above baseline * TOLERANCE is reported as a regression
+TOLERANCE = 1.25
+
+
+# -----------------------------
+# Stages (run inside the child interpreter)
+# -----------------------------
+def _stage_order_training():
+    from olist.order import Order
+    return len(Order().get_training_data())
+
+
+def _stage_seller_training():
+    from olist.seller_updated import Seller
+    return len(Seller().get_training_data())
+
+
+def _stage_product_training():
+    from olist.product_updated import Product
+    return len(Product().get_training_data())
+
+
+def _stage_app_import():
+    import app  # noqa: F401  (pages compute their data at import)
+    return 0
+
+
+def _stage_update_scenario():
+    import app  # noqa: F401
+    import pages.seller_impact as page
+
+    values = [0, page.BEST_REMOVE_N, page.TOTAL_SELLERS // 4, page.TOTAL_SELLERS // 2, page.TOTAL_SELLERS]
+    start = time.perf_counter()
+    for v in values:
+        page.update_scenario(v)
+    # reported per callback call, excluding the app import
+    return (time.perf_counter() - start) / len(values)
+
+
+STAGES = {
+    "order_training": _stage_order_training,
+    "seller_training": _stage_seller_training,
+    "product_training": _stage_product_training,
+    "app_import": _stage_app_import,
+    "update_scenario": _stage_update_scenario,
+}
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+
+
+def run_stage_in_child(stage: str) -> dict:
+    start = time.perf_counter()
+    result = STAGES[stage]()
+    seconds = time.perf_counter() - start
+    if stage == "update_scenario":
+        seconds, result = result, 0
+    return {"seconds": seconds, "peak_rss_mb": _peak_rss_mb(), "rows": result}
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def dataset_dir(scale: float, seed: int) -> Path:
+    path = DATA_ROOT / f"scale_{scale:g}_seed_{seed}"
+    if not (path / "olist_orders_dataset.csv").exists():
+        print(f"generating synthetic data (scale {scale:g}) → {path}", flush=True)
+        generate(scale, path, seed)
+    return path
+
+
+def run_stage(stage: str, data_dir: Path, repeat: int = 3) -> dict:
+    """Best-of-`repeat` wall time (least noisy), largest peak RSS."""
+    env = {**os.environ, "OLIST_DATA_DIR": str(data_dir), "PYTHONPATH": str(PROJECT_ROOT)}
+    # measure the feature pipelines themselves, not artifact loading (OLIST_ARTIFACTS=on to compare)
+    env.setdefault("OLIST_ARTIFACTS", "off")
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--child", stage],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "seconds": min(r["seconds"] for r in runs),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+        "rows": runs[0]["rows"],
+    }
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    regressions = []
+    for scale, stages in results.items():
+        for stage, res in stages.items():
+            base = baseline.get(scale, {}).get(stage)
+            if not base or "error" in res or "error" in base:
+                continue
+            for metric in ("seconds", "peak_rss_mb"):
+                if res[metric] > base[metric] * TOLERANCE:
+                    regressions.append(
+                        f"scale {scale} {stage}: {metric} {res[metric]:.3f} vs baseline {base[metric]:.3f}"
+                    )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, fastest is kept")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="also write results as JSON")
+    parser.add_argument("--child", choices=list(STAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_stage_in_child(args.child)))
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results: dict[str, dict] = {}
+
+    for scale in args.scales:
+        key = f"{scale:g}"
+        data_dir = dataset_dir(scale, args.seed)
+        results[key] = {}
+        for stage in args.stages:
+            res = run_stage(stage, data_dir, args.repeat)
+            results[key][stage] = res
+            base = baseline.get(key, {}).get(stage, {})
+            if "error" in res:
+                print(f"scale {key:>4} {stage:<18} ERROR {res['error']}", flush=True)
+                continue
+            ratio = f"  (x{res['seconds'] / base['seconds']:.2f} vs baseline)" if base.get("seconds") else ""
+            print(f"scale {key:>4} {stage:<18} {res['seconds']:9.3f}s  {res['peak_rss_mb']:9.1f} MB{ratio}", flush=True)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        merged = {**baseline, **{k: {**baseline.get(k, {}), **v} for k, v in results.items()}}
+        args.baseline.write_text(json.dumps(merged, indent=2) + "\n")
+        print(f"baseline updated → {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
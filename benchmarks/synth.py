@@ -0,0 +1,236 @@
+"""
+Seeded generator of Olist-shaped CSVs for the benchmarks.
+
+Scale 1 matches the public Olist dataset's key cardinalities
+(~99k orders, ~113k items, 3.1k sellers, 33k products); scale 10 / 100
+multiply every fact and dimension table. Geolocation is kept at ~1M rows
+for every scale because zip prefixes are geographic, not volume-driven.
+
+Shape features that matter for the pipelines:
+- power-law seller and product popularity,
+- ~10% multi-item orders, part of them split across several sellers,
+- review scores skewed towards 5★, with late deliveries pulled towards 1★,
+- repeat customers via shared customer_unique_id.
+
+    python -m benchmarks.synth --scale 10 --out benchmarks/.data/scale_10
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+BASE = {
+    "orders": 99_441,
+    "sellers": 3_095,
+    "products": 32_951,
+    "geolocation": 1_000_163,
+    "zip_prefixes": 19_015,
+}
+STATES = np.array(["SP", "RJ", "MG", "RS", "PR", "SC", "BA", "DF", "ES", "GO",
+                   "PE", "CE", "PA", "MT", "MA", "MS", "PB", "PI", "RN", "AL",
+                   "SE", "TO", "RO", "AM", "AC", "AP", "RR"])
+STATE_P = np.array([42, 13, 12, 5.5, 5, 3.7, 3.4, 2.2, 2, 2, 1.7, 1.3, 1, .9,
+                    .8, .7, .5, .5, .5, .4, .3, .3, .3, .15, .1, .07, .05])
+STATE_P = STATE_P / STATE_P.sum()
+
+ITEMS_PER_ORDER_P = [0.90, 0.075, 0.015, 0.005, 0.005]        # 1..5 items
+MULTI_SELLER_SHARE = 0.15                                       # of multi-item orders
+REVIEW_P_ON_TIME = [0.08, 0.03, 0.08, 0.20, 0.61]               # 1★..5★
+REVIEW_P_LATE = [0.45, 0.08, 0.12, 0.15, 0.20]
+PAYMENT_TYPES = ["credit_card", "boleto", "voucher", "debit_card"]
+PAYMENT_P = [0.74, 0.19, 0.055, 0.015]
+
+
+def hex_ids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """n distinct 32-char hex ids (Olist style)."""
+    hi = rng.integers(0, 2**63, n, dtype=np.int64)
+    lo = np.arange(n, dtype=np.int64) * 2_654_435_761 % 2**61
+    return np.char.add(np.char.mod("%016x", hi), np.char.mod("%016x", lo))
+
+
+def power_law_p(n: int, alpha: float) -> np.ndarray:
+    p = 1.0 / np.arange(1, n + 1) ** alpha
+    return p / p.sum()
+
+
+def generate(scale: float, out: Path, seed: int = 42) -> dict[str, int]:
+    """Writes the nine Olist CSVs into `out` and returns their row counts."""
+    rng = np.random.default_rng(seed)
+    out.mkdir(parents=True, exist_ok=True)
+
+    n_orders = int(BASE["orders"] * scale)
+    n_sellers = int(BASE["sellers"] * scale)
+    n_products = int(BASE["products"] * scale)
+    n_zips = BASE["zip_prefixes"]
+
+    zips = np.sort(rng.choice(np.arange(1000, 99_999), n_zips, replace=False))
+    zip_state = rng.choice(STATES, n_zips, p=STATE_P)
+
+    # Geolocation: several (lat, lng) per zip prefix
+    geo_zip = rng.integers(0, n_zips, BASE["geolocation"])
+    geo = pd.DataFrame({
+        "geolocation_zip_code_prefix": zips[geo_zip],
+        "geolocation_lat": rng.uniform(-33, -2, n_zips)[geo_zip] + rng.normal(0, 0.05, len(geo_zip)),
+        "geolocation_lng": rng.uniform(-60, -35, n_zips)[geo_zip] + rng.normal(0, 0.05, len(geo_zip)),
+        "geolocation_city": "cidade",
+        "geolocation_state": zip_state[geo_zip],
+    })
+
+    # Sellers
+    seller_zip = rng.integers(0, n_zips, n_sellers)
+    sellers = pd.DataFrame({
+        "seller_id": hex_ids(rng, n_sellers),
+        "seller_zip_code_prefix": zips[seller_zip],
+        "seller_city": "cidade",
+        "seller_state": zip_state[seller_zip],
+    })
+
+    # Products
+    categories = pd.read_csv(PROJECT_ROOT / "data" / "product_category_name_translation.csv")
+    categories = categories.iloc[:, 0].to_numpy()
+    products = pd.DataFrame({
+        "product_id": hex_ids(rng, n_products),
+        "product_category_name": categories[rng.choice(len(categories), n_products, p=power_law_p(len(categories), 1.0))],
+        "product_name_lenght": rng.integers(5, 76, n_products),
+        "product_description_lenght": rng.integers(4, 3_990, n_products),
+        "product_photos_qty": rng.choice([1, 2, 3, 4, 5, 6], n_products, p=[.5, .2, .14, .08, .05, .03]),
+        "product_weight_g": rng.lognormal(6.6, 1.2, n_products).round(),
+        "product_length_cm": rng.integers(7, 105, n_products),
+        "product_height_cm": rng.integers(2, 105, n_products),
+        "product_width_cm": rng.integers(6, 118, n_products),
+    })
+
+    # Customers: one customer_id per order, ~3% repeat buyers
+    customer_ids = hex_ids(rng, n_orders)
+    n_unique = int(n_orders * 0.97)
+    unique_ids = hex_ids(rng, n_unique)
+    unique_of_order = np.concatenate([np.arange(n_unique), rng.integers(0, n_unique, n_orders - n_unique)])
+    rng.shuffle(unique_of_order)
+    customer_zip = rng.integers(0, n_zips, n_unique)[unique_of_order]
+    customers = pd.DataFrame({
+        "customer_id": customer_ids,
+        "customer_unique_id": unique_ids[unique_of_order],
+        "customer_zip_code_prefix": zips[customer_zip],
+        "customer_city": "cidade",
+        "customer_state": zip_state[customer_zip],
+    })
+
+    # Orders: volume grows over time (sqrt of uniform → more recent orders)
+    start, end = pd.Timestamp("2016-09-04"), pd.Timestamp("2018-08-29")
+    span_h = (end - start) / pd.Timedelta(hours=1)
+    purchase = start + pd.to_timedelta(np.sqrt(rng.uniform(0, 1, n_orders)) * span_h, unit="h")
+    carrier_days = rng.gamma(2.0, 1.6, n_orders)
+    transit_days = rng.gamma(3.0, 3.0, n_orders)
+    estimated_days = rng.normal(23.5, 6.0, n_orders).clip(5)
+    status = rng.choice(["delivered", "shipped", "canceled", "unavailable", "invoiced", "processing"],
+                        n_orders, p=[0.970, 0.011, 0.006, 0.006, 0.004, 0.003])
+    delivered = status == "delivered"
+
+    orders = pd.DataFrame({
+        "order_id": hex_ids(rng, n_orders),
+        "customer_id": customer_ids,
+        "order_status": status,
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": purchase + pd.to_timedelta(rng.exponential(10, n_orders), unit="h"),
+        "order_delivered_carrier_date": (purchase + pd.to_timedelta(carrier_days, unit="D")).where(delivered),
+        "order_delivered_customer_date": (purchase + pd.to_timedelta(carrier_days + transit_days, unit="D")).where(delivered),
+        "order_estimated_delivery_date": (purchase + pd.to_timedelta(estimated_days, unit="D")).normalize(),
+    })
+    late = (carrier_days + transit_days) > estimated_days
+
+    # Items: power-law sellers and products, some multi-item orders split across sellers
+    n_items = rng.choice(np.arange(1, 6), n_orders, p=ITEMS_PER_ORDER_P)
+    item_order = np.repeat(np.arange(n_orders), n_items)
+    item_no = np.arange(len(item_order)) - np.repeat(np.cumsum(n_items) - n_items, n_items) + 1
+
+    seller_p = power_law_p(n_sellers, 0.9)
+    seller_of_order = rng.choice(n_sellers, n_orders, p=seller_p)
+    item_seller = seller_of_order[item_order]
+    split = (n_items[item_order] > 1) & (rng.uniform(0, 1, n_orders) < MULTI_SELLER_SHARE)[item_order] & (item_no > 1)
+    item_seller[split] = rng.choice(n_sellers, int(split.sum()), p=seller_p)
+
+    items = pd.DataFrame({
+        "order_id": orders["order_id"].to_numpy()[item_order],
+        "order_item_id": item_no,
+        "product_id": products["product_id"].to_numpy()[rng.choice(n_products, len(item_order), p=power_law_p(n_products, 0.8))],
+        "seller_id": sellers["seller_id"].to_numpy()[item_seller],
+        "shipping_limit_date": purchase[item_order] + pd.Timedelta(days=6),
+        "price": rng.lognormal(4.4, 0.95, len(item_order)).round(2),
+        "freight_value": rng.lognormal(2.9, 0.55, len(item_order)).round(2),
+    })
+
+    # Reviews: ~99.8% of orders, skewed to 5★, late deliveries pulled to 1★
+    reviewed = rng.uniform(0, 1, n_orders) < 0.998
+    score = np.where(
+        late & delivered,
+        rng.choice(np.arange(1, 6), n_orders, p=REVIEW_P_LATE),
+        rng.choice(np.arange(1, 6), n_orders, p=REVIEW_P_ON_TIME),
+    )
+    messages = np.array(["", "", "", "produto chegou no prazo", "recomendo", "ainda nao recebi o produto",
+                         "veio com defeito", "entrega atrasada", "otimo vendedor"])
+    review_date = (purchase + pd.to_timedelta(carrier_days + transit_days + 1, unit="D")).normalize()
+    reviews = pd.DataFrame({
+        "review_id": hex_ids(rng, n_orders),
+        "order_id": orders["order_id"],
+        "review_score": score,
+        "review_comment_title": "",
+        "review_comment_message": messages[rng.integers(0, len(messages), n_orders)],
+        "review_creation_date": review_date,
+        "review_answer_timestamp": review_date + pd.Timedelta(days=2),
+    })[reviewed]
+
+    # Payments: split order value over 1-3 payments
+    order_value = np.bincount(item_order, weights=(items["price"] + items["freight_value"]).to_numpy(), minlength=n_orders)
+    n_pay = rng.choice([1, 2, 3], n_orders, p=[0.97, 0.025, 0.005])
+    pay_order = np.repeat(np.arange(n_orders), n_pay)
+    pay_type = rng.choice(PAYMENT_TYPES, len(pay_order), p=PAYMENT_P)
+    installments = np.where(pay_type == "credit_card",
+                            rng.choice([1, 2, 3, 4, 5, 6, 8, 10], len(pay_order), p=[.5, .12, .1, .07, .05, .05, .05, .06]), 1)
+    payments = pd.DataFrame({
+        "order_id": orders["order_id"].to_numpy()[pay_order],
+        "payment_sequential": np.arange(len(pay_order)) - np.repeat(np.cumsum(n_pay) - n_pay, n_pay) + 1,
+        "payment_type": pay_type,
+        "payment_installments": installments,
+        "payment_value": (order_value[pay_order] / n_pay[pay_order]).round(2),
+    })
+
+    tables = {
+        "olist_customers_dataset.csv": customers,
+        "olist_geolocation_dataset.csv": geo,
+        "olist_order_items_dataset.csv": items,
+        "olist_order_payments_dataset.csv": payments,
+        "olist_order_reviews_dataset.csv": reviews,
+        "olist_orders_dataset.csv": orders,
+        "olist_products_dataset.csv": products,
+        "olist_sellers_dataset.csv": sellers,
+    }
+    for filename, df in tables.items():
+        # same second-precision timestamps as the public export
+        df.to_csv(out / filename, index=False, date_format="%Y-%m-%d %H:%M:%S")
+
+    shutil.copyfile(PROJECT_ROOT / "data" / "product_category_name_translation.csv",
+                    out / "product_category_name_translation.csv")
+
+    return {filename: len(df) for filename, df in tables.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    counts = generate(args.scale, args.out, args.seed)
+    for filename, n in counts.items():
+        print(f"{filename:<38} {n:>12,}")
+
+
+if __name__ == "__main__":
+    main()
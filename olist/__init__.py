@@ -0,0 +1,30 @@
+"""
+Olist feature library.
+
+Feature classes are exported lazily (PEP 562): `import olist` stays cheap and
+`olist.Seller` imports `olist.seller_updated` only on first access.
+"""
+import importlib
+
+_LAZY_ATTRS = {
+    "Olist": "olist.data",
+    "Order": "olist.order",
+    "Product": "olist.product_updated",
+    "Review": "olist.review",
+    "Seller": "olist.seller_updated",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'olist' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,493 @@
+# olist/artifacts.py
+"""
+Fingerprinted, versioned cache of derived tables (training sets, indexes,
+scenario matrices).
+
+Every artifact is written once to OLIST_ARTIFACT_DIR (default: <repo>/artifacts)
+as `<name>-<fingerprint>.pkl`. The fingerprint covers
+- the content of the input CSVs (sha256; re-hashed only when size/mtime change),
+- the source of the modules that define the features,
+- the fingerprints of the artifacts it is built from,
+- the artifact format, pandas and numpy versions.
+
+`load(name)` returns the stored value when its fingerprint matches and
+otherwise rebuilds (and stores) only that artifact. `python -m olist.build`
+builds everything ahead of time, so workers start by unpickling.
+Set OLIST_ARTIFACTS=off to always compute in memory.
+
+Builds inside `shared_build()` share one BuildContext per dataset, so a
+cold start (worker import, warm-up) reads the CSVs and runs each feature
+pipeline once, as `build_all` does.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from olist.datasets import _MISSING, CACHE, DEFAULT, active_name
+
+FORMAT_VERSION = 1
+ARTIFACT_DIR_ENV = "OLIST_ARTIFACT_DIR"
+ENABLED = os.environ.get("OLIST_ARTIFACTS", "").strip().lower() not in ("0", "off", "false")
+# Seconds a computed fingerprint is trusted before sources and input files are checked again
+FINGERPRINT_TTL_S = 2.0
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def artifact_dir() -> Path:
+    """Artifact folder; named datasets other than "default" get their own subfolder."""
+    base = Path(os.environ.get(ARTIFACT_DIR_ENV) or PROJECT_ROOT / "artifacts")
+    name = active_name()
+    return base / "datasets" / name if name and name != DEFAULT else base
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+class Artifact:
+    """A derived table: `build(ctx)` from `inputs()` files, defined by `sources` modules."""
+
+    def __init__(self, name, build, inputs, sources, deps=()):
+        self.name = name
+        self.build = build
+        self.inputs = inputs
+        self.sources = tuple(sources)
+        self.deps = tuple(deps)
+
+
+REGISTRY: dict[str, Artifact] = {}
+
+
+def artifact(name: str, inputs, sources, deps=()):
+    """Decorator registering `build(ctx)` as artifact `name`."""
+    def decorator(build):
+        REGISTRY[name] = Artifact(name, build, inputs, sources, deps)
+        return build
+    return decorator
+
+
+class BuildContext:
+    """Raw data shared by the artifacts built in one pass (loaded at most once)."""
+
+    @cached_property
+    def seller(self):
+        from olist.seller_updated import Seller
+        return Seller()
+
+    @cached_property
+    def order(self):
+        from olist.order import Order
+        return Order()
+
+    @cached_property
+    def review(self):
+        from olist.review import Review
+        return Review(order=self.order)
+
+    def get(self, name: str):
+        return load(name, ctx=self)
+
+
+# dataset name → BuildContext, while a shared_build() block is open
+_shared_contexts: ContextVar[dict | None] = ContextVar("olist_build_contexts", default=None)
+
+
+@contextmanager
+def shared_build():
+    """Artifacts built inside the block share one BuildContext per dataset; its raw data is released on exit."""
+    token = _shared_contexts.set({}) if _shared_contexts.get() is None else None
+    try:
+        yield
+    finally:
+        if token is not None:
+            _shared_contexts.reset(token)
+
+
+def _context(ctx: BuildContext | None) -> BuildContext:
+    if ctx is not None:
+        return ctx
+    contexts = _shared_contexts.get()
+    if contexts is None:
+        return BuildContext()
+    name = active_name() or DEFAULT
+    if name not in contexts:
+        contexts[name] = BuildContext()
+    return contexts[name]
+
+
+# -----------------------------
+# Fingerprints
+# -----------------------------
+_file_hashes: dict[tuple, str] = {}
+
+
+def _hash_index_path() -> Path:
+    return artifact_dir() / "input-hashes.json"
+
+
+def file_hash(path: Path) -> str:
+    """sha256 of a file, memoized on (path, size, mtime) in memory and on disk."""
+    path = Path(path).resolve()
+    if not path.exists():
+        return "missing"
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if key in _file_hashes:
+        return _file_hashes[key]
+
+    index_path = _hash_index_path()
+    try:
+        index = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        index = {}
+    entry = index.get(key[0])
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        digest = entry["sha256"]
+    else:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        index[key[0]] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        try:
+            _atomic_write(index_path, json.dumps(index, indent=1).encode())
+        except OSError:
+            pass
+    _file_hashes[key] = digest
+    return digest
+
+
+def _source_bytes(module: str) -> bytes:
+    spec = importlib.util.find_spec(module)
+    return Path(spec.origin).read_bytes() if spec and spec.origin else b""
+
+
+_fingerprints: dict[tuple, tuple[float, str]] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def fingerprint(name: str) -> str:
+    """Fingerprint of artifact `name`, memoized per input paths for FINGERPRINT_TTL_S."""
+    art = REGISTRY[name]
+    key = (name, tuple(str(p) for p in art.inputs()))
+    now = time.monotonic()
+    with _fingerprints_lock:
+        cached = _fingerprints.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    fp = _fingerprint(art, key[1])
+    with _fingerprints_lock:
+        _fingerprints[key] = (now + FINGERPRINT_TTL_S, fp)
+    return fp
+
+
+def _fingerprint(art: Artifact, inputs) -> str:
+    name = art.name
+    h = hashlib.sha256(f"{name}:{FORMAT_VERSION}:{pd.__version__}:{np.__version__}".encode())
+    for path in inputs:
+        h.update(f"{Path(path).name}:{file_hash(path)}".encode())
+    for module in art.sources:
+        h.update(module.encode())
+        h.update(_source_bytes(module))
+    for dep in art.deps:
+        h.update(fingerprint(dep).encode())
+    return h.hexdigest()[:16]
+
+
+def path_for(name: str, fp: str | None = None) -> Path:
+    return artifact_dir() / f"{name}-{fp or fingerprint(name)}.pkl"
+
+
+# -----------------------------
+# Store / load
+# -----------------------------
+def _atomic_write(path: Path, payload: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read(path: Path, name: str, fp: str):
+    with open(path, "rb") as f:
+        header = pickle.load(f)
+        if header != {"format": FORMAT_VERSION, "name": name, "fingerprint": fp}:
+            raise ValueError(f"{path} does not hold {name}@{fp}")
+        return pickle.load(f)
+
+
+def _write(path: Path, name: str, fp: str, value):
+    header = {"format": FORMAT_VERSION, "name": name, "fingerprint": fp}
+    payload = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL) + \
+        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    _atomic_write(path, payload)
+    # older versions of the same artifact are stale by definition
+    for old in path.parent.glob(f"{name}-*.pkl"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def load(name: str, ctx: BuildContext | None = None, force: bool = False):
+    """
+    Stored artifact when its fingerprint matches, otherwise built (and stored).
+    Loaded values stay in the shared dataset LRU cache (olist/datasets.py), keyed
+    by fingerprint, so every dataset keeps its own copy.
+    """
+    if not ENABLED:
+        from olist.data import Olist
+        return _memo(name, f"off:{Olist.data_dir()}", lambda: REGISTRY[name].build(_context(ctx)))
+
+    fp = fingerprint(name)
+    cached = CACHE.get((name, fp), _MISSING)
+    if cached is not _MISSING and not force:
+        return cached
+
+    path = path_for(name, fp)
+    if path.exists() and not force:
+        try:
+            return CACHE.put((name, fp), _read(path, name, fp))
+        except Exception as exc:  # corrupt / unreadable: rebuild
+            warnings.warn(f"artifact {path.name} unreadable ({exc}), rebuilding")
+
+    value = REGISTRY[name].build(_context(ctx))
+    try:
+        _write(path, name, fp, value)
+    except OSError as exc:
+        warnings.warn(f"artifact {name} not stored: {exc}")
+    return CACHE.put((name, fp), value)
+
+
+def _memo(name, fp, build):
+    cached = CACHE.get((name, fp), _MISSING)
+    if cached is not _MISSING:
+        return cached
+    return CACHE.put((name, fp), build())
+
+
+def status() -> list[dict]:
+    """name, fingerprint, fresh (stored file matches), bytes, for every artifact."""
+    rows = []
+    for name in REGISTRY:
+        fp = fingerprint(name)
+        path = path_for(name, fp)
+        rows.append({"name": name, "fingerprint": fp, "fresh": path.exists(),
+                     "bytes": path.stat().st_size if path.exists() else 0})
+    return rows
+
+
+def build_all(names=None, force: bool = False, log=print) -> list[dict]:
+    """Builds the stale artifacts (all of `names`, or everything) in dependency order."""
+    ctx = BuildContext()
+    done, results = set(), []
+
+    def visit(name):
+        if name in done:
+            return
+        for dep in REGISTRY[name].deps:
+            visit(dep)
+        fp = fingerprint(name)
+        fresh = path_for(name, fp).exists() and not force
+        start = time.perf_counter()
+        if fresh:
+            state = "fresh"
+        else:
+            load(name, ctx=ctx, force=True)
+            state = "built"
+        seconds = time.perf_counter() - start
+        size = path_for(name, fp).stat().st_size if path_for(name, fp).exists() else 0
+        log(f"{state:<6} {name:<24} {fp}  {size / 1024 ** 2:8.1f} MB  {seconds:6.2f}s")
+        results.append({"name": name, "fingerprint": fp, "state": state, "seconds": seconds, "bytes": size})
+        done.add(name)
+
+    for name in names or REGISTRY:
+        visit(name)
+    return results
+
+
+# -----------------------------
+# Artifact definitions
+# -----------------------------
+def _seller_inputs():
+    from olist.seller_updated import Seller
+    return [Seller.default_data_dir() / f for f in Seller.FILES.values()]
+
+
+def _olist_inputs(*keys):
+    def inputs():
+        from olist.data import Olist
+        return [Olist.data_dir() / Olist.FILES[k] for k in keys]
+    return inputs
+
+
+ORDER_TABLES = ("orders", "order_reviews", "order_items", "products", "sellers")
+# Modules behind each BuildContext loader: a builder reading `ctx.<loader>` lists them in its sources
+SELLER_SOURCES = ("olist.seller_updated",)
+ORDER_SOURCES = ("olist.order", "olist.data", "olist.utils")
+REVIEW_SOURCES = ("olist.review",) + ORDER_SOURCES
+LOADER_SOURCES = {"seller": SELLER_SOURCES, "order": ORDER_SOURCES, "review": REVIEW_SOURCES}
+
+
+@artifact("seller_training", inputs=_seller_inputs, sources=SELLER_SOURCES)
+def _build_seller_training(ctx):
+    return ctx.seller.get_training_data()
+
+
+@artifact("order_training", inputs=_olist_inputs(*ORDER_TABLES), sources=ORDER_SOURCES)
+def _build_order_training(ctx):
+    return ctx.order.get_training_data()
+
+
+@artifact("order_training_distance", inputs=_olist_inputs(*ORDER_TABLES, "customers", "geolocation"),
+          sources=ORDER_SOURCES)
+def _build_order_training_distance(ctx):
+    return ctx.order.get_training_data(with_distance_seller_customer=True)
+
+
+@artifact("product_training",
+          inputs=_olist_inputs(*ORDER_TABLES, "product_category_name_translation"),
+          sources=("olist.product_updated",) + ORDER_SOURCES)
+def _build_product_training(ctx):
+    from olist.product_updated import Product
+    return Product(order=ctx.order).get_training_data()
+
+
+# Aggregations precomputed per category; the category page only slices them
+CATEGORY_AGGS = ("mean", "median", "sum")
+
+
+@artifact("product_categories", inputs=_olist_inputs(*ORDER_TABLES, "product_category_name_translation"),
+          sources=("olist.product_updated",) + ORDER_SOURCES, deps=("product_training",))
+def _build_product_categories(ctx):
+    from olist.product_updated import aggregate_categories
+    return aggregate_categories(ctx.get("product_training"), CATEGORY_AGGS)
+
+
+def _financial_index_inputs():
+    # payments are read from the seller data folder, like every other table of the index
+    from olist.payment import Payment
+    from olist.seller_updated import Seller
+    return _seller_inputs() + [Seller.default_data_dir() / Payment.FILES["order_payments"]]
+
+
+@artifact("financial_index", inputs=_financial_index_inputs,
+          sources=("olist.financial_index", "olist.payment", "olist.data") + SELLER_SOURCES,
+          deps=("seller_training",))
+def _build_financial_index(ctx):
+    from olist.financial_index import FinancialIndex
+    from olist.payment import Payment
+    try:
+        financing = Payment(data_dir=ctx.seller.data_dir).get_seller_order_payments()
+    except FileNotFoundError as exc:  # payments are optional: no financing line
+        warnings.warn(f"financing cost not indexed: {exc}")
+        financing = None
+    return FinancialIndex.build(ctx.seller.data, ctx.get("seller_training"), financing)
+
+
+@artifact("seller_tail_metrics", inputs=_seller_inputs, sources=("olist.sketches",) + SELLER_SOURCES)
+def _build_seller_tail_metrics(ctx):
+    return ctx.seller.get_tail_metrics()
+
+
+@artifact("seller_index", inputs=_seller_inputs, sources=("olist.seller_index",) + SELLER_SOURCES)
+def _build_seller_index(ctx):
+    from olist.seller_index import SellerIndex
+    return SellerIndex(ctx.seller.data)
+
+
+@artifact("seller_cohorts", inputs=_seller_inputs,
+          sources=("olist.cohort", "olist.financial_index") + SELLER_SOURCES)
+def _build_seller_cohorts(ctx):
+    from olist.cohort import cohorts_by_state
+    return cohorts_by_state(ctx.seller.data)
+
+
+@artifact("state_flows", inputs=_olist_inputs(*ORDER_TABLES, "customers", "geolocation"),
+          sources=("olist.geo",) + ORDER_SOURCES + SELLER_SOURCES)
+def _build_state_flows(ctx):
+    from olist.geo import StateFlows
+    return StateFlows.build(ctx.order.data)
+
+
+@artifact("review_training", inputs=_olist_inputs(*ORDER_TABLES), sources=REVIEW_SOURCES)
+def _build_review_training(ctx):
+    return ctx.review.get_training_data()
+
+
+@artifact("review_topics", inputs=_olist_inputs(*ORDER_TABLES), sources=REVIEW_SOURCES,
+          deps=("review_training",))
+def _build_review_topics(ctx):
+    from olist.review import topic_summary
+    return topic_summary(ctx.get("review_training"))
+
+
+@artifact("review_keywords", inputs=_olist_inputs(*ORDER_TABLES), sources=REVIEW_SOURCES)
+def _build_review_keywords(ctx):
+    return ctx.review.get_keywords()
+
+
+def sellers_by_gross_profit(training: pd.DataFrame, ascending: bool = True) -> pd.DataFrame:
+    """Seller training rows with gross_profit (revenues − review cost), sorted; the scenario order."""
+    df = training.copy()
+    df["gross_profit"] = df["revenues"] - df["cost_of_reviews"]
+    return df.sort_values("gross_profit", ascending=ascending).reset_index(drop=True)
+
+
+@artifact("seller_incidence", inputs=_seller_inputs,
+          sources=("olist.incidence", "olist.artifacts") + SELLER_SOURCES, deps=("seller_training",))
+def _build_seller_incidence(ctx):
+    from olist.incidence import OrderSellerIncidence
+    order = sellers_by_gross_profit(ctx.get("seller_training"))["seller_id"]
+    return OrderSellerIncidence(ctx.seller.data, order)
+
+
+@artifact("seller_bootstrap", inputs=_seller_inputs,
+          sources=("olist.resampling", "olist.scenario", "olist.incidence", "olist.artifacts") + SELLER_SOURCES,
+          deps=("seller_training", "seller_incidence"))
+def _build_seller_bootstrap(ctx):
+    # same order-level review cost model as the seller impact page
+    from olist.resampling import bootstrap_optimum
+    from olist.scenario import compute_it_cost
+    sellers = sellers_by_gross_profit(ctx.get("seller_training"))
+    review_cost, fixed = ctx.get("seller_incidence").prefix_review_cost()
+    replicates = bootstrap_optimum(sellers["revenues"].to_numpy(float) - review_cost, sellers["quantity"],
+                                   compute_it_cost)
+    replicates["net_profit"] -= fixed
+    return replicates
+
+
+CUSTOMER_TABLES = ("customers", "orders", "order_payments")
+CUSTOMER_SOURCES = ("olist.customer", "olist.payment", "olist.data")
+
+
+@artifact("customer_rfm", inputs=_olist_inputs(*CUSTOMER_TABLES), sources=CUSTOMER_SOURCES)
+def _build_customer_rfm(ctx):
+    from olist.customer import Customer, score_rfm
+    return score_rfm(Customer.stream())
+
+
+@artifact("customer_segments", inputs=_olist_inputs(*CUSTOMER_TABLES), sources=CUSTOMER_SOURCES,
+          deps=("customer_rfm",))
+def _build_customer_segments(ctx):
+    from olist.customer import segment_summary
+    return segment_summary(ctx.get("customer_rfm"))
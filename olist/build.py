@@ -0,0 +1,49 @@
+# olist/build.py
+"""
+Builds the derived artifacts (training sets, indexes, scenario matrices)
+ahead of time, so app workers start by loading them (see olist/artifacts.py).
+
+    python -m olist.build                   # build stale artifacts
+    python -m olist.build seller_training   # only these (and their deps)
+    python -m olist.build --list            # fingerprints and freshness
+    python -m olist.build --force           # rebuild everything
+    python -m olist.build --dataset all     # every dataset of OLIST_DATASETS
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from olist import artifacts, datasets
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"artifacts to build (default: all of {', '.join(artifacts.REGISTRY)})")
+    parser.add_argument("--force", action="store_true", help="rebuild even when fresh")
+    parser.add_argument("--list", action="store_true", help="only show fingerprints and freshness")
+    parser.add_argument("--dataset", default=datasets.DEFAULT,
+                        help=f"named dataset or 'all' (known: {', '.join(datasets.names())})")
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.names if n not in artifacts.REGISTRY]
+    if unknown:
+        parser.error(f"unknown artifacts: {', '.join(unknown)}")
+    names = datasets.names() if args.dataset == "all" else [args.dataset]
+    if any(n not in datasets.registry() for n in names):
+        parser.error(f"unknown dataset: {args.dataset}")
+
+    for name in names:
+        with datasets.use(name):
+            print(f"dataset: {name}  artifact dir: {artifacts.artifact_dir()}")
+            if args.list:
+                for row in artifacts.status():
+                    state = "fresh" if row["fresh"] else "stale"
+                    print(f"{state:<6} {row['name']:<24} {row['fingerprint']}  {row['bytes'] / 1024 ** 2:8.1f} MB")
+                continue
+            artifacts.build_all(args.names or None, force=args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
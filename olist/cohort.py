@@ -0,0 +1,126 @@
+# olist/cohort.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from olist.financial_index import month_codes
+
+# Monthly subscription fee per seller (same as the seller training data)
+SUBSCRIPTION_FEE = 80
+
+
+def _item_months(data: dict[str, pd.DataFrame]) -> np.ndarray:
+    """Month code of order_approved_at for every order_items row (NaN if not approved)."""
+    orders = data["orders"]
+    order_month = pd.Series(month_codes(orders["order_approved_at"]), index=orders["order_id"].to_numpy())
+    return order_month.reindex(data["order_items"]["order_id"]).to_numpy()
+
+
+class SellerCohorts:
+    """
+    Seller cohorts (month of first sale) × months since first sale.
+
+    - `active[c, k]`: sellers of cohort c with a sale in month c + k
+    - `retained[c, k]`: sellers of cohort c whose last sale is in month c + k
+      or later, i.e. still paying the subscription (as in months_on_olist)
+
+    Everything is integer month codes and np.bincount; cells after the last
+    observed month are censored (NaN in the rate tables).
+    """
+
+    def __init__(self, months, sizes, active, retained):
+        self.months = list(months)      # "YYYY-MM" label per cohort / calendar month
+        self.sizes = sizes              # sellers per cohort
+        self.active = active            # (n_months, n_months) counts
+        self.retained = retained        # (n_months, n_months) counts
+
+    # -----------------------------
+    # Build
+    # -----------------------------
+    @classmethod
+    def build(cls, data: dict[str, pd.DataFrame]) -> "SellerCohorts":
+        """`data` is the raw table dict of a Seller instance (sales dated by order_approved_at)."""
+        items = data["order_items"][["order_id", "seller_id"]]
+        return cls.from_activity(items["seller_id"], _item_months(data))
+
+    @classmethod
+    def from_activity(cls, seller_ids, months) -> "SellerCohorts":
+        """One (seller, month code) pair per sale; missing months are ignored."""
+        months = np.asarray(months, dtype=float)
+        ok = ~np.isnan(months)
+        sellers, _ = pd.factorize(np.asarray(seller_ids)[ok])
+        months = months[ok].astype(np.int64)
+        if not len(months):
+            return cls([], np.zeros(0, np.int64), np.zeros((0, 0), np.int64), np.zeros((0, 0), np.int64))
+
+        month_min = int(months.min())
+        months -= month_min
+        n_months = int(months.max()) + 1
+        n_sellers = int(sellers.max()) + 1
+
+        first = np.full(n_sellers, n_months, np.int64)
+        np.minimum.at(first, sellers, months)
+        last = np.zeros(n_sellers, np.int64)
+        np.maximum.at(last, sellers, months)
+
+        # Distinct (seller, month) pairs via a seller × month bitmap (much faster
+        # than np.unique), then bincount over (cohort, offset) cells
+        seen = np.zeros(n_sellers * n_months, dtype=bool)
+        seen[sellers * n_months + months] = True
+        pairs = np.flatnonzero(seen)
+        pair_seller, pair_month = pairs // n_months, pairs % n_months
+        cells = first[pair_seller] * n_months + (pair_month - first[pair_seller])
+        active = np.bincount(cells, minlength=n_months * n_months).reshape(n_months, n_months)
+
+        # Retained: +1 at offset 0, −1 after the last month, cumulative sum over offsets
+        span = last - first
+        diff = np.bincount(first * (n_months + 1), minlength=n_months * (n_months + 1))
+        diff -= np.bincount(first * (n_months + 1) + span + 1, minlength=n_months * (n_months + 1))
+        retained = np.cumsum(diff.reshape(n_months, n_months + 1), axis=1)[:, :n_months]
+
+        sizes = np.bincount(first, minlength=n_months)
+        labels = [f"{c // 12}-{c % 12 + 1:02d}" for c in range(month_min, month_min + n_months)]
+        return cls(labels, sizes, active, retained)
+
+    # -----------------------------
+    # Query
+    # -----------------------------
+    def observed(self) -> np.ndarray:
+        """True where cohort month + offset is within the data (not censored)."""
+        n = len(self.months)
+        return np.add.outer(np.arange(n), np.arange(n)) < n
+
+    def rates(self, kind: str = "retained", min_size: int = 1) -> pd.DataFrame:
+        """Cohort × offset share of sellers (kind: "retained" or "active"); cohorts below min_size dropped."""
+        counts = self.retained if kind == "retained" else self.active
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = np.where(self.observed(), counts / self.sizes[:, None], np.nan)
+        out = pd.DataFrame(rates, index=self.months, columns=range(len(self.months)))
+        return out[self.sizes >= max(min_size, 1)]
+
+    def curve(self, kind: str = "retained", min_size: int = 1) -> pd.Series:
+        """Size-weighted average rate per month since first sale (observed cohorts only)."""
+        counts = self.retained if kind == "retained" else self.active
+        keep = (self.sizes >= max(min_size, 1))[:, None] & self.observed()
+        sellers = (keep * self.sizes[:, None]).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series((counts * keep).sum(axis=0) / sellers, index=range(len(self.months)))
+
+    def subscription_revenue(self, fee: float = SUBSCRIPTION_FEE) -> pd.Series:
+        """Observed subscription revenue per cohort: retained seller-months × fee."""
+        return pd.Series((self.retained * self.observed()).sum(axis=1) * fee, index=self.months)
+
+
+def cohorts_by_state(data: dict[str, pd.DataFrame]) -> dict[str, SellerCohorts]:
+    """SellerCohorts for all sellers (key "ALL") and per seller_state, from one month lookup."""
+    items = data["order_items"][["order_id", "seller_id"]]
+    months = _item_months(data)
+    states = (data["sellers"].set_index("seller_id")["seller_state"]
+              .reindex(items["seller_id"]).to_numpy())
+
+    out = {"ALL": SellerCohorts.from_activity(items["seller_id"], months)}
+    for state in sorted(pd.unique(states[pd.notna(states)])):
+        mask = states == state
+        out[state] = SellerCohorts.from_activity(items["seller_id"].to_numpy()[mask], months[mask])
+    return out
@@ -0,0 +1,273 @@
+# olist/customer.py
+"""
+Customer-level RFM features (recency, frequency, monetary value) per
+customer_unique_id, with order value attributed from the payments table.
+
+Everything is computed by RFMAccumulator in grouped, vectorized passes over
+chunks, so the same code runs on the in-memory `Olist().get_data()` tables
+(Customer().get_rfm()) and on CSVs streamed in chunks for customer bases
+that do not fit in memory as raw tables (Customer.stream(...)).
+
+IDs are reduced to 64-bit hashes (pd.util.hash_array) while streaming, so
+memory grows with the number of distinct customers (~70 bytes each), not with
+the size of the raw files.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from olist.data import Olist
+from olist.payment import PAYMENT_TYPES
+from olist.perf import instrument
+
+# Orders that never turned into revenue
+EXCLUDED_STATUSES = ("canceled", "unavailable")
+STATES = ("AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO", "MA", "MG", "MS", "MT", "PA", "PB",
+          "PE", "PI", "PR", "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP", "TO")
+DAY = 24 * 3600
+
+SEGMENTS = ("loyal", "loyal_at_risk", "new_high_value", "new", "dormant_high_value", "potential", "lost")
+
+
+def _key(values) -> np.ndarray:
+    """64-bit hash of string IDs (vectorized)."""
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _codes(values, categories) -> np.ndarray:
+    return pd.Categorical(values, categories=categories).codes
+
+
+class RFMAccumulator:
+    """
+    Mergeable per-customer aggregates. Feed `add_customers` and
+    `add_payments` chunks first, then `add_orders` chunks; `result()`
+    returns one row per customer_unique_id.
+    """
+
+    # partial per-chunk aggregates are merged once this many have piled up
+    COMPACT_EVERY = 8
+
+    def __init__(self, keep_ids: bool = True):
+        self.keep_ids = keep_ids
+        self._customers, self._ids, self._payments, self._partials = [], [], [], []
+        self._frozen = False
+
+    # -- pass 1: lookups -------------------------------------------------
+    def add_customers(self, chunk: pd.DataFrame):
+        uid_key = _key(chunk["customer_unique_id"])
+        self._customers.append((
+            _key(chunk["customer_id"]),
+            uid_key,
+            _codes(chunk["customer_state"], STATES).astype(np.int8),
+        ))
+        if self.keep_ids:
+            ids = pd.Series(chunk["customer_unique_id"].to_numpy(), index=uid_key)
+            self._ids.append(ids[~ids.index.duplicated()])
+
+    def add_payments(self, chunk: pd.DataFrame):
+        types = _codes(chunk["payment_type"], PAYMENT_TYPES)
+        types = np.where(types < 0, len(PAYMENT_TYPES) - 1, types)
+        values = np.zeros((len(chunk), len(PAYMENT_TYPES)), dtype=np.float64)
+        values[np.arange(len(chunk)), types] = chunk["payment_value"].to_numpy(dtype=np.float64)
+        # partial sums per order; orders split across chunks are merged in _freeze
+        self._payments.append(pd.DataFrame(values, columns=PAYMENT_TYPES).groupby(_key(chunk["order_id"])).sum())
+
+    def _freeze(self):
+        if self._frozen:
+            return
+        if self._customers:
+            cust, uid, state = (np.concatenate(a) for a in zip(*self._customers))
+        else:
+            cust, uid, state = np.empty(0, np.uint64), np.empty(0, np.uint64), np.empty(0, np.int8)
+        order = np.argsort(cust, kind="stable")
+        self._cust_keys, self._cust_uid, self._cust_state = cust[order], uid[order], state[order]
+        self._customers = None
+
+        payments = pd.concat(self._payments) if self._payments else pd.DataFrame(columns=PAYMENT_TYPES)
+        if len(self._payments) > 1:
+            payments = payments.groupby(level=0).sum()
+        payments = payments.sort_index()
+        self._pay_keys = payments.index.to_numpy(dtype=np.uint64)
+        self._pay_values = payments.to_numpy(dtype=np.float64)
+        self._payments = None
+        self._frozen = True
+
+    @staticmethod
+    def _lookup(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Position of each key in `sorted_keys`, -1 when absent."""
+        if not len(sorted_keys):
+            return np.full(len(keys), -1)
+        pos = np.searchsorted(sorted_keys, keys).clip(max=len(sorted_keys) - 1)
+        return np.where(sorted_keys[pos] == keys, pos, -1)
+
+    # -- pass 2: orders --------------------------------------------------
+    def add_orders(self, chunk: pd.DataFrame):
+        self._freeze()
+        chunk = chunk[~chunk["order_status"].isin(EXCLUDED_STATUSES)]
+
+        cpos = self._lookup(self._cust_keys, _key(chunk["customer_id"]))
+        ok = cpos >= 0
+        ppos = self._lookup(self._pay_keys, _key(chunk["order_id"]))[ok]
+        cpos = cpos[ok]
+
+        paid = np.zeros((len(cpos), len(PAYMENT_TYPES)))
+        has_payment = ppos >= 0
+        paid[has_payment] = self._pay_values[ppos[has_payment]]
+
+        ts = pd.to_datetime(chunk["order_purchase_timestamp"].to_numpy()[ok])
+        seconds = ts.to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+        frame = pd.DataFrame(paid, columns=PAYMENT_TYPES)
+        frame["monetary"] = paid.sum(axis=1)
+        frame["frequency"] = 1
+        frame["first_purchase"] = seconds
+        frame["last_purchase"] = seconds
+        frame["customer_state"] = self._cust_state[cpos]
+        self._partials.append(self._combine(frame, self._cust_uid[cpos]))
+        if len(self._partials) >= self.COMPACT_EVERY:
+            self._partials = [self._merged()]
+
+    @staticmethod
+    def _combine(frame: pd.DataFrame, keys) -> pd.DataFrame:
+        agg = {c: "sum" for c in PAYMENT_TYPES + ("monetary", "frequency")}
+        agg.update(first_purchase="min", last_purchase="max", customer_state="last")
+        return frame.groupby(keys, sort=False).agg(agg)
+
+    def _merged(self) -> pd.DataFrame:
+        if not self._partials:
+            raise ValueError("RFMAccumulator.result() called before any orders were added")
+        merged = pd.concat(self._partials)
+        return merged if len(self._partials) == 1 else self._combine(merged, merged.index)
+
+    # -- result ----------------------------------------------------------
+    def result(self, snapshot: pd.Timestamp | None = None) -> pd.DataFrame:
+        """
+        One row per customer_unique_id with:
+        [customer_unique_id (keep_ids only), customer_key, customer_state, recency, frequency, monetary,
+        is_repeat, first_purchase, last_purchase, <payment_type>_value...]
+        recency is in days before `snapshot` (default: day after the last purchase).
+        """
+        rfm = self._merged()
+
+        last = rfm["last_purchase"].to_numpy()
+        end = (int(pd.Timestamp(snapshot).timestamp()) if snapshot is not None
+               else int(last.max()) + DAY)
+
+        out = pd.DataFrame({
+            "customer_key": rfm.index.to_numpy(np.uint64),
+            "customer_state": pd.Categorical.from_codes(rfm["customer_state"].to_numpy(np.int8), STATES),
+            "recency": ((end - last) / DAY).astype(np.float32),
+            "frequency": rfm["frequency"].to_numpy(np.int32),
+            "monetary": rfm["monetary"].to_numpy(np.float64),
+            "is_repeat": rfm["frequency"].to_numpy() > 1,
+            "first_purchase": pd.to_datetime(rfm["first_purchase"].to_numpy(), unit="s"),
+            "last_purchase": pd.to_datetime(last, unit="s"),
+        }, index=rfm.index)
+        for t in PAYMENT_TYPES:
+            out[f"{t}_value"] = rfm[t].to_numpy(np.float32)
+
+        if self.keep_ids and self._ids:
+            ids = pd.concat(self._ids)
+            ids = ids[~ids.index.duplicated()]
+            out.insert(0, "customer_unique_id", ids.reindex(out.index).to_numpy())
+        return out.reset_index(drop=True)
+
+
+def score_rfm(rfm: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds r_score / m_score (1–5 quintiles, 5 = best), f_score
+    (1, 2, 3+ orders) and the segment label (see SEGMENTS).
+    """
+    rfm = rfm.copy()
+    n = len(rfm)
+
+    def quintile(values, best_high: bool):
+        if n == 0:
+            return np.zeros(0, np.int8)
+        ranks = pd.Series(values).rank(method="first", ascending=best_high).to_numpy()
+        return (np.ceil(ranks * 5 / n)).clip(1, 5).astype(np.int8)
+
+    rfm["r_score"] = quintile(rfm["recency"].to_numpy(), best_high=False)
+    rfm["m_score"] = quintile(rfm["monetary"].to_numpy(), best_high=True)
+    rfm["f_score"] = np.minimum(rfm["frequency"].to_numpy(), 3).astype(np.int8)
+
+    r, m, repeat = rfm["r_score"].to_numpy(), rfm["m_score"].to_numpy(), rfm["is_repeat"].to_numpy()
+    rfm["segment"] = pd.Categorical(np.select(
+        [repeat & (r >= 3), repeat, (r >= 4) & (m >= 4), r >= 4, m >= 4, r == 3],
+        ["loyal", "loyal_at_risk", "new_high_value", "new", "dormant_high_value", "potential"],
+        default="lost",
+    ), categories=SEGMENTS)
+    return rfm
+
+
+def segment_summary(scored: pd.DataFrame) -> pd.DataFrame:
+    """
+    Small (state × segment × r_score × m_score) table: customers, orders,
+    monetary, recency sum and per-payment-type value. Any filtered view of
+    the segmentation is a sum over its rows.
+    """
+    value_cols = [f"{t}_value" for t in PAYMENT_TYPES]
+    g = scored.groupby(["customer_state", "segment", "r_score", "m_score"], observed=True, sort=False)
+    summary = g.agg(customers=("frequency", "size"), orders=("frequency", "sum"),
+                    repeaters=("is_repeat", "sum"), monetary=("monetary", "sum"),
+                    recency_sum=("recency", "sum"), **{c: (c, "sum") for c in value_cols})
+    return summary.reset_index()
+
+
+@instrument
+class Customer:
+    """
+    DataFrames with one row per customer_unique_id (RFM + payment attribution),
+    built from the customers, orders and order_payments tables.
+    """
+
+    CHUNKSIZE = 1_000_000
+
+    def __init__(self, data: dict[str, pd.DataFrame] | None = None):
+        self.data = data if data is not None else Olist().get_data()
+
+    def get_rfm(self, keep_ids: bool = True) -> pd.DataFrame:
+        """
+        Returns a DataFrame with:
+        [customer_unique_id, customer_key, customer_state, recency, frequency, monetary, is_repeat,
+        first_purchase, last_purchase, credit_card_value, boleto_value, voucher_value,
+        debit_card_value, other_value]
+        """
+        acc = RFMAccumulator(keep_ids=keep_ids)
+        acc.add_customers(self.data["customers"])
+        acc.add_payments(self.data["order_payments"])
+        acc.add_orders(self.data["orders"])
+        return acc.result()
+
+    def get_scored_rfm(self) -> pd.DataFrame:
+        """get_rfm plus r_score, m_score, f_score and segment."""
+        return score_rfm(self.get_rfm())
+
+    def get_segment_summary(self) -> pd.DataFrame:
+        return segment_summary(self.get_scored_rfm())
+
+    @classmethod
+    def stream(cls, data_dir: str | Path | None = None, chunksize: int | None = None,
+               keep_ids: bool = False) -> pd.DataFrame:
+        """
+        get_rfm over CSVs read `chunksize` rows at a time (only the needed
+        columns), for customer bases too large to load as raw tables.
+        """
+        data_dir = Path(data_dir) if data_dir else Olist.data_dir()
+        chunksize = chunksize or cls.CHUNKSIZE
+
+        def chunks(key, usecols):
+            return pd.read_csv(data_dir / Olist.FILES[key], usecols=usecols, chunksize=chunksize)
+
+        acc = RFMAccumulator(keep_ids=keep_ids)
+        for chunk in chunks("customers", ["customer_id", "customer_unique_id", "customer_state"]):
+            acc.add_customers(chunk)
+        for chunk in chunks("order_payments", ["order_id", "payment_type", "payment_value"]):
+            acc.add_payments(chunk)
+        for chunk in chunks("orders", ["order_id", "customer_id", "order_status", "order_purchase_timestamp"]):
+            acc.add_orders(chunk)
+        return acc.result()
@@ -0,0 +1,182 @@
+# olist/datasets.py
+"""
+Named datasets (marketplace snapshots) served side by side.
+
+OLIST_DATASETS lists them as `name=path` pairs separated by commas, e.g.
+`OLIST_DATASETS="sp=/data/sp,2018-08=/data/2018-08"`; the folder given by
+OLIST_DATA_DIR (or the usual default) is always available as "default".
+
+`use(name)` makes a dataset active for the current thread / request: the
+Olist and Seller loaders, and therefore the artifact fingerprints, read
+from its folder, and its artifacts are stored under
+`<artifact dir>/datasets/<name>`. Loaded artifacts of every dataset share
+one LRU cache bounded by OLIST_DATASET_CACHE_MB and weighted by their deep
+memory size, so hot datasets switch without reloading and cold ones are
+evicted.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from urllib.parse import parse_qs
+
+DATASETS_ENV = "OLIST_DATASETS"
+CACHE_ENV = "OLIST_DATASET_CACHE_MB"
+DEFAULT = "default"
+DEFAULT_CACHE_MB = 1024
+
+_active: ContextVar[str | None] = ContextVar("olist_dataset", default=None)
+
+
+def registry() -> dict[str, Path | None]:
+    """name → folder ("default" → None, i.e. the OLIST_DATA_DIR / built-in default)."""
+    out: dict[str, Path | None] = {DEFAULT: None}
+    for entry in os.environ.get(DATASETS_ENV, "").split(","):
+        name, sep, path = entry.partition("=")
+        if sep and name.strip() and path.strip():
+            out[name.strip()] = Path(path.strip()).expanduser()
+    return out
+
+
+def names() -> list[str]:
+    return list(registry())
+
+
+def resolve(name: str | None) -> str:
+    """Known dataset name, falling back to "default"."""
+    return name if name in registry() else DEFAULT
+
+
+def from_search(search: str | None) -> str:
+    """Dataset name from a URL query string (`?dataset=...`)."""
+    values = parse_qs((search or "").lstrip("?")).get("dataset") or [None]
+    return resolve(values[0])
+
+
+def active_name() -> str | None:
+    """Name of the dataset made active by `use`, None outside of it."""
+    return _active.get()
+
+
+def active_data_dir() -> Path | None:
+    """Folder of the dataset made active by `use`, None outside of it or for "default"."""
+    name = _active.get()
+    return registry().get(name) if name else None
+
+
+@contextmanager
+def use(name: str | None):
+    token = _active.set(resolve(name))
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def load(name: str | None, artifact: str):
+    """Artifact `artifact` of dataset `name` (through the shared LRU cache)."""
+    from olist import artifacts
+
+    with use(name):
+        return artifacts.load(artifact)
+
+
+def warm(artifacts, name: str | None = None) -> dict[str, Exception]:
+    """
+    Loads `artifacts` of dataset `name` into the cache (e.g. at worker start),
+    building stale ones from shared raw data; returns the failures.
+    """
+    from olist.artifacts import shared_build
+
+    failed = {}
+    with shared_build():
+        for artifact in artifacts:
+            try:
+                load(name, artifact)
+            except Exception as exc:  # the pages fall back and report on their own
+                failed[artifact] = exc
+    return failed
+
+
+# -----------------------------
+# Memory-weighted LRU cache
+# -----------------------------
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Least-recently-used cache whose capacity is a byte budget: each entry is
+    weighed once on insert (`weigh(value)`), and the oldest entries are
+    evicted until the total fits. The newest entry is always kept, even when
+    it alone exceeds the budget.
+    """
+
+    def __init__(self, budget_bytes: int, weigh=None):
+        self.budget_bytes = budget_bytes
+        self._weigh = weigh
+        self._entries: OrderedDict = OrderedDict()  # key → (value, bytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = self._weigh(value) if self._weigh else 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.budget_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries), "bytes": self.bytes, "budget_bytes": self.budget_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "keys": [list(k) if isinstance(k, tuple) else k for k in self._entries],
+            }
+
+
+def _cache_budget() -> int:
+    try:
+        mb = float(os.environ.get(CACHE_ENV) or DEFAULT_CACHE_MB)
+    except ValueError:
+        mb = DEFAULT_CACHE_MB
+    return int(mb * 1024 ** 2)
+
+
+def _weigh(value) -> int:
+    from olist.memory import object_bytes
+    return object_bytes(value)
+
+
+# Loaded artifacts of all datasets, keyed by (artifact name, fingerprint)
+CACHE = LRUCache(_cache_budget(), weigh=_weigh)
@@ -0,0 +1,67 @@
+# olist/figure_payload.py
+from __future__ import annotations
+
+import base64
+
+import numpy as np
+
+
+def lttb(x, y, n_out: int, keep=()) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Returns the sorted row indices to keep (at most n_out + len(keep)).
+    Indices in `keep` (e.g. a peak marker) are always part of the result.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        idx = np.arange(n)
+    else:
+        idx = np.empty(n_out, dtype=np.int64)
+        idx[0], idx[-1] = 0, n - 1
+
+        # First and last points are fixed, the rest is split into n_out - 2 buckets
+        edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+        a = 0
+        for i in range(n_out - 2):
+            lo, hi = edges[i], edges[i + 1]
+
+            # Average of the next bucket (or the last point for the final bucket)
+            if i < n_out - 3:
+                nlo, nhi = edges[i + 1], edges[i + 2]
+                avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+            else:
+                avg_x, avg_y = x[-1], y[-1]
+
+            area = np.abs(
+                (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+            )
+            a = lo + int(np.argmax(area))
+            idx[i + 1] = a
+
+    keep = np.asarray(list(keep), dtype=np.int64)
+    keep = keep[(keep >= 0) & (keep < n)]
+    return np.union1d(idx, keep)
+
+
+def typed_array(values, dtype: str = "f4") -> dict:
+    """
+    Encodes a numeric array as a plotly.js typed array ({"dtype", "bdata"}),
+    which is sent as base64 bytes instead of JSON float text.
+    """
+    arr = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {"dtype": dtype, "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+
+def line_payload(x, y, n_out: int, keep=(), x_dtype: str = "i4", y_dtype: str = "f4") -> dict:
+    """
+    Downsamples a line trace with LTTB and returns `x`/`y` as typed arrays,
+    ready to be passed to go.Scatter(**payload).
+    """
+    idx = lttb(x, y, n_out, keep=keep)
+    x = np.asarray(x)[idx]
+    y = np.asarray(y)[idx]
+    return {"x": typed_array(x, x_dtype), "y": typed_array(y, y_dtype)}
@@ -0,0 +1,151 @@
+# olist/financial_index.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from olist.seller_updated import COST_MAP
+
+
+def month_codes(dates) -> np.ndarray:
+    """Integer month codes (year * 12 + month - 1) as floats, NaN for missing dates."""
+    dates = pd.to_datetime(pd.Series(dates), errors="coerce")
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy(dtype=float, na_value=np.nan)
+
+
+class FinancialIndex:
+    """
+    Additive (seller_state × month) aggregate index behind the financial summary.
+    Every metric is stored as a prefix sum over months, so any state / date
+    range filter is answered by summing index slices instead of recomputing
+    the seller training data. Sales, reviews, financing and each seller's
+    active span all use the month of `order_purchase_timestamp`.
+    """
+
+    METRICS = ("sales", "quantity", "cost_of_reviews", "subscription_months", "financing_cost")
+
+    def __init__(self, states, months, cum_values, seller_state, seller_first, seller_last):
+        self.states = list(states)                  # seller_state labels
+        self.months = list(months)                  # "YYYY-MM" labels
+        self.cum_values = cum_values                # (n_states, n_months + 1, n_metrics)
+        self.seller_state = seller_state            # state code per seller
+        self.seller_first = seller_first            # first purchase month index per seller
+        self.seller_last = seller_last              # last purchase month index per seller
+
+    # -----------------------------
+    # Build
+    # -----------------------------
+    @classmethod
+    def build(cls, data: dict[str, pd.DataFrame], sellers: pd.DataFrame,
+              financing: pd.DataFrame | None = None) -> "FinancialIndex":
+        """
+        `data` is the raw table dict of a Seller instance, `sellers` its
+        training data. Totals over the full range equal the training data sums.
+        `financing` (order_id, seller_id, financing_cost rows, see
+        Payment.get_seller_order_payments) fills the financing_cost metric;
+        without it the metric is zero.
+        """
+        sellers = sellers[["seller_id", "seller_state", "months_on_olist"]].reset_index(drop=True)
+        state_codes, states = pd.factorize(sellers["seller_state"], sort=True)
+        seller_codes = pd.Index(sellers["seller_id"])
+
+        orders = data["orders"][["order_id", "order_purchase_timestamp"]]
+        order_month = pd.Series(
+            month_codes(pd.to_datetime(orders["order_purchase_timestamp"], errors="coerce")),
+            index=orders["order_id"].to_numpy(),
+        )
+
+        month_min = int(np.nanmin(order_month.to_numpy()))
+        month_max = int(np.nanmax(order_month.to_numpy()))
+        n_states, n_months = len(states), month_max - month_min + 1
+
+        def accumulate(s_codes, m_codes, weights) -> np.ndarray:
+            flat = s_codes * n_months + (m_codes.astype(np.int64) - month_min)
+            return np.bincount(flat, weights=weights, minlength=n_states * n_months)
+
+        # Items: sales + quantity per (state, month)
+        items = data["order_items"][["order_id", "seller_id", "price"]]
+        s_idx = seller_codes.get_indexer(items["seller_id"])
+        m = order_month.reindex(items["order_id"]).to_numpy()
+        ok = (s_idx >= 0) & ~np.isnan(m)
+        s_idx, m = s_idx[ok], m[ok]
+        sales = accumulate(state_codes[s_idx], m, items["price"].to_numpy()[ok])
+        quantity = accumulate(state_codes[s_idx], m, None)
+
+        # Active span: first / last purchase month of the seller's items (same month as the sales)
+        first = np.full(len(sellers), np.inf)
+        last = np.full(len(sellers), -np.inf)
+        np.minimum.at(first, s_idx, m)
+        np.maximum.at(last, s_idx, m)
+
+        # Reviews: same (order, seller) attribution as Seller.get_review_score
+        pairs = data["order_items"][["order_id", "seller_id"]].drop_duplicates()
+        reviews = data["order_reviews"][["order_id", "review_score"]]
+        rev = pairs.merge(reviews, on="order_id", how="inner").dropna(subset=["review_score"])
+        s_idx = seller_codes.get_indexer(rev["seller_id"])
+        m = order_month.reindex(rev["order_id"]).to_numpy()
+        ok = (s_idx >= 0) & ~np.isnan(m)
+        cost = rev["review_score"].astype(float).map(COST_MAP).fillna(0).to_numpy()[ok]
+        s_idx, m = s_idx[ok], m[ok]
+        review_cost = accumulate(state_codes[s_idx], m, cost)
+
+        # Subscription: months_on_olist spread evenly over the seller's active months.
+        # Sellers without a dated sale get an empty span: never active, no subscription
+        dated = np.isfinite(first)
+        first_code = np.full(len(sellers), n_months, dtype=np.int64)
+        last_code = np.full(len(sellers), -1, dtype=np.int64)
+        first_code[dated] = first[dated].astype(np.int64) - month_min
+        last_code[dated] = last[dated].astype(np.int64) - month_min
+        span = np.maximum(last_code - first_code + 1, 0)
+        rows = np.repeat(np.arange(len(sellers)), span)
+        offsets = np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+        share = (sellers["months_on_olist"].fillna(0).to_numpy() / np.maximum(span, 1))[rows]
+        subscription = accumulate(state_codes[rows], first_code[rows] + offsets + month_min, share)
+
+        # Financing: installment anticipation cost attributed to (order, seller)
+        if financing is not None:
+            s_idx = seller_codes.get_indexer(financing["seller_id"])
+            m = order_month.reindex(financing["order_id"]).to_numpy()
+            ok = (s_idx >= 0) & ~np.isnan(m)
+            financing_cost = accumulate(state_codes[s_idx[ok]], m[ok], financing["financing_cost"].to_numpy()[ok])
+        else:
+            financing_cost = np.zeros(n_states * n_months)
+
+        values = np.stack([sales, quantity, review_cost, subscription, financing_cost], axis=-1)
+        values = values.reshape(n_states, n_months, len(cls.METRICS))
+        cum_values = np.zeros((n_states, n_months + 1, len(cls.METRICS)))
+        np.cumsum(values, axis=1, out=cum_values[:, 1:, :])
+
+        return cls(
+            states=states,
+            months=[f"{c // 12}-{c % 12 + 1:02d}" for c in range(month_min, month_max + 1)],
+            cum_values=cum_values,
+            seller_state=state_codes,
+            seller_first=first_code,
+            seller_last=last_code,
+        )
+
+    # -----------------------------
+    # Query
+    # -----------------------------
+    def query(self, states=None, start: int | None = None, end: int | None = None) -> dict:
+        """
+        Returns the metric totals plus `n_sellers` for the given state list and
+        inclusive month range (indices into `self.months`). None means "all".
+        """
+        start = 0 if start is None else int(start)
+        end = len(self.months) - 1 if end is None else int(end)
+
+        if states:
+            state_mask = np.isin(np.asarray(self.states, dtype=object), list(states))
+        else:
+            state_mask = np.ones(len(self.states), dtype=bool)
+
+        cum = self.cum_values[state_mask]
+        totals = (cum[:, end + 1, :] - cum[:, start, :]).sum(axis=0)
+
+        active = state_mask[self.seller_state] & (self.seller_first <= end) & (self.seller_last >= start)
+
+        out = dict(zip(self.METRICS, (float(v) for v in totals)))
+        out["n_sellers"] = int(active.sum())
+        return out
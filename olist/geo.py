@@ -0,0 +1,192 @@
+# olist/geo.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from olist.seller_updated import COST_MAP
+
+EARTH_RADIUS_KM = 6371
+
+
+def haversine_km(lng1, lat1, lng2, lat2) -> np.ndarray:
+    """Vectorized olist.utils.haversine_distance (km)."""
+    lng1, lat1, lng2, lat2 = (np.radians(np.asarray(v, float)) for v in (lng1, lat1, lng2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def zip_centroids(geolocation: pd.DataFrame) -> pd.DataFrame:
+    """
+    One (lat, lng, state) row per zip code prefix: the first geolocation row,
+    as in Order.get_distance_seller_customer.
+    """
+    geo = geolocation[["geolocation_zip_code_prefix", "geolocation_lat", "geolocation_lng", "geolocation_state"]]
+    return (geo.drop_duplicates("geolocation_zip_code_prefix")
+               .set_index("geolocation_zip_code_prefix")
+               .rename(columns=lambda c: c.removeprefix("geolocation_")))
+
+
+class StateFlows:
+    """
+    Seller state (origin) × customer state (destination) aggregates over
+    delivered (order, seller) pairs: the grain of Seller.get_review_score
+    and Order.get_distance_seller_customer.
+
+    Every metric is stored as a sum and a non-missing count per cell, so
+    any row / column / region of the matrix is averaged exactly by summing
+    cells. The ~1M-row geolocation table is only read at build time
+    (reduced to one centroid per zip prefix).
+    """
+
+    METRICS = ("wait_time", "delay_vs_expected", "review_cost", "distance_km")
+
+    def __init__(self, states, pairs, sums, counts, centroids):
+        self.states = list(states)      # state labels (origins and destinations)
+        self.pairs = pairs              # (n_states, n_states) delivered (order, seller) pairs
+        self.sums = sums                # (n_states, n_states, n_metrics) metric sums
+        self.counts = counts            # (n_states, n_states, n_metrics) non-missing counts
+        self.centroids = centroids      # (n_states, 2) mean lat / lng of the state's zip prefixes
+
+    # -----------------------------
+    # Build
+    # -----------------------------
+    @classmethod
+    def build(cls, data: dict[str, pd.DataFrame]) -> "StateFlows":
+        """`data` is a raw Olist table dict (orders, order_items, order_reviews, sellers, customers, geolocation)."""
+        orders = data["orders"]
+        order_ids = pd.Index(orders["order_id"])
+        purchased = pd.to_datetime(orders["order_purchase_timestamp"], errors="coerce")
+        delivered = pd.to_datetime(orders["order_delivered_customer_date"], errors="coerce")
+        estimated = pd.to_datetime(orders["order_estimated_delivery_date"], errors="coerce")
+        day = pd.Timedelta(days=1)
+        wait_time = ((delivered - purchased) / day).to_numpy(float)
+        # only a late delivery counts (Order.get_wait_time)
+        delay = ((delivered - estimated) / day).clip(lower=0).to_numpy(float)
+        valid = (orders["order_status"] == "delivered").to_numpy() & ~np.isnan(wait_time)
+
+        # review cost of all the order's reviews, charged to each of its sellers
+        reviews = data["order_reviews"][["order_id", "review_score"]].dropna()
+        codes = order_ids.get_indexer(reviews["order_id"])
+        cost = reviews["review_score"].astype(float).map(COST_MAP).fillna(0).to_numpy()
+        review_cost = np.bincount(codes[codes >= 0], weights=cost[codes >= 0], minlength=len(order_ids))
+
+        # distinct delivered (order, seller) pairs as integer codes
+        sellers = data["sellers"]
+        items = data["order_items"]
+        order_code = order_ids.get_indexer(items["order_id"])
+        seller_code = pd.Index(sellers["seller_id"]).get_indexer(items["seller_id"])
+        ok = (order_code >= 0) & (seller_code >= 0)
+        ok[ok] = valid[order_code[ok]]
+        pair = pd.unique(order_code[ok].astype(np.int64) * len(sellers) + seller_code[ok])
+        order_code, seller_code = pair // len(sellers), pair % len(sellers)
+
+        customers = data["customers"]
+        customer_code = pd.Index(customers["customer_id"]).get_indexer(orders["customer_id"])[order_code]
+        has_customer = customer_code >= 0
+        origin = sellers["seller_state"].to_numpy(object)[seller_code]
+        destination = np.where(has_customer, customers["customer_state"].to_numpy(object)[customer_code], None)
+
+        zips = zip_centroids(data["geolocation"])
+        lat_lng = zips[["lat", "lng"]]
+        seller_geo = lat_lng.reindex(sellers["seller_zip_code_prefix"]).to_numpy(float)[seller_code]
+        customer_geo = lat_lng.reindex(customers["customer_zip_code_prefix"]).to_numpy(float)[customer_code]
+        customer_geo[~has_customer] = np.nan
+        distance = haversine_km(seller_geo[:, 1], seller_geo[:, 0], customer_geo[:, 1], customer_geo[:, 0])
+
+        values = np.column_stack([wait_time[order_code], delay[order_code], review_cost[order_code], distance])
+        return cls.from_pairs(origin, destination, values, zips)
+
+    @classmethod
+    def from_pairs(cls, origin, destination, values: np.ndarray, zips: pd.DataFrame | None = None) -> "StateFlows":
+        """Aggregate per-pair origin / destination states and METRICS values (NaN = missing)."""
+        origin = pd.Series(origin, dtype=object)
+        destination = pd.Series(destination, dtype=object)
+        ok = (origin.notna() & destination.notna()).to_numpy()
+        states = sorted(set(origin[ok]) | set(destination[ok]))
+        n = len(states)
+        codes = pd.Index(states)
+        flat = codes.get_indexer(origin[ok]) * n + codes.get_indexer(destination[ok])
+        values = np.asarray(values, float).reshape(len(ok), len(cls.METRICS))[ok]
+
+        present = ~np.isnan(values)
+        sums = np.stack([np.bincount(flat, weights=np.where(present[:, k], values[:, k], 0), minlength=n * n)
+                         for k in range(len(cls.METRICS))], axis=-1)
+        counts = np.stack([np.bincount(flat[present[:, k]], minlength=n * n)
+                           for k in range(len(cls.METRICS))], axis=-1)
+        pairs = np.bincount(flat, minlength=n * n)
+
+        centroids = np.full((n, 2), np.nan)
+        if zips is not None and len(zips):
+            means = zips.groupby("state")[["lat", "lng"]].mean().reindex(states)
+            centroids = means.to_numpy(float)
+        k = len(cls.METRICS)
+        return cls(states, pairs.reshape(n, n), sums.reshape(n, n, k), counts.reshape(n, n, k), centroids)
+
+    # -----------------------------
+    # Query
+    # -----------------------------
+    def _metric(self, metric: str) -> int:
+        return self.METRICS.index(metric)
+
+    def _codes(self, states) -> np.ndarray:
+        """Codes of `states` (None / empty = all); unknown states are ignored."""
+        if not states:
+            return np.arange(len(self.states))
+        if isinstance(states, str):
+            states = [states]
+        codes = pd.Index(self.states).get_indexer(list(states))
+        return codes[codes >= 0]
+
+    def mean(self, metric: str, min_pairs: int = 1) -> pd.DataFrame:
+        """origin × destination average of `metric`; NaN where the cell has fewer than min_pairs pairs."""
+        k = self._metric(metric)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            m = self.sums[:, :, k] / self.counts[:, :, k]
+        m[self.pairs < max(min_pairs, 1)] = np.nan
+        return pd.DataFrame(m, index=pd.Index(self.states, name="origin"),
+                            columns=pd.Index(self.states, name="destination"))
+
+    def flows(self, origins=None, destinations=None, min_pairs: int = 1) -> pd.DataFrame:
+        """Long table of origin → destination cells with pairs and metric averages, largest first."""
+        o, d = self._codes(origins), self._codes(destinations)
+        pairs = self.pairs[np.ix_(o, d)]
+        oo, dd = np.nonzero(pairs >= max(min_pairs, 1))
+        sums = self.sums[o[oo], d[dd]]
+        counts = self.counts[o[oo], d[dd]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        out = pd.DataFrame(means, columns=list(self.METRICS))
+        out.insert(0, "pairs", pairs[oo, dd])
+        states = np.asarray(self.states, dtype=object)
+        out.insert(0, "destination", states[d[dd]])
+        out.insert(0, "origin", states[o[oo]])
+        return out.sort_values(["pairs", "origin", "destination"], ascending=[False, True, True], ignore_index=True)
+
+    def totals(self, origins=None, destinations=None, by: str | None = None) -> pd.DataFrame:
+        """
+        Pair count and metric averages over the selected cells: one row overall
+        (by=None) or one row per "origin" / "destination" state.
+        """
+        o, d = self._codes(origins), self._codes(destinations)
+        pairs = self.pairs[np.ix_(o, d)]
+        sums = self.sums[np.ix_(o, d)]
+        counts = self.counts[np.ix_(o, d)]
+        if by is None:
+            pairs, sums, counts = np.atleast_1d(pairs.sum()), sums.sum(axis=(0, 1))[None], counts.sum(axis=(0, 1))[None]
+            index = pd.Index(["ALL"])
+        else:
+            axis = {"origin": 1, "destination": 0}[by]
+            codes = o if by == "origin" else d
+            pairs, sums, counts = pairs.sum(axis=axis), sums.sum(axis=axis), counts.sum(axis=axis)
+            index = pd.Index([self.states[i] for i in codes], name=by)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        out = pd.DataFrame(means, index=index, columns=list(self.METRICS))
+        out.insert(0, "pairs", pairs)
+        return out
+
+    def intra_state_share(self) -> float:
+        """Share of pairs shipped within the seller's own state."""
+        total = self.pairs.sum()
+        return float(np.trace(self.pairs) / total) if total else float("nan")
@@ -0,0 +1,113 @@
+# olist/incidence.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from olist.seller_updated import COST_MAP
+
+
+class OrderSellerIncidence:
+    """
+    Sparse order × seller incidence matrices, built once.
+    Removal scenarios are evaluated with sparse matrix products, so orders
+    shared by several sellers (see Order.get_number_sellers) are only lost
+    when every one of their sellers is removed.
+
+    Columns follow `seller_ids`; items of sellers outside that list go to one
+    extra "other" column that is never removed.
+    """
+
+    def __init__(self, data: dict[str, pd.DataFrame], seller_ids):
+        self.seller_ids = pd.Index(seller_ids)
+        n_sellers = len(self.seller_ids)
+
+        items = data["order_items"][["order_id", "seller_id", "price"]]
+        order_codes, self.order_ids = pd.factorize(items["order_id"])
+        seller_codes = self.seller_ids.get_indexer(items["seller_id"])
+        seller_codes = np.where(seller_codes < 0, n_sellers, seller_codes)
+
+        shape = (len(self.order_ids), n_sellers + 1)
+        # item counts and item prices per (order, seller)
+        self.items = sparse.csr_matrix(
+            (np.ones(len(items)), (order_codes, seller_codes)), shape=shape
+        )
+        self.price = sparse.csr_matrix(
+            (items["price"].to_numpy(dtype=float), (order_codes, seller_codes)), shape=shape
+        )
+        self.order_items = np.asarray(self.items.sum(axis=1)).ravel()
+        self.seller_sales = np.asarray(self.price.sum(axis=0)).ravel()
+
+        # Order-level review cost (each review counted once per order)
+        reviews = data["order_reviews"][["order_id", "review_score"]].dropna()
+        cost = reviews["review_score"].astype(float).map(COST_MAP).fillna(0)
+        cost = cost.groupby(reviews["order_id"].to_numpy()).sum()
+        self.order_cost = cost.reindex(self.order_ids).fillna(0).to_numpy()
+
+        # Seller-level attribution as in Seller.get_review_score:
+        # every (order, seller) pair carries the full review cost of the order
+        pairs = self.items.copy()
+        pairs.data[:] = 1.0
+        self.seller_cost = np.asarray(pairs.T @ self.order_cost).ravel()
+
+    def prefix_review_cost(self) -> tuple[np.ndarray, float]:
+        """
+        Order-level review cost split over `seller_ids` for prefix scenarios
+        (remove the first n sellers): each order's cost is carried by its last
+        seller in that order, so the cost dropped by removing the first n
+        sellers is the sum of the first n values, as in `evaluate`.
+        Also returns the cost of orders with an item of an "other" seller,
+        which is never dropped.
+        """
+        n_sellers = len(self.seller_ids)
+        items = self.items.tocsr()
+        last = np.maximum.reduceat(items.indices, items.indptr[:-1]) if items.nnz else np.zeros(0, np.int64)
+        cost = np.bincount(last, weights=self.order_cost, minlength=n_sellers + 1)
+        return cost[:n_sellers], float(cost[n_sellers])
+
+    # -----------------------------
+    # Scenario evaluation
+    # -----------------------------
+    def removal_matrix(self, removed) -> np.ndarray:
+        """
+        Normalises a scenario spec to a (n_sellers + 1, n_scenarios) 0/1 matrix.
+        `removed` can be a boolean vector / matrix over `seller_ids`
+        or an iterable of removed seller-ID sets.
+        """
+        n_sellers = len(self.seller_ids)
+        if isinstance(removed, np.ndarray) and removed.dtype == bool:
+            r = removed.reshape(n_sellers, -1).astype(float)
+        else:
+            sets = list(removed)
+            r = np.zeros((n_sellers, len(sets)))
+            for j, ids in enumerate(sets):
+                codes = self.seller_ids.get_indexer(list(ids))
+                r[codes[codes >= 0], j] = 1.0
+        return np.vstack([r, np.zeros((1, r.shape[1]))])
+
+    def evaluate(self, removed) -> pd.DataFrame:
+        """
+        One row per scenario with:
+        orders_removed, orders_partial, items_removed, sales_removed,
+        review_cost_removed (orders that fully disappear),
+        review_cost_partial (orders that lose only some of their items),
+        review_cost_attributed (what the seller-level model removes).
+        """
+        r = self.removal_matrix(removed)
+
+        removed_items = self.items @ r                         # (orders, scenarios)
+        kept_items = self.order_items[:, None] - removed_items
+
+        gone = (kept_items <= 0) & (self.order_items[:, None] > 0)
+        partial = (removed_items > 0) & (kept_items > 0)
+
+        return pd.DataFrame({
+            "orders_removed": gone.sum(axis=0),
+            "orders_partial": partial.sum(axis=0),
+            "items_removed": removed_items.sum(axis=0),
+            "sales_removed": self.seller_sales @ r,
+            "review_cost_removed": self.order_cost @ gone,
+            "review_cost_partial": self.order_cost @ partial,
+            "review_cost_attributed": self.seller_cost @ r,
+        })
@@ -0,0 +1,152 @@
+# olist/jobs.py
+"""
+Background-job layer for heavy recomputations (model refits, sweeps, feature
+rebuilds) triggered from the UI. Built on Dash background callbacks with a
+local diskcache result store, so no Redis/Celery is needed:
+
+    from olist import jobs
+
+    @dash.callback(..., background=True, manager=jobs.manager(),
+                   progress=[...], cancel=[...], running=[...])
+    def refit(set_progress, n_clicks): ...
+
+On top of Dash's DiskcacheManager, SharedJobManager
+- memoizes results by input hash (callback source + arguments + data version),
+  so a finished recomputation is served from disk without starting a process,
+- deduplicates identical in-flight jobs: a second user asking for the same key
+  attaches to the running process instead of starting another one,
+- reference-counts attached users, so a cancel only stops the process when
+  nobody else is waiting for it,
+- keeps progress readable by every attached user.
+
+The cache lives in OLIST_JOB_CACHE (default: <tmp>/olist-jobs) and is shared by
+all workers on the node.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from dash import DiskcacheManager
+
+CACHE_DIR_ENV = "OLIST_JOB_CACHE"
+# memoized results are dropped after a week without access
+EXPIRE_SECONDS = 7 * 24 * 3600
+# a lock holder that died is ignored after this many seconds
+LOCK_EXPIRE_SECONDS = 30
+
+
+def data_dirs() -> list[Path]:
+    """Folders the feature classes read (Olist: ~/.workintech/..., Seller: data/)."""
+    from olist.data import Olist
+    from olist.seller_updated import Seller
+
+    return list(dict.fromkeys([Olist.data_dir(), Seller.default_data_dir()]))
+
+
+def data_version() -> str:
+    """
+    Hash of the CSV files (name, size, mtime) the app is reading, so memoized
+    results are invalidated when the dataset changes.
+    """
+    h = hashlib.sha256()
+    for data_dir in data_dirs():
+        h.update(str(data_dir.resolve()).encode())
+        for path in sorted(data_dir.glob("*.csv")):
+            stat = path.stat()
+            h.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return h.hexdigest()[:16]
+
+
+class SharedJobManager(DiskcacheManager):
+    """DiskcacheManager with memoization, in-flight dedup and shared cancel."""
+
+    # returned instead of a pid when the result is already memoized
+    NO_JOB = 0
+
+    def __init__(self, cache, cache_by=None, expire=EXPIRE_SECONDS):
+        super().__init__(cache, cache_by=cache_by or [data_version], expire=expire)
+
+    @staticmethod
+    def _job_key(key: str) -> str:
+        return f"{key}-job"
+
+    @staticmethod
+    def _refs_key(pid) -> str:
+        return f"job-{int(pid)}-refs"
+
+    def _lock(self):
+        from diskcache import Lock
+
+        return Lock(self.handle, "olist-jobs-lock", expire=LOCK_EXPIRE_SECONDS)
+
+    @staticmethod
+    def _started_at(pid) -> float | None:
+        import psutil
+
+        try:
+            return psutil.Process(int(pid)).create_time()
+        except psutil.Error:
+            return None
+
+    def _memoized(self, key: str) -> bool:
+        result = self.handle.get(key, self.UNDEFINED)
+        if result is self.UNDEFINED:
+            return False
+        if isinstance(result, dict) and ("background_callback_error" in result or "_dash_no_update" in result):
+            # errors and PreventUpdate are not worth remembering
+            self.clear_cache_entry(key)
+            return False
+        return True
+
+    def call_job_fn(self, key, job_fn, args, context):
+        with self._lock():
+            if self._memoized(key):
+                return self.NO_JOB
+
+            # (pid, start time): a recycled pid is not mistaken for the job
+            pid, started = self.handle.get(self._job_key(key)) or (None, None)
+            if pid and self.job_running(pid) and self._started_at(pid) == started:
+                self.handle.incr(self._refs_key(pid))
+                return pid
+
+            pid = super().call_job_fn(key, job_fn, args, context)
+            self.handle.set(self._job_key(key), (pid, self._started_at(pid)), expire=self.expire)
+            self.handle.set(self._refs_key(pid), 1, expire=self.expire)
+            return pid
+
+    def terminate_job(self, job):
+        """Called on cancel and after a result is read; kills only the last reference."""
+        if job is None or not int(job):
+            return
+        with self._lock():
+            refs = self.handle.decr(self._refs_key(job), default=1)
+            if refs > 0:
+                return
+            self.handle.delete(self._refs_key(job))
+        super().terminate_job(job)
+
+    def job_running(self, job):
+        if job is None or not int(job):
+            return False
+        return super().job_running(job)
+
+    def get_progress(self, key):
+        # not deleted on read: every attached user polls the same progress key
+        return self.handle.get(self._make_progress_key(key))
+
+
+_manager: SharedJobManager | None = None
+
+
+def manager() -> SharedJobManager:
+    """Process-wide SharedJobManager (created on first use)."""
+    global _manager
+    if _manager is None:
+        import diskcache
+
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or Path(tempfile.gettempdir()) / "olist-jobs"
+        _manager = SharedJobManager(diskcache.Cache(str(cache_dir)))
+    return _manager
@@ -0,0 +1,173 @@
+# olist/leaderboard.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+
+def split_filter_part(filter_part: str):
+    """
+    Parses one `&&`-separated part of a Dash DataTable filter_query,
+    e.g. '{review_score} s< 3' -> ('review_score', 'lt', '3').
+    The value is returned as text; numeric columns convert it themselves.
+    """
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find("{") + 1: name_part.rfind("}")]
+
+                value_part = value_part.strip()
+                v0 = value_part[0] if value_part else ""
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + v0, v0)
+                else:
+                    value = value_part
+
+                # word operators need spaces after them in the filter string,
+                # but we don't want these later
+                return name, operator_type[0].strip(), value
+
+    return None, None, None
+
+
+class SellerTable:
+    """
+    Column store over `Seller.get_training_data()` for server-side paging.
+    Every column gets a numeric sort key once; full sort permutations are
+    cached per column on first use, shallow pages are served by partial
+    selection (np.argpartition) instead of a full sort.
+    """
+
+    # Pages ending above n / TOP_K_RATIO rows switch from partial selection to a cached full sort
+    TOP_K_RATIO = 8
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self.n = len(self.df)
+        self._keys: dict[str, np.ndarray] = {}
+        self._perms: dict[tuple[str, bool], np.ndarray] = {}
+        self._masks: dict[str, np.ndarray | None] = {}
+
+        for col in self.df.columns:
+            s = self.df[col]
+            if pd.api.types.is_numeric_dtype(s):
+                key = s.to_numpy(dtype=float, na_value=np.nan)
+            elif pd.api.types.is_datetime64_any_dtype(s):
+                key = s.astype("int64").to_numpy(dtype=float)
+                key[s.isna().to_numpy()] = np.nan
+            else:
+                codes, _ = pd.factorize(s, sort=True)
+                key = np.where(codes < 0, np.nan, codes).astype(float)
+            self._keys[col] = key
+
+    # -----------------------------
+    # Sorting
+    # -----------------------------
+    def _sort_key(self, column: str, ascending: bool) -> np.ndarray:
+        key = self._keys[column]
+        return np.where(np.isnan(key), np.inf, key if ascending else -key)
+
+    def sort_permutation(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Cached stable sort order for `column`; NaNs are always last."""
+        perm = self._perms.get((column, ascending))
+        if perm is None:
+            perm = np.argsort(self._sort_key(column, ascending), kind="stable")
+            self._perms[(column, ascending)] = perm
+        return perm
+
+    def top_k(self, column: str, k: int, ascending: bool = False, mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Row positions of the k best rows by `column`, found with partial selection.
+        Ties are broken by row position, so the result equals the first k rows
+        of the (filtered) full sort permutation.
+        """
+        rows = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        key = self._sort_key(column, ascending)[rows]
+
+        k = min(int(k), len(rows))
+        if k <= 0:
+            return rows[:0]
+
+        kth = np.partition(key, k - 1)[k - 1]
+        below = np.flatnonzero(key < kth)
+        ties = np.flatnonzero(key == kth)[: k - len(below)]
+        part = np.sort(np.concatenate([below, ties]))
+        return rows[part[np.argsort(key[part], kind="stable")]]
+
+    # -----------------------------
+    # Filtering
+    # -----------------------------
+    def filter_mask(self, filter_query: str | None) -> np.ndarray | None:
+        """Boolean row mask for a Dash filter_query (None = no filter)."""
+        if not filter_query:
+            return None
+        if filter_query in self._masks:
+            return self._masks[filter_query]
+
+        mask = np.ones(self.n, dtype=bool)
+        for part in filter_query.split(" && "):
+            col, op, value = split_filter_part(part)
+            if col not in self._keys:
+                continue
+
+            s = self.df[col]
+            number = pd.to_numeric(value, errors="coerce")
+            if op in ("contains", "datestartswith"):
+                mask &= s.astype("string").str.contains(value, case=False, regex=False).fillna(False).to_numpy()
+            elif pd.notna(number) and pd.api.types.is_numeric_dtype(s):
+                key, value = self._keys[col], float(number)
+                mask &= {
+                    "ge": key >= value, "le": key <= value, "lt": key < value,
+                    "gt": key > value, "ne": key != value, "eq": key == value,
+                }[op]
+            elif op in ("eq", "ne"):
+                eq = (s.astype("string") == value).fillna(False).to_numpy()
+                mask &= eq if op == "eq" else ~eq
+
+        if len(self._masks) > 64:
+            self._masks.clear()
+        self._masks[filter_query] = mask
+        return mask
+
+    # -----------------------------
+    # Paging
+    # -----------------------------
+    def page(self, page_current: int, page_size: int, sort_by=None, filter_query: str | None = None):
+        """
+        Returns (rows DataFrame for the requested page, total number of rows after filtering).
+        `sort_by` is the DataTable `sort_by` prop (single-column sorting).
+        """
+        mask = self.filter_mask(filter_query)
+        total = self.n if mask is None else int(mask.sum())
+        start = page_current * page_size
+        end = min(start + page_size, total)
+
+        if sort_by:
+            column = sort_by[0]["column_id"]
+            ascending = sort_by[0]["direction"] == "asc"
+
+            if (column, ascending) not in self._perms and end * self.TOP_K_RATIO < total:
+                idx = self.top_k(column, end, ascending=ascending, mask=mask)[start:end]
+            else:
+                perm = self.sort_permutation(column, ascending)
+                if mask is not None:
+                    perm = perm[mask[perm]]
+                idx = perm[start:end]
+        else:
+            rows = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+            idx = rows[start:end]
+
+        return self.df.iloc[idx], total
@@ -0,0 +1,328 @@
+# olist/memory.py
+"""
+Memory accounting for the loaded and derived datasets.
+
+`collect()` walks the dataset LRU cache (artifacts loaded through
+`datasets.load`, as `datasets.CACHE[<artifact>]`) and the page / olist
+modules, and finds every DataFrame, Series, Index, ndarray and sparse matrix
+they hold, including inside `.data` dicts, tuples and olist objects
+(SellerIndex, FinancialIndex, ...). `report()` gives deep
+per-table and per-column bytes, the process RSS and the duplicate copies of
+the same column data (compared order-insensitively, so a re-sorted copy such
+as SELLERS_ASC vs SELLERS_DESC counts as a duplicate).
+
+Budget: set OLIST_MEMORY_BUDGET_MB and call `enforce_budget()` after the
+pages are imported; a worker above the budget fails at startup.
+
+    python -m olist.memory            # report for the full app
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+BUDGET_ENV = "OLIST_MEMORY_BUDGET_MB"
+MODULE_PREFIXES = ("pages.", "olist.", "app")
+MAX_DEPTH = 4
+# columns smaller than this are not hashed for duplicate detection
+MIN_DUPLICATE_BYTES = 16 * 1024
+
+
+class MemoryBudgetExceeded(MemoryError):
+    pass
+
+
+# -----------------------------
+# Sizing helpers
+# -----------------------------
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _buffer_key(values) -> tuple:
+    """(address, nbytes) of the data behind an array: views of one column share it."""
+    arr = getattr(values, "_ndarray", values)
+    if isinstance(arr, np.ndarray):
+        return arr.__array_interface__["data"][0], arr.nbytes
+    return id(values), 0
+
+
+def _sparse_bytes(m) -> int:
+    return sum(getattr(m, a).nbytes for a in ("data", "indices", "indptr", "row", "col") if hasattr(m, a))
+
+
+def _is_sparse(obj) -> bool:
+    return type(obj).__module__.startswith("scipy.sparse")
+
+
+# -----------------------------
+# Discovery
+# -----------------------------
+class _Collector:
+    def __init__(self):
+        self.tables: dict[str, object] = {}
+        self.aliases: dict[str, list[str]] = defaultdict(list)
+        self._seen: dict[int, str] = {}
+
+    def add(self, name: str, obj, depth: int = 0):
+        if depth > MAX_DEPTH:
+            return
+        if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)) or _is_sparse(obj):
+            if isinstance(obj, np.ndarray) and obj.dtype != object and obj.nbytes < 1024:
+                return
+            first = self._seen.get(id(obj))
+            if first is not None:
+                self.aliases[first].append(name)
+                return
+            self._seen[id(obj)] = name
+            self.tables[name] = obj
+        elif isinstance(obj, dict):
+            if id(obj) in self._seen:
+                return
+            self._seen[id(obj)] = name
+            for key, value in list(obj.items()):
+                if isinstance(key, str):
+                    self.add(f"{name}[{key}]", value, depth + 1)
+        elif isinstance(obj, tuple):
+            for i, value in enumerate(obj):
+                self.add(f"{name}[{i}]", value, depth + 1)
+        elif type(obj).__module__.startswith("olist") and hasattr(obj, "__dict__"):
+            if id(obj) in self._seen:
+                return
+            self._seen[id(obj)] = name
+            for attr, value in vars(obj).items():
+                self.add(f"{name}.{attr}", value, depth + 1)
+
+
+def _add_dataset_cache(c: _Collector):
+    """Artifacts in the dataset LRU, labelled by name (name@fingerprint when several datasets hold one)."""
+    from olist.datasets import CACHE
+
+    with CACHE._lock:
+        entries = list(CACHE._entries.items())
+    c._seen[id(CACHE)] = "datasets.CACHE"
+    names = [key[0] if isinstance(key, tuple) else str(key) for key, _ in entries]
+    for (key, (value, _)), name in zip(entries, names):
+        if names.count(name) > 1 and isinstance(key, tuple):
+            name = "@".join(map(str, key))
+        c.add(f"datasets.CACHE[{name}]", value)
+
+
+def _discover(modules=None) -> _Collector:
+    c = _Collector()
+    if modules is None:
+        _add_dataset_cache(c)
+        modules = [m for n, m in sorted(sys.modules.items())
+                   if m is not None and n.startswith(MODULE_PREFIXES)]
+    for module in modules:
+        for attr, value in list(vars(module).items()):
+            if not attr.startswith("__"):
+                c.add(f"{module.__name__}.{attr}", value)
+    return c
+
+
+def collect(modules=None) -> dict[str, object]:
+    """name → array-like object, for every module-level dataset of the app."""
+    return _discover(modules).tables
+
+
+def object_bytes(obj) -> int:
+    """Deep bytes of the arrays / tables held by one object (shared buffers counted once)."""
+    c = _Collector()
+    c.add(type(obj).__name__, obj)
+    return report(c.tables, duplicates=False)["unique_bytes"] if c.tables else 0
+
+
+# -----------------------------
+# Report
+# -----------------------------
+def _columns(obj) -> dict[str, pd.Series | np.ndarray]:
+    if isinstance(obj, pd.DataFrame):
+        return {str(col): obj.iloc[:, i] for i, col in enumerate(obj.columns)}
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return {str(obj.name) if obj.name is not None else "values": obj}
+    return {"values": obj}
+
+
+def _column_bytes(col) -> int:
+    if isinstance(col, pd.Series):
+        return int(col.memory_usage(deep=True, index=False))
+    if isinstance(col, pd.Index):
+        return int(col.memory_usage(deep=True))
+    if _is_sparse(col):
+        return _sparse_bytes(col)
+    if col.dtype == object:
+        return int(pd.Series(col, copy=False).memory_usage(deep=True, index=False))
+    return int(col.nbytes)
+
+
+def _fingerprint(col) -> int:
+    """Order-insensitive content hash (sum of per-value hashes)."""
+    values = col if isinstance(col, (pd.Series, pd.Index)) else pd.Series(np.ravel(col), copy=False)
+    return int(pd.util.hash_pandas_object(values, index=False).to_numpy().sum())
+
+
+def _copy_bytes(col, nbytes: int) -> int:
+    """
+    Bytes a second copy of `col` costs. Re-sorted / filtered copies of object
+    columns share the Python objects and only duplicate the pointer array.
+    """
+    values = col._values if isinstance(col, (pd.Series, pd.Index)) else col
+    arr = getattr(values, "_ndarray", values)
+    if isinstance(arr, np.ndarray) and arr.dtype == object:
+        return arr.nbytes
+    return nbytes
+
+
+def report(tables: dict | None = None, duplicates: bool = True) -> dict:
+    """
+    {"rss_bytes", "tracked_bytes", "unique_bytes", "tables": [...], "duplicates": [...]}
+    tables: name, type, rows, bytes (deep), index_bytes, columns {col: bytes}, aliases.
+    unique_bytes counts shared buffers (views, shared columns) once; string
+    objects shared by several object columns are still counted per column.
+    duplicates: groups of columns holding the same values in different buffers.
+    """
+    if tables is None:
+        found = _discover()
+        tables, aliases = found.tables, found.aliases
+    else:
+        aliases = {}
+
+    rows, shared = [], {}
+    candidates = defaultdict(list)  # (dtype, len) → [(table, column, col, bytes, buffer)]
+    for name, obj in tables.items():
+        if _is_sparse(obj):
+            nbytes = _sparse_bytes(obj)
+            rows.append({"name": name, "type": type(obj).__name__, "rows": obj.shape[0],
+                         "bytes": nbytes, "index_bytes": 0, "columns": {}, "aliases": aliases.get(name, [])})
+            shared[(id(obj), 0)] = nbytes
+            continue
+
+        columns = {}
+        for col_name, col in _columns(obj).items():
+            nbytes = _column_bytes(col)
+            columns[col_name] = nbytes
+            values = col._values if isinstance(col, (pd.Series, pd.Index)) else col
+            key = _buffer_key(values)
+            shared[key if key[1] else (key[0], nbytes)] = nbytes
+            candidates[(str(col.dtype), len(col))].append((name, col_name, col, nbytes, key))
+
+        index_bytes = int(obj.index.memory_usage(deep=True)) if isinstance(obj, (pd.DataFrame, pd.Series)) else 0
+        rows.append({
+            "name": name, "type": type(obj).__name__, "rows": len(obj),
+            "bytes": sum(columns.values()) + index_bytes, "index_bytes": index_bytes,
+            "columns": dict(sorted(columns.items(), key=lambda kv: -kv[1])),
+            "aliases": aliases.get(name, []),
+        })
+
+    dupes = []
+    if duplicates:
+        for group in candidates.values():
+            # only columns of the same dtype and length can be copies; skip views of one buffer
+            if len({g[4] for g in group}) < 2 or group[0][3] < MIN_DUPLICATE_BYTES:
+                continue
+            by_hash = defaultdict(list)
+            for table, col_name, col, nbytes, key in group:
+                by_hash[_fingerprint(col)].append((f"{table}:{col_name}", nbytes, key, col))
+            for members in by_hash.values():
+                buffers = {m[2] for m in members}
+                if len(buffers) > 1:
+                    dupes.append({
+                        "columns": [m[0] for m in members],
+                        "bytes_each": members[0][1],
+                        "wasted_bytes": _copy_bytes(members[0][3], members[0][1]) * (len(buffers) - 1),
+                    })
+        dupes.sort(key=lambda d: -d["wasted_bytes"])
+
+    rows.sort(key=lambda r: -r["bytes"])
+    return {
+        "rss_bytes": rss_bytes(),
+        "tracked_bytes": sum(r["bytes"] for r in rows),
+        "unique_bytes": sum(shared.values()),
+        "wasted_bytes": sum(d["wasted_bytes"] for d in dupes),
+        "tables": rows,
+        "duplicates": dupes,
+    }
+
+
+def format_report(r: dict, top: int = 25, columns: int = 5) -> str:
+    mb = 1024 ** 2
+    lines = [
+        f"RSS {r['rss_bytes'] / mb:,.1f} MB | tracked {r['tracked_bytes'] / mb:,.1f} MB "
+        f"(unique {r['unique_bytes'] / mb:,.1f} MB) | duplicate copies {r['wasted_bytes'] / mb:,.1f} MB",
+        "",
+    ]
+    for t in r["tables"][:top]:
+        alias = f"  (= {', '.join(t['aliases'])})" if t["aliases"] else ""
+        lines.append(f"{t['bytes'] / mb:9.1f} MB  {t['name']}  [{t['type']}, {t['rows']:,} rows]{alias}")
+        for col, nbytes in list(t["columns"].items())[:columns]:
+            lines.append(f"{'':14}{nbytes / mb:7.1f} MB  {col}")
+    if len(r["tables"]) > top:
+        lines.append(f"... {len(r['tables']) - top} more")
+    if r["duplicates"]:
+        lines += ["", "Duplicate copies (same values, any order):"]
+        for d in r["duplicates"][:top]:
+            lines.append(f"{d['wasted_bytes'] / mb:9.1f} MB  " + " == ".join(d["columns"]))
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Budget / Flask integration
+# -----------------------------
+def budget_bytes() -> int | None:
+    value = os.environ.get(BUDGET_ENV, "").strip()
+    return int(float(value) * 1024 ** 2) if value else None
+
+
+def enforce_budget(budget: int | None = None) -> int:
+    """
+    Raises MemoryBudgetExceeded (with the top consumers) when the process RSS
+    is above `budget` bytes, default OLIST_MEMORY_BUDGET_MB. No-op when unset.
+    """
+    budget = budget_bytes() if budget is None else budget
+    rss = rss_bytes()
+    if budget is not None and rss > budget:
+        r = report(duplicates=False)
+        raise MemoryBudgetExceeded(
+            f"Process uses {rss / 1024 ** 2:,.0f} MB, budget is {budget / 1024 ** 2:,.0f} MB "
+            f"({BUDGET_ENV}).\n" + format_report(r, top=10, columns=3)
+        )
+    return rss
+
+
+def install(server, endpoint: str = "/_memory"):
+    """JSON memory report on the Flask server (`?duplicates=0` skips hashing)."""
+    from flask import Response, request
+
+    @server.route(endpoint)
+    def memory_endpoint():
+        from olist import render_cache
+        from olist.datasets import CACHE
+
+        r = report(duplicates=request.args.get("duplicates", "1") != "0")
+        r["budget_bytes"] = budget_bytes()
+        r["dataset_cache"] = CACHE.stats()
+        r["render_cache"] = render_cache.CACHE.stats()
+        return Response(json.dumps(r, separators=(",", ":")), mimetype="application/json")
+
+
+if __name__ == "__main__":
+    import app  # noqa: F401  (pages load their data at import)
+
+    print(format_report(report()))
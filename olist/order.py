@@ -2,8 +2,10 @@ import pandas as pd
 import numpy as np
 from olist.utils import haversine_distance
 from olist.data import Olist
+from olist.perf import instrument
 
 
+@instrument
 class Order:
     '''
     DataFrames containing all orders as index,
@@ -29,11 +31,11 @@ class Order:
             orders = orders.query("order_status=='delivered'").copy()
 
         # handle datetime
-        orders.loc[:, 'order_delivered_customer_date'] = \
+        orders['order_delivered_customer_date'] = \
             pd.to_datetime(orders['order_delivered_customer_date'])
-        orders.loc[:, 'order_estimated_delivery_date'] = \
+        orders['order_estimated_delivery_date'] = \
             pd.to_datetime(orders['order_estimated_delivery_date'])
-        orders.loc[:, 'order_purchase_timestamp'] = \
+        orders['order_purchase_timestamp'] = \
             pd.to_datetime(orders['order_purchase_timestamp'])
 
         # compute delay vs expected
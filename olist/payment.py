@@ -0,0 +1,193 @@
+# olist/payment.py
+"""
+Payment-mix analytics over olist_order_payments_dataset: payment type mix,
+installment exposure, financing cost of installments and the gap between the
+paid value and price + freight, per order and per seller.
+
+Every table is one grouped pass (factorized keys + np.bincount) and is cached
+on the instance, so rebuilding after a data refresh costs a few hundred ms.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from olist.data import Olist
+from olist.perf import instrument
+
+PAYMENT_TYPES = ("credit_card", "boleto", "voucher", "debit_card", "other")
+
+# Monthly rate at which installment receivables are anticipated (antecipação).
+# A payment in n installments is received on average (n + 1) / 2 months after
+# the sale, i.e. (n - 1) / 2 months later than a single payment.
+ANTICIPATION_RATE = 0.02
+
+
+def financing_cost(values, installments, rate: float = ANTICIPATION_RATE) -> np.ndarray:
+    """Cost of anticipating installment payments: value × rate × (n − 1) / 2."""
+    n = np.maximum(np.asarray(installments, dtype=float), 1)
+    return np.asarray(values, dtype=float) * rate * (n - 1) / 2
+
+
+@instrument
+class Payment:
+    """
+    Order- and seller-level payment features. Reads only the payments and
+    items tables (from Olist.data_dir() unless `data` / `data_dir` is given).
+    """
+
+    FILES = {
+        "order_payments": Olist.FILES["order_payments"],
+        "order_items": Olist.FILES["order_items"],
+    }
+
+    def __init__(self, data: dict[str, pd.DataFrame] | None = None, data_dir: str | Path | None = None,
+                 rate: float = ANTICIPATION_RATE):
+        self.data_dir = Path(data_dir) if data_dir else Olist.data_dir()
+        self.data = data if data is not None else self._load_data()
+        self.rate = rate
+        self._cache: dict[str, pd.DataFrame] = {}
+
+    def _load_data(self) -> dict[str, pd.DataFrame]:
+        missing = [f for f in self.FILES.values() if not (self.data_dir / f).exists()]
+        if missing:
+            raise FileNotFoundError(f"Eksik CSV dosyaları ({self.data_dir}): {', '.join(missing)}")
+        return {key: pd.read_csv(self.data_dir / name) for key, name in self.FILES.items()}
+
+    def _cached(self, key: str, build) -> pd.DataFrame:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def get_order_payments(self) -> pd.DataFrame:
+        """
+        Returns a DataFrame with one row per order_id (orders with a payment):
+        [order_id, paid_value, n_payments, max_installments, <payment_type>_value...,
+        installment_value, financing_cost, items_value, payment_gap]
+        installment_value is the value paid in more than one installment;
+        payment_gap = paid_value − (price + freight), NaN for orders without items.
+        """
+        return self._cached("order_payments", self._build_order_payments)
+
+    def _build_order_payments(self) -> pd.DataFrame:
+        pay = self.data["order_payments"]
+        codes, order_ids = pd.factorize(pay["order_id"])
+        n = len(order_ids)
+
+        values = pay["payment_value"].to_numpy(dtype=float)
+        installments = pay["payment_installments"].fillna(1).to_numpy(dtype=float)
+        types = pd.Categorical(pay["payment_type"], categories=PAYMENT_TYPES).codes
+        types = np.where(types < 0, len(PAYMENT_TYPES) - 1, types)
+
+        out = pd.DataFrame({
+            "order_id": order_ids,
+            "paid_value": np.bincount(codes, weights=values, minlength=n),
+            "n_payments": np.bincount(codes, minlength=n),
+            "max_installments": pd.Series(installments).groupby(codes).max().to_numpy(),
+        })
+        by_type = np.bincount(codes * len(PAYMENT_TYPES) + types, weights=values,
+                              minlength=n * len(PAYMENT_TYPES)).reshape(n, len(PAYMENT_TYPES))
+        for i, t in enumerate(PAYMENT_TYPES):
+            out[f"{t}_value"] = by_type[:, i]
+        out["installment_value"] = np.bincount(codes, weights=values * (installments > 1), minlength=n)
+        out["financing_cost"] = np.bincount(codes, weights=financing_cost(values, installments, self.rate),
+                                            minlength=n)
+
+        items = self.data["order_items"]
+        item_codes = pd.Index(order_ids).get_indexer(items["order_id"])
+        ok = item_codes >= 0
+        item_value = (items["price"] + items["freight_value"]).to_numpy(dtype=float)[ok]
+        has_items = np.bincount(item_codes[ok], minlength=n) > 0
+        out["items_value"] = np.where(has_items, np.bincount(item_codes[ok], weights=item_value, minlength=n), np.nan)
+        out["payment_gap"] = out["paid_value"] - out["items_value"]
+        return out
+
+    def get_seller_order_payments(self) -> pd.DataFrame:
+        """
+        Returns a DataFrame with one row per (order_id, seller_id):
+        [order_id, seller_id, share, paid_value, installment_value, financing_cost, payment_gap]
+        Order payments are attributed to sellers by their share of price + freight.
+        """
+        return self._cached("seller_order_payments", self._build_seller_order_payments)
+
+    def _build_seller_order_payments(self) -> pd.DataFrame:
+        orders = self.get_order_payments()
+        items = self.data["order_items"]
+        pair_codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([items["order_id"], items["seller_id"]]))
+        item_value = (items["price"] + items["freight_value"]).to_numpy(dtype=float)
+        pair_value = np.bincount(pair_codes, weights=item_value, minlength=len(pairs))
+
+        out = pd.DataFrame({"order_id": pairs.get_level_values(0), "seller_id": pairs.get_level_values(1)})
+        o = pd.Index(orders["order_id"]).get_indexer(out["order_id"])
+        out = out[o >= 0].reset_index(drop=True)
+        pair_value, o = pair_value[o >= 0], o[o >= 0]
+
+        order_value = orders["items_value"].to_numpy()[o]
+        share = np.divide(pair_value, order_value, out=np.zeros_like(pair_value), where=order_value > 0)
+        out["share"] = share
+        for col in ("paid_value", "installment_value", "financing_cost", "payment_gap"):
+            out[col] = orders[col].to_numpy()[o] * share
+        return out
+
+    def get_seller_payments(self) -> pd.DataFrame:
+        """
+        Returns a DataFrame with one row per seller_id:
+        [seller_id, paid_value, <payment_type>_share..., installment_share,
+        avg_installments, financing_cost, payment_gap]
+        Shares are fractions of paid_value; avg_installments is value-weighted.
+        """
+        return self._cached("seller_payments", self._build_seller_payments)
+
+    def _build_seller_payments(self) -> pd.DataFrame:
+        orders = self.get_order_payments()
+        pairs = self.get_seller_order_payments()
+        codes, sellers = pd.factorize(pairs["seller_id"])
+        o = pd.Index(orders["order_id"]).get_indexer(pairs["order_id"])
+        share = pairs["share"].to_numpy()
+        n = len(sellers)
+
+        def total(values) -> np.ndarray:
+            return np.bincount(codes, weights=values, minlength=n)
+
+        paid = total(pairs["paid_value"].to_numpy())
+        safe_paid = np.where(paid > 0, paid, np.nan)
+        out = pd.DataFrame({"seller_id": sellers, "paid_value": paid})
+        for t in PAYMENT_TYPES:
+            out[f"{t}_share"] = total(orders[f"{t}_value"].to_numpy()[o] * share) / safe_paid
+        out["installment_share"] = total(pairs["installment_value"].to_numpy()) / safe_paid
+        weighted = orders["max_installments"].to_numpy()[o] * pairs["paid_value"].to_numpy()
+        out["avg_installments"] = total(weighted) / safe_paid
+        out["financing_cost"] = total(pairs["financing_cost"].to_numpy())
+        out["payment_gap"] = total(np.nan_to_num(pairs["payment_gap"].to_numpy()))
+        return out
+
+    def get_payment_mix(self) -> pd.DataFrame:
+        """
+        Returns one row per payment_type:
+        [payment_type, payments, orders, value, value_share, avg_installments, financing_cost]
+        """
+        return self._cached("payment_mix", self._build_payment_mix)
+
+    def _build_payment_mix(self) -> pd.DataFrame:
+        pay = self.data["order_payments"]
+        types = pay["payment_type"].where(pay["payment_type"].isin(PAYMENT_TYPES[:-1]), "other")
+        values = pay["payment_value"].to_numpy(dtype=float)
+        installments = pay["payment_installments"].fillna(1).to_numpy(dtype=float)
+        frame = pd.DataFrame({
+            "payment_type": types.to_numpy(),
+            "order_id": pay["order_id"].to_numpy(),
+            "value": values,
+            "weighted_installments": values * installments,
+            "financing_cost": financing_cost(values, installments, self.rate),
+        })
+        out = frame.groupby("payment_type").agg(
+            payments=("value", "size"), orders=("order_id", "nunique"), value=("value", "sum"),
+            weighted_installments=("weighted_installments", "sum"), financing_cost=("financing_cost", "sum"),
+        )
+        out["value_share"] = out["value"] / out["value"].sum()
+        out["avg_installments"] = out.pop("weighted_installments") / out["value"]
+        out = out.reindex([t for t in PAYMENT_TYPES if t in out.index])
+        return out.reset_index()[["payment_type", "payments", "orders", "value", "value_share",
+                                  "avg_installments", "financing_cost"]]
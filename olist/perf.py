@@ -0,0 +1,281 @@
+# olist/perf.py
+"""
+Opt-in hot-path timing for feature methods and Dash callbacks.
+
+Enable with the environment variable OLIST_PERF=1 (wall time + rows) or
+OLIST_PERF=memory (also peak allocated bytes of feature methods via
+tracemalloc; measured methods then run one at a time, so latencies are only
+meaningful in the default mode). When disabled,
+`instrument` returns classes untouched and `install` only registers a
+`/_perf` endpoint that reports {"enabled": false}, so there is no per-call
+overhead.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_MODE = os.environ.get("OLIST_PERF", "").strip().lower()
+ENABLED = _MODE not in ("", "0", "false", "off")
+TRACE_MEMORY = _MODE == "memory"
+
+# Start tracing before the pages compute their data at import time
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float("inf"))
+
+
+class Stats:
+    """Running totals + a fixed-bucket latency histogram for one hot path."""
+
+    __slots__ = ("count", "total_s", "min_s", "max_s", "buckets", "rows_in", "rows_out", "alloc_bytes", "out_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_s = 0.0
+        self.min_s = float("inf")
+        self.max_s = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.rows_in = 0
+        self.rows_out = 0
+        self.alloc_bytes = 0
+        self.out_bytes = 0
+
+    def add(self, seconds: float, rows_in: int, rows_out: int, alloc_bytes: int, out_bytes: int):
+        self.count += 1
+        self.total_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+        ms = seconds * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.alloc_bytes += alloc_bytes
+        self.out_bytes += out_bytes
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper bucket bound containing the q-quantile."""
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= target and n:
+                return min(bound, self.max_s * 1000)
+        return self.max_s * 1000
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.total_s / self.count if self.count else 0.0,
+            "min_ms": 1000 * self.min_s if self.count else 0.0,
+            "max_ms": 1000 * self.max_s,
+            "p50_ms": self.quantile_ms(0.50),
+            "p95_ms": self.quantile_ms(0.95),
+            "p99_ms": self.quantile_ms(0.99),
+            "histogram_ms": {str(b): n for b, n in zip(BUCKETS_MS, self.buckets) if n},
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "alloc_bytes": self.alloc_bytes,
+            "out_bytes": self.out_bytes,
+        }
+
+
+_registry: dict[str, Stats] = {}
+_lock = threading.Lock()
+_request = threading.local()
+
+
+def record(name: str, seconds: float, rows_in: int = 0, rows_out: int = 0,
+           alloc_bytes: int = 0, out_bytes: int = 0):
+    with _lock:
+        stats = _registry.get(name)
+        if stats is None:
+            stats = _registry[name] = Stats()
+        stats.add(seconds, rows_in, rows_out, alloc_bytes, out_bytes)
+
+    # also collected for the Server-Timing header of the current request
+    timings = getattr(_request, "timings", None)
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {name: stats.as_dict() for name, stats in sorted(_registry.items())}
+
+
+def reset():
+    with _lock:
+        _registry.clear()
+
+
+def _n_rows(obj) -> int:
+    try:
+        return len(obj)
+    except TypeError:
+        return 0
+
+
+# tracemalloc's peak is process-wide: in memory mode measured blocks run one at
+# a time. Re-entrant, so a measured method may call another; each thread keeps
+# the running peak of its open blocks, innermost last. Request-level timing does
+# not take this lock (see `install`), so requests themselves still run in parallel.
+_memory_lock = threading.RLock()
+_memory = threading.local()
+
+
+class _Measure:
+    """
+    Context manager measuring wall time and (optionally) alloc_bytes: the peak
+    of traced memory during the block above its level at entry.
+    `memory=False` measures wall time only, without taking the memory lock.
+    """
+
+    __slots__ = ("start", "mem_start", "seconds", "alloc_bytes", "_open", "_memory")
+
+    def __init__(self, memory: bool = True):
+        self._memory = memory
+
+    def __enter__(self):
+        self.mem_start = 0
+        self._memory = self._memory and TRACE_MEMORY
+        if self._memory:
+            _memory_lock.acquire()
+            peaks = _memory.__dict__.setdefault("peaks", [])
+            current, peak = tracemalloc.get_traced_memory()
+            if peaks:  # keep the enclosing block's peak before resetting it
+                peaks[-1] = max(peaks[-1], peak)
+            tracemalloc.reset_peak()
+            peaks.append(current)
+            self.mem_start = current
+        self._open = True
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self._open:
+            return False
+        self._open = False
+        self.seconds = time.perf_counter() - self.start
+        self.alloc_bytes = 0
+        if self._memory:
+            peaks = _memory.peaks
+            peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if peaks:
+                peaks[-1] = max(peaks[-1], peak)
+            self.alloc_bytes = max(peak - self.mem_start, 0)
+            _memory_lock.release()
+        return False
+
+
+def timed(name: str):
+    """
+    Decorator recording every call of a feature method under `name`.
+    rows_in = total rows of `self.data` tables, rows_out = len(result).
+    """
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            data = getattr(self, "data", None)
+            rows_in = sum(_n_rows(t) for t in data.values()) if isinstance(data, dict) else 0
+            with _Measure() as m:
+                result = fn(self, *args, **kwargs)
+            record(name, m.seconds, rows_in, _n_rows(result), m.alloc_bytes)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def instrument(cls):
+    """Class decorator: wraps every public `get_*` method of `cls` with `timed`."""
+    if not ENABLED:
+        return cls
+    for attr, fn in list(vars(cls).items()):
+        if attr.startswith("get_") and callable(fn):
+            setattr(cls, attr, timed(f"{cls.__name__}.{attr}")(fn))
+    return cls
+
+
+# -----------------------------
+# Flask / Dash integration
+# -----------------------------
+def _server_timing(timings) -> str:
+    parts = []
+    for name, seconds in timings:
+        token = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        desc = name.replace('"', "'")
+        parts.append(f'{token};desc="{desc}";dur={seconds * 1000:.2f}')
+    return ", ".join(parts)
+
+
+def install(server, endpoint: str = "/_perf"):
+    """
+    Registers the `/_perf` JSON endpoint on the Flask server and, when enabled,
+    request hooks that time every Dash callback (`/_dash-update-component`,
+    recorded as `callback:<id.prop>+...` with the response size as out_bytes)
+    and add a Server-Timing header listing the hot paths hit by the request.
+
+    Callbacks are timed for wall time only: holding the memory lock for a whole
+    request would serialize every request in memory mode. Their allocations are
+    reported by the feature methods they call.
+    """
+    from flask import Response, g, request
+
+    @server.route(endpoint)
+    def perf_endpoint():
+        body = {"enabled": ENABLED, "trace_memory": TRACE_MEMORY, "stats": snapshot() if ENABLED else {}}
+        if ENABLED and TRACE_MEMORY:
+            body["warning"] = ("latency is not valid in memory mode: tracemalloc slows every allocation and "
+                               "measured methods wait for each other; use OLIST_PERF=1 for timings")
+        return Response(json.dumps(body, separators=(",", ":")), mimetype="application/json")
+
+    if not ENABLED:
+        return
+
+    @server.before_request
+    def _perf_start():
+        _request.timings = []
+        g._perf_measure = _Measure(memory=False).__enter__()
+
+    @server.after_request
+    def _perf_finish(response):
+        m = getattr(g, "_perf_measure", None)
+        timings = getattr(_request, "timings", None) or []
+        _request.timings = None
+        if m is None:
+            return response
+        m.__exit__(None, None, None)
+
+        if request.path.endswith("/_dash-update-component"):
+            payload = request.get_json(silent=True) or {}
+            outputs = payload.get("outputs")
+            outputs = outputs if isinstance(outputs, list) else [outputs] if outputs else []
+            name = "callback:" + ("+".join(f"{o.get('id')}.{o.get('property')}" for o in outputs
+                                           if isinstance(o, dict)) or payload.get("output", "?"))
+            record(name, m.seconds, out_bytes=response.calculate_content_length() or 0)
+            timings.append((name, m.seconds))
+
+        if timings:
+            response.headers["Server-Timing"] = _server_timing(timings)
+        return response
+
+    @server.teardown_request
+    def _perf_close(exc):
+        # a request that failed before after_request is still closed
+        m = g.pop("_perf_measure", None)
+        if m is not None:
+            m.__exit__(None, None, None)
@@ -3,16 +3,39 @@
 # - `04-Logistic-Regression/Recap/product_updated_solution.py`
 import pandas as pd
 import numpy as np
-from olist.data import Olist
 from olist.order import Order
+from olist.perf import instrument
 
 
+def aggregate_categories(products, agg="mean", categories=None):
+    """
+    Groups a product training table by `category` in one pass. `agg` is one
+    aggregation or a list of them (columns become (column, agg) pairs);
+    `quantity` is always summed. `categories` filters rows before grouping.
+    """
+    if categories is not None:
+        products = products[products['category'].isin(list(categories))]
+    aggs = [agg] if isinstance(agg, str) else list(agg)
+
+    columns = list(products.select_dtypes(include='number').columns)
+    grouped = products.groupby('category')
+    product_cat = grouped[columns].agg(aggs)
+    quantity = grouped['quantity'].sum()
+    for a in aggs:
+        product_cat[('quantity', a)] = quantity
+
+    if isinstance(agg, str):
+        product_cat = product_cat.droplevel(1, axis=1)
+    return product_cat
+
+
+@instrument
 class Product:
-    def __init__(self):
-        # Import data only once
-        olist = Olist()
-        self.data = olist.get_data()
-        self.order = Order()
+    def __init__(self, order: Order | None = None):
+        # Import data only once (shared with Order)
+        self.order = order or Order()
+        self.data = self.order.data
+        self._products = None
 
     def get_product_features(self):
         """
@@ -133,19 +156,19 @@ class Product:
         'cost_of_reviews', 'n_orders', 'quantity', 'sales', 'revenues',
         'profits']
         """
-        training_set =\
-            self.get_product_features()\
-                .merge(
-                self.get_wait_time(), on='product_id'
-               ).merge(
-                self.get_price(), on='product_id'
-               ).merge(
-                self.get_review_score(), on='product_id'
-               ).merge(
-                self.get_quantity(), on='product_id'
-               ).merge(
-                self.get_sales(), on='product_id'
-               )
+        features = self.get_product_features().set_index('product_id')
+        aggregates = self._product_aggregates()
+
+        # Same rows and order as chaining inner merges on product_id: keep the
+        # products present in every aggregate, then align each one once
+        keep = np.ones(len(features), dtype=bool)
+        for aggregate in aggregates:
+            keep &= features.index.isin(aggregate.index)
+        index = features.index[keep]
+        training_set = pd.concat(
+            [features.loc[keep]] + [aggregate.reindex(index) for aggregate in aggregates],
+            axis=1,
+        ).reset_index()
 
         # compute the economics (revenues, profits)
         olist_sales_cut = 0.1
@@ -154,18 +177,46 @@ class Product:
             'cost_of_reviews']
         return training_set
 
-    def get_product_cat(self, agg="mean"):
+    def _product_aggregates(self):
+        """
+        Per-product aggregates for get_training_data, each indexed by product_id:
+        wait_time, price, review shares, n_orders/quantity/sales. The order_items
+        table is grouped once for all item-level statistics.
+        """
+        items = self.data['order_items']
+        by_product = items.groupby('product_id')
+        item_stats = pd.DataFrame({
+            'price': by_product['price'].mean(),
+            'n_orders': by_product['order_id'].nunique(),
+            'quantity': by_product['order_id'].count(),
+            'sales': by_product['price'].sum(),
+        })
+
+        # order-level wait time looked up by position instead of merged
+        orders_products = items[['order_id', 'product_id']].drop_duplicates()
+        wait = self.order.get_wait_time()
+        pos = pd.Index(wait['order_id']).get_indexer(orders_products['order_id'])
+        wait_time = pd.Series(wait['wait_time'].to_numpy()[pos[pos >= 0]],
+                              index=orders_products['product_id'].to_numpy()[pos >= 0])
+        wait_time = wait_time.groupby(level=0).mean().rename('wait_time')
+
+        reviews = self.get_review_score().set_index('product_id')
+        return [wait_time.to_frame(), item_stats[['price']], reviews,
+                item_stats[['n_orders', 'quantity', 'sales']]]
+
+    def get_product_cat(self, agg="mean", categories=None):
         '''
         Returns a DataFrame with `category` as index, and aggregating various properties for each category in columns such as:
         - `quantity`: total number of products sold for this category.
         - `product_weight_g`: mean or median weight per category
         - ...
+        `agg` can be a list (e.g. ["mean", "median"]), computed in one grouped pass;
+        `categories` restricts the categories before grouping.
         '''
-        products = self.get_training_data()
-
-        columns = list(products.select_dtypes(exclude=['object']).columns)
-        agg_params = dict(zip(columns, [agg] * len(columns)))
-        agg_params['quantity'] = 'sum'
+        return aggregate_categories(self._product_table(), agg, categories)
 
-        product_cat = products.groupby("category").agg(agg_params)
-        return product_cat
+    def _product_table(self):
+        # get_training_data is computed once per instance
+        if self._products is None:
+            self._products = self.get_training_data()
+        return self._products
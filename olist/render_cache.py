@@ -0,0 +1,182 @@
+# olist/render_cache.py
+"""
+Pre-rendered page layouts for pages whose content is fully determined by
+their artifacts.
+
+A page opts in with `dash.register_page(..., render_cache=("artifact", ...))`
+(an empty tuple for static pages); its layout should be built from exactly
+those artifacts. The first routing request for such a page goes through Dash
+as usual; its JSON response is kept together with a gzip copy and an ETag,
+keyed by (path, dataset) and stamped with the data version (fingerprints of
+the listed artifacts). Every routing response of the page, the first one
+included, is sent gzip-compressed when the client accepts it, and a request
+whose If-None-Match carries the current ETag gets a 304. Later requests with
+the same version are answered from the stored bytes before Dash runs the
+layout or serializes a component tree. The dataset (?dataset=) is part of
+the key only for pages whose layout takes a `dataset` argument.
+
+The JSON shell a reload fetches with GET (`/_dash-layout`,
+`/_dash-dependencies`) gets an ETag and `Cache-Control: no-cache`, so the
+browser revalidates it and receives a 304 when nothing changed. The page
+HTML itself is left alone: Dash embeds a per-request token in it.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import inspect
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from olist import datasets
+
+CACHE_ENV = "OLIST_RENDER_CACHE_MB"
+DEFAULT_CACHE_MB = 64
+# Seconds a computed data version is trusted before the fingerprints are re-read
+VERSION_TTL_S = 2.0
+GZIP_LEVEL = 6
+ROUTER_OUTPUT = "_pages_content.children"
+SHELL_ROUTES = ("/_dash-layout", "/_dash-dependencies")
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    version: str
+    etag: str
+    body: bytes
+    gzipped: bytes
+
+    @classmethod
+    def from_body(cls, version: str, body: bytes) -> "RenderedPage":
+        etag = hashlib.sha256(body).hexdigest()[:20]
+        return cls(version, etag, body, gzip.compress(body, GZIP_LEVEL, mtime=0))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + len(self.gzipped)
+
+
+def _cache_budget() -> int:
+    try:
+        mb = float(os.environ.get(CACHE_ENV) or DEFAULT_CACHE_MB)
+    except ValueError:
+        mb = DEFAULT_CACHE_MB
+    return int(mb * 1024 ** 2)
+
+
+# (path, dataset) → RenderedPage of the latest data version
+CACHE = datasets.LRUCache(_cache_budget(), weigh=lambda page: page.nbytes)
+
+_versions: dict[tuple, tuple[float, str]] = {}
+_versions_lock = threading.Lock()
+
+
+def data_version(dataset: str, names) -> str:
+    """Combined fingerprint of artifacts `names` in `dataset`, memoized for VERSION_TTL_S."""
+    from olist import artifacts
+
+    key = (dataset, tuple(names))
+    now = time.monotonic()
+    with _versions_lock:
+        cached = _versions.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    with datasets.use(dataset):
+        version = "-".join(artifacts.fingerprint(n) for n in names) or "static"
+    with _versions_lock:
+        _versions[key] = (now + VERSION_TTL_S, version)
+    return version
+
+
+def _router_inputs(payload) -> dict | None:
+    """{id.property: value} of a pages routing request, None for any other callback."""
+    if not isinstance(payload, dict) or ROUTER_OUTPUT not in str(payload.get("output", "")):
+        return None
+    inputs = payload.get("inputs")
+    if not isinstance(inputs, list):
+        return None
+    return {f"{i.get('id')}.{i.get('property')}": i.get("value") for i in inputs if isinstance(i, dict)}
+
+
+def _takes_dataset(layout) -> bool:
+    if not callable(layout):
+        return False
+    try:
+        return "dataset" in inspect.signature(layout).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def cached_pages() -> dict[str, dict]:
+    """Registered pages with a `render_cache` entry, by path without slashes."""
+    import dash
+    return {page["path"].strip("/"): page for page in dash.page_registry.values() if "render_cache" in page}
+
+
+def install(app):
+    """Serve routing responses of `render_cache` pages from pre-rendered, pre-compressed bytes."""
+    from flask import Response, g, request
+
+    server = app.server
+
+    def _entry_key():
+        values = _router_inputs(request.get_json(silent=True))
+        if values is None:
+            return None
+        path = app.strip_relative_path(values.get("_pages_location.pathname") or "/") or ""
+        page = cached_pages().get(path.strip("/"))
+        if page is None:
+            return None
+        # pages that do not select a dataset always show the default one
+        dataset = (datasets.from_search(values.get("_pages_location.search"))
+                   if _takes_dataset(page.get("layout")) else datasets.DEFAULT)
+        return (page["path"], dataset), data_version(dataset, page["render_cache"])
+
+    def _respond(response, entry: RenderedPage, state: str):
+        """`response` carrying `entry`: 304 on a matching If-None-Match, else gzip when accepted."""
+        if request.if_none_match.contains_weak(entry.etag):
+            response.status_code = 304
+            response.set_data(b"")
+        elif "gzip" in request.headers.get("Accept-Encoding", ""):
+            response.set_data(entry.gzipped)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response.set_data(entry.body)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["X-Render-Cache"] = state
+        response.set_etag(entry.etag, weak=True)
+        return response
+
+    @server.before_request
+    def _render_cache_lookup():
+        if request.method != "POST" or not request.path.endswith("/_dash-update-component"):
+            return None
+        found = _entry_key()
+        if found is None:
+            return None
+        key, version = found
+        entry = CACHE.get(key)
+        if entry is not None and entry.version == version:
+            return _respond(Response(mimetype="application/json"), entry, "hit")
+        g._render_cache_key = found
+        return None
+
+    @server.after_request
+    def _render_cache_store(response):
+        found = g.pop("_render_cache_key", None)
+        if found is not None:
+            if response.status_code == 200 and response.mimetype == "application/json":
+                key, version = found
+                entry = CACHE.put(key, RenderedPage.from_body(version, response.get_data()))
+                response = _respond(response, entry, "miss")
+            return response
+
+        # JSON shell: revalidated on every reload, 304 when unchanged
+        if (request.method in ("GET", "HEAD") and request.path.endswith(SHELL_ROUTES)
+                and response.status_code == 200 and not response.direct_passthrough):
+            response.add_etag(weak=True)
+            response.headers["Cache-Control"] = "no-cache"
+            response.make_conditional(request)
+        return response
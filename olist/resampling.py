@@ -0,0 +1,88 @@
+# olist/resampling.py
+"""
+Seller bootstrap for the portfolio scenario (remove the N worst sellers).
+
+Each replicate resamples sellers with replacement, expressed as a row of
+per-seller counts (np.bincount of the drawn indices). For a
+(replicates × sellers) weight block, every replicate's full net-profit
+curve over N is three cumulative sums along the seller axis, so the
+optimum of all replicates comes out of a handful of array operations.
+Blocks of replicates are processed in chunks (bounded memory) on a
+thread pool; numpy releases the GIL inside the cumsums.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+N_REPLICATES = 2000
+# Bytes of float64 work arrays per chunk (a few arrays of chunk × sellers)
+CHUNK_BYTES = 64 * 2**20
+MAX_JOBS = 4
+
+
+def bootstrap_weights(n_replicates: int, n_sellers: int, seed=None) -> np.ndarray:
+    """(replicates × sellers) matrix of how often each seller is drawn; rows sum to n_sellers."""
+    draws = np.random.default_rng(seed).integers(0, n_sellers, size=(n_replicates, n_sellers))
+    draws += (np.arange(n_replicates) * n_sellers)[:, None]
+    counts = np.bincount(draws.ravel(), minlength=n_replicates * n_sellers)
+    return counts.reshape(n_replicates, n_sellers).astype(float)
+
+
+def profit_curves(weights: np.ndarray, gross_profit, quantity, it_cost) -> np.ndarray:
+    """
+    Net profit of every replicate after removing the first n sellers, n = 0..sellers-1.
+    Sellers are in removal order; `it_cost(n_sellers, n_items)` is vectorized.
+    """
+    # suffix sums: what remains after removing the first n sellers
+    kept = weights[:, ::-1]
+    n_sellers = np.cumsum(kept, axis=1)[:, ::-1]
+    n_items = np.cumsum(kept * np.asarray(quantity, float)[::-1], axis=1)[:, ::-1]
+    gross = np.cumsum(kept * np.asarray(gross_profit, float)[::-1], axis=1)[:, ::-1]
+    return gross - it_cost(n_sellers, n_items)
+
+
+def _optimum_chunk(seed, n_replicates, gross_profit, quantity, it_cost):
+    weights = bootstrap_weights(n_replicates, len(gross_profit), seed)
+    curves = profit_curves(weights, gross_profit, quantity, it_cost)
+    best = np.argmax(curves, axis=1)
+    return best, curves[np.arange(len(best)), best]
+
+
+def bootstrap_optimum(gross_profit, quantity, it_cost, n_replicates: int = N_REPLICATES,
+                      seed: int = 0, n_jobs: int | None = None) -> pd.DataFrame:
+    """
+    Optimal removal count and net profit per replicate: [remove_n, net_profit].
+    Results depend only on `seed`, not on chunking or n_jobs (one seed per chunk
+    of a fixed size).
+    """
+    gross_profit = np.asarray(gross_profit, float)
+    quantity = np.asarray(quantity, float)
+    if not len(gross_profit):
+        return pd.DataFrame({"remove_n": np.zeros(0, np.int64), "net_profit": np.zeros(0)})
+
+    chunk = max(1, min(n_replicates, CHUNK_BYTES // (8 * 4 * len(gross_profit))))
+    sizes = [min(chunk, n_replicates - i) for i in range(0, n_replicates, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    n_jobs = min(n_jobs or os.cpu_count() or 1, MAX_JOBS, len(sizes))
+
+    args = [(s, n, gross_profit, quantity, it_cost) for s, n in zip(seeds, sizes)]
+    if n_jobs > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(lambda a: _optimum_chunk(*a), args))
+    else:
+        results = [_optimum_chunk(*a) for a in args]
+
+    return pd.DataFrame({
+        "remove_n": np.concatenate([r[0] for r in results]),
+        "net_profit": np.concatenate([r[1] for r in results]),
+    })
+
+
+def confidence_band(replicates: pd.DataFrame, level: float = 0.9) -> dict:
+    """Percentile interval of each column: {column: (low, median, high)}."""
+    qs = [(1 - level) / 2, 0.5, (1 + level) / 2]
+    return {col: tuple(float(v) for v in replicates[col].quantile(qs)) for col in replicates.columns}
@@ -1,31 +1,239 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-import math
-from olist.data import Olist
 from olist.order import Order
+from olist.perf import instrument
+
+# Complaint topics as normalized (lower-case, accent-free) prefixes; a
+# two-word entry matches a token followed by a token with that prefix.
+COMPLAINT_TOPICS = {
+    "delivery": ("atras", "demor", "aguardand", "nao receb", "nao cheg", "nao entreg", "ainda nao"),
+    "defect": ("defeit", "quebr", "danific", "avari", "nao funcion"),
+    "wrong_item": ("errad", "diferent", "trocad", "outro produt"),
+    "missing_item": ("falt", "incomplet"),
+    "refund": ("devol", "reembols", "estorn", "cancel", "dinheir"),
+    "service": ("atendiment", "respost", "contat", "descas", "nao respond"),
+}
+TOPICS = tuple(COMPLAINT_TOPICS)
+
+# Left out of the keyword counts (the topics above still see them)
+STOPWORDS = frozenset("""
+a o as os e de da do das dos em no na nos nas um uma uns umas que se por para pra com sem ao aos
+mas mais muito muita ja foi ser era sao esta estou este essa esse isso eu me meu minha ele ela
+nao sim so como bem tambem ate ou pois quando sua seu la aqui entao the
+""".split())
+MIN_KEYWORD_LENGTH = 3
+
+CHUNKSIZE = 50_000
+MAX_JOBS = 4
+
+
+def normalize_text(messages: pd.Series) -> pd.Series:
+    """Lower-case, accent-free, letters-only text (vectorized str ops)."""
+    text = messages.fillna("").astype(str).str.lower()
+    text = text.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    return text.str.replace(r"[^a-z]+", " ", regex=True).str.strip()
+
+
+def _hash(values) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _topic_tables():
+    """[(prefix length, is_bigram, sorted prefix hashes, topic bits)] for the lexicon."""
+    entries = {}
+    for bit, (topic, prefixes) in enumerate(COMPLAINT_TOPICS.items()):
+        for prefix in prefixes:
+            entries.setdefault((len(prefix), " " in prefix), {}).setdefault(prefix, 0)
+            entries[(len(prefix), " " in prefix)][prefix] |= 1 << bit
+    tables = []
+    for (length, bigram), prefixes in entries.items():
+        hashes = _hash(list(prefixes))
+        order = np.argsort(hashes)
+        tables.append((length, bigram, hashes[order], np.fromiter(prefixes.values(), np.int64)[order]))
+    return tables
+
+
+_TOPIC_TABLES = _topic_tables()
+
+
+def _extract_chunk(messages: np.ndarray, scores: np.ndarray):
+    """
+    Text signals of one chunk: per-row (n_words, topic bitmask) and keyword
+    counts per score, keyed by the 64-bit token hash (no vocabulary needed).
+    """
+    n = len(messages)
+    tokens = normalize_text(pd.Series(messages, dtype=object)).str.split().explode().dropna()
+    rows = tokens.index.to_numpy(dtype=np.int64)
+    tokens = tokens.to_numpy(dtype=object)
+    tok = pd.Series(tokens, dtype=object)
+
+    # following token of the same row, for two-word prefixes
+    same_row = np.append(rows[1:] == rows[:-1], False)
+    nxt = pd.Series(np.where(same_row, np.roll(tokens, -1), ""), dtype=object)
+    pairs = tok + " " + nxt
+
+    bits = np.zeros(len(tokens), np.int64)
+    for length, bigram, hashes, topic_bits in _TOPIC_TABLES:
+        source = pairs if bigram else tok
+        candidates = source[source.str.len() >= length]
+        h = _hash(candidates.str.slice(0, length))
+        pos = np.searchsorted(hashes, h).clip(max=len(hashes) - 1)
+        hit = hashes[pos] == h
+        bits[candidates.index.to_numpy()[hit]] |= topic_bits[pos[hit]]
+    topic_bits = np.zeros(n, np.int64)
+    np.bitwise_or.at(topic_bits, rows, bits)
+
+    keep = (tok.str.len().to_numpy() >= MIN_KEYWORD_LENGTH) & ~tok.isin(STOPWORDS).to_numpy()
+    keywords = pd.DataFrame({
+        "hash": _hash(tokens[keep]),
+        "keyword": tokens[keep],
+        "score": scores[rows[keep]],
+    })
+    counts = keywords.groupby(["hash", "score"]).size().unstack("score", fill_value=0)
+    counts["keyword"] = keywords.groupby("hash")["keyword"].first()
+
+    return np.bincount(rows, minlength=n), topic_bits, counts
+
+
+def _merge_keywords(parts) -> pd.DataFrame:
+    counts = pd.concat(parts)
+    if len(parts) > 1:
+        keyword = counts.groupby(level=0)["keyword"].first()
+        counts = counts.drop(columns="keyword").fillna(0).groupby(level=0).sum()
+        counts["keyword"] = keyword
+    scores = sorted(c for c in counts.columns if c != "keyword")
+    out = counts[scores].fillna(0).astype(np.int64)
+    out.columns = [f"score_{int(s)}" for s in scores]
+    out.insert(0, "count", out.sum(axis=1))
+    out.insert(0, "keyword", counts["keyword"])
+    return out.sort_values("count", ascending=False).reset_index(drop=True)
 
 
+def extract_text_signals(messages: pd.Series, scores, chunksize: int = CHUNKSIZE, n_jobs: int | None = None):
+    """
+    Streams `messages` in chunks (in parallel processes when n_jobs > 1) and returns
+    - per-message signals: [has_comment, n_words, topic_<name>..., complaint]
+    - keyword table: [keyword, count, score_1..score_5], most frequent first
+    """
+    messages = messages.to_numpy(dtype=object)
+    scores = np.asarray(scores, dtype=np.int64)
+    bounds = range(0, len(messages), chunksize)
+    chunks = [(messages[i:i + chunksize], scores[i:i + chunksize]) for i in bounds]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, MAX_JOBS, len(chunks))
+
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_extract_chunk, *zip(*chunks)))
+    else:
+        results = [_extract_chunk(m, s) for m, s in chunks]
+
+    n_words = np.concatenate([r[0] for r in results]) if results else np.zeros(0, np.int64)
+    topic_bits = np.concatenate([r[1] for r in results]) if results else np.zeros(0, np.int64)
+    signals = pd.DataFrame({"has_comment": n_words > 0, "n_words": n_words})
+    for bit, topic in enumerate(TOPICS):
+        signals[f"topic_{topic}"] = (topic_bits >> bit) & 1 == 1
+    signals["complaint"] = topic_bits > 0
+    keywords = _merge_keywords([r[2] for r in results]) if results else pd.DataFrame(columns=["keyword", "count"])
+    return signals, keywords
+
+
+@instrument
 class Review:
+    """
+    DataFrames with one row per review (in order_reviews order): length,
+    main product category and complaint-topic signals of the comment.
+    """
 
-    def __init__(self):
-        # Import data only once
-        olist = Olist()
-        self.data = olist.get_data()
-        self.order = Order()
+    def __init__(self, order: Order | None = None):
+        # Import data only once (shared with Order)
+        self.order = order or Order()
+        self.data = self.order.data
+        self._text = None
 
     def get_review_length(self):
         """
         Returns a DataFrame with:
        'review_id', 'length_review', 'review_score'
         """
-        pass  # YOUR CODE HERE
+        reviews = self.data['order_reviews']
+        return pd.DataFrame({
+            'review_id': reviews['review_id'].to_numpy(),
+            'length_review': reviews['review_comment_message'].fillna("").astype(str).str.len().to_numpy(),
+            'review_score': reviews['review_score'].to_numpy(),
+        })
 
     def get_main_product_category(self):
         """
         Returns a DataFrame with:
        'review_id', 'order_id','product_category_name'
+        The main category of an order is the category of its highest-price item.
+        """
+        items = self.data['order_items']
+        main_item = items.loc[items.groupby('order_id')['price'].idxmax(), ['order_id', 'product_id']]
+        category = self.data['products'].set_index('product_id')['product_category_name']
+        order_category = pd.Series(main_item['product_id'].map(category).to_numpy(),
+                                   index=main_item['order_id'].to_numpy())
+
+        reviews = self.data['order_reviews']
+        return pd.DataFrame({
+            'review_id': reviews['review_id'].to_numpy(),
+            'order_id': reviews['order_id'].to_numpy(),
+            'product_category_name': order_category.reindex(reviews['order_id']).to_numpy(),
+        })
+
+    def _text_signals(self):
+        if self._text is None:
+            reviews = self.data['order_reviews']
+            self._text = extract_text_signals(reviews['review_comment_message'], reviews['review_score'])
+        return self._text
+
+    def get_text_signals(self):
+        """
+        Returns a DataFrame with:
+        'review_id', 'has_comment', 'n_words', 'topic_<name>' (see COMPLAINT_TOPICS), 'complaint'
         """
-        pass  # YOUR CODE HERE
+        signals = self._text_signals()[0].copy()
+        signals.insert(0, 'review_id', self.data['order_reviews']['review_id'].to_numpy())
+        return signals
+
+    def get_keywords(self):
+        """
+        Returns a DataFrame with:
+        'keyword', 'count', 'score_1' ... 'score_5' (most frequent first)
+        """
+        return self._text_signals()[1]
 
     def get_training_data(self):
-        pass  # YOUR CODE HERE
+        """
+        Returns a DataFrame with:
+        'review_id', 'order_id', 'review_score', 'dim_is_one_star', 'dim_is_five_star',
+        'length_review', 'product_category_name', 'has_comment', 'n_words',
+        'topic_<name>'..., 'complaint'
+        """
+        category = self.get_main_product_category()
+        score = self.data['order_reviews']['review_score'].to_numpy()
+        training = pd.DataFrame({
+            'review_id': category['review_id'],
+            'order_id': category['order_id'],
+            'review_score': score,
+            'dim_is_one_star': (score == 1).astype(int),
+            'dim_is_five_star': (score == 5).astype(int),
+            'length_review': self.get_review_length()['length_review'],
+            'product_category_name': category['product_category_name'],
+        })
+        signals = self.get_text_signals().drop(columns='review_id')
+        return pd.concat([training, signals], axis=1)
+
+
+def topic_summary(training: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per review_score: number of reviews, of reviews with a comment and of
+    reviews mentioning each complaint topic (small table for the dashboard).
+    """
+    flags = ['has_comment'] + [f'topic_{t}' for t in TOPICS] + ['complaint']
+    summary = training.groupby('review_score')[flags].sum().astype(np.int64)
+    summary.insert(0, 'reviews', training.groupby('review_score').size())
+    return summary.rename(columns={'has_comment': 'comments'}).reset_index()
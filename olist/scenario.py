@@ -0,0 +1,162 @@
+# olist/scenario.py
+"""
+Seller removal scenarios: IT cost model, single-scenario totals and a
+batch evaluator for notebooks and other services.
+
+A batch of scenarios is a (scenarios × sellers) keep-mask; all P&L
+totals come out of one matrix product with the per-seller aggregates
+[1, quantity, revenues, cost_of_reviews]. `install` serves the evaluator
+as a JSON endpoint on the Flask server.
+"""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+# IT cost model: ALPHA * sqrt(n_sellers) + BETA * sqrt(n_items)
+ALPHA, BETA = 3157.27, 978.23
+
+RESULT_COLUMNS = ["n_sellers", "n_items", "revenue", "review_cost", "gross_profit", "it_cost", "net_profit"]
+# Scenarios per request on the JSON endpoint
+MAX_SCENARIOS = 1000
+
+
+def compute_it_cost(n_sellers, n_items):
+    """Vectorized over arrays of seller / item counts."""
+    return ALPHA * np.sqrt(n_sellers) + BETA * np.sqrt(n_items)
+
+
+def scenario_totals(df: pd.DataFrame) -> dict:
+    """P&L of one seller slice (needs seller_id, quantity, revenues, cost_of_reviews, gross_profit)."""
+    n_sellers = int(df["seller_id"].nunique())
+    n_items = int(df["quantity"].sum())
+    revenue = float(df["revenues"].sum())
+    review_cost = float(df["cost_of_reviews"].sum())
+    gross_profit = float(df["gross_profit"].sum())
+    it_cost = float(compute_it_cost(n_sellers, n_items))
+    net_profit = gross_profit - it_cost
+    return {
+        "n_sellers": n_sellers, "n_items": n_items, "revenue": revenue,
+        "review_cost": review_cost, "gross_profit": gross_profit,
+        "it_cost": it_cost, "net_profit": net_profit,
+    }
+
+
+class ScenarioEvaluator:
+    """Batch P&L of seller keep-masks over the seller training data (one row per seller)."""
+
+    def __init__(self, sellers: pd.DataFrame):
+        self.seller_ids = pd.Index(sellers["seller_id"])
+        if not self.seller_ids.is_unique:
+            raise ValueError("ScenarioEvaluator needs one row per seller_id")
+        self.aggregates = np.column_stack([
+            np.ones(len(sellers)),
+            sellers["quantity"].to_numpy(float),
+            sellers["revenues"].to_numpy(float),
+            sellers["cost_of_reviews"].to_numpy(float),
+        ])
+
+    def evaluate(self, keep) -> pd.DataFrame:
+        """One result row per keep-mask row (a 1-d mask is one scenario)."""
+        keep = np.atleast_2d(np.asarray(keep, dtype=float))
+        if keep.shape[1] != len(self.seller_ids):
+            raise ValueError(f"keep-mask has {keep.shape[1]} columns, expected {len(self.seller_ids)} sellers")
+        n_sellers, n_items, revenue, review_cost = (keep @ self.aggregates).T
+        gross_profit = revenue - review_cost
+        it_cost = compute_it_cost(n_sellers, n_items)
+        return pd.DataFrame({
+            "n_sellers": n_sellers.round().astype(np.int64),
+            "n_items": n_items.round().astype(np.int64),
+            "revenue": revenue,
+            "review_cost": review_cost,
+            "gross_profit": gross_profit,
+            "it_cost": it_cost,
+            "net_profit": gross_profit - it_cost,
+        }, columns=RESULT_COLUMNS)
+
+    def keep_mask(self, removed) -> np.ndarray:
+        """Keep-mask matrix from a list of removed seller_id collections; unknown ids raise KeyError."""
+        removed = [list(ids) for ids in removed]
+        keep = np.ones((len(removed), len(self.seller_ids)), dtype=bool)
+        for row, ids in enumerate(removed):
+            codes = self.seller_ids.get_indexer(ids)
+            if (codes < 0).any():
+                unknown = [i for i, c in zip(ids, codes) if c < 0]
+                raise KeyError(f"unknown seller_id(s): {unknown[:5]}")
+            keep[row, codes] = False
+        return keep
+
+    def evaluate_removed(self, removed) -> pd.DataFrame:
+        return self.evaluate(self.keep_mask(removed))
+
+
+# -----------------------------
+# JSON
+# -----------------------------
+def encode_results(results: pd.DataFrame, decimals: int = 2) -> str:
+    """Compact columnar JSON: {"n": rows, "columns": {name: [values...]}}, money rounded to cents."""
+    columns = {}
+    for col in results.columns:
+        values = results[col].to_numpy()
+        if np.issubdtype(values.dtype, np.integer):
+            columns[col] = values.tolist()
+        else:
+            columns[col] = np.round(values.astype(float), decimals).tolist()
+    return json.dumps({"n": len(results), "columns": columns}, separators=(",", ":"), allow_nan=False)
+
+
+_evaluator: tuple[str, ScenarioEvaluator] | None = None
+
+
+def default_evaluator() -> ScenarioEvaluator:
+    """Evaluator over the seller_training artifact, rebuilt when its fingerprint changes."""
+    global _evaluator
+    from olist import artifacts
+
+    key = artifacts.fingerprint("seller_training")
+    if _evaluator is None or _evaluator[0] != key:
+        _evaluator = (key, ScenarioEvaluator(artifacts.load("seller_training")))
+    return _evaluator[1]
+
+
+def install(server, endpoint: str = "/api/scenarios"):
+    """
+    GET: seller_id order of keep-mask columns and the baseline P&L.
+    POST {"removed": [[seller_id, ...], ...]} or {"keep": [[0/1, ...], ...]}:
+    P&L of every scenario, in request order, as compact columnar JSON.
+    """
+    from flask import Response, request
+
+    def _json(body: str, status: int = 200):
+        return Response(body, status=status, mimetype="application/json")
+
+    def _error(message: str, status: int = 400):
+        return _json(json.dumps({"error": message}, separators=(",", ":")), status)
+
+    @server.route(endpoint, methods=["GET", "POST"])
+    def scenario_endpoint():
+        evaluator = default_evaluator()
+        if request.method == "GET":
+            base = json.loads(encode_results(evaluator.evaluate(np.ones(len(evaluator.seller_ids)))))
+            body = {"seller_ids": evaluator.seller_ids.tolist(), "base": base}
+            return _json(json.dumps(body, separators=(",", ":")))
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or not ({"removed", "keep"} & payload.keys()):
+            return _error('expected a JSON object with "removed" or "keep"')
+        scenarios = payload.get("removed", payload.get("keep"))
+        if not isinstance(scenarios, list) or len(scenarios) > MAX_SCENARIOS:
+            return _error(f"expected a list of at most {MAX_SCENARIOS} scenarios")
+        try:
+            if "removed" in payload:
+                results = evaluator.evaluate_removed(scenarios)
+            else:
+                # an empty batch is zero scenarios over all sellers, as with "removed"
+                width = -1 if scenarios else len(evaluator.seller_ids)
+                keep = np.asarray(scenarios, dtype=bool).reshape(len(scenarios), width)
+                results = evaluator.evaluate(keep)
+        except (KeyError, ValueError, TypeError) as exc:
+            return _error(str(exc.args[0]) if exc.args else str(exc))
+        return _json(encode_results(results))
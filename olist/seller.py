@@ -2,8 +2,10 @@ import pandas as pd
 import numpy as np
 from olist.data import Olist
 from olist.order import Order
+from olist.perf import instrument
 
 
+@instrument
 class Seller:
     def __init__(self):
         # Import data only once
@@ -0,0 +1,128 @@
+# olist/seller_index.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class CSRIndex:
+    """
+    Rows of `table` grouped by an integer key in [0, n_keys):
+    the table is sorted by key once and `offsets[k]:offsets[k + 1]`
+    is the contiguous slice for key k (compressed sparse row layout).
+    """
+
+    def __init__(self, table: pd.DataFrame, codes: np.ndarray, n_keys: int):
+        valid = codes >= 0
+        codes = codes[valid]
+        order = np.argsort(codes, kind="stable")
+
+        self.table = table.loc[valid].iloc[order].reset_index(drop=True)
+        self.codes = codes[order]
+        self.offsets = np.zeros(n_keys + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=n_keys), out=self.offsets[1:])
+
+    def rows(self, code: int) -> pd.DataFrame:
+        return self.table.iloc[self.offsets[code]: self.offsets[code + 1]]
+
+    def positions(self, codes: np.ndarray) -> np.ndarray:
+        """Row positions of all slices for `codes`, concatenated in order (O(result size))."""
+        starts, ends = self.offsets[codes], self.offsets[codes + 1]
+        lengths = ends - starts
+        return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+class SellerIndex:
+    """
+    Precomputed row-offset index over the Seller fact tables for O(1)
+    per-seller drill-down: seller → items, order → items, order → reviews.
+    Dates are parsed once at build time, so lookups only slice.
+    """
+
+    def __init__(self, data: dict[str, pd.DataFrame]):
+        sellers = data["sellers"]
+        orders = data["orders"].drop_duplicates("order_id").reset_index(drop=True)
+        order_items = data["order_items"]
+        order_reviews = data["order_reviews"]
+
+        self.seller_ids = pd.Index(sellers["seller_id"].drop_duplicates())
+        self.order_ids = pd.Index(orders["order_id"])
+
+        # Orders: one row per order code, delivery metrics precomputed
+        orders = orders[["order_id", "order_status", "order_purchase_timestamp",
+                         "order_delivered_carrier_date", "order_delivered_customer_date",
+                         "order_estimated_delivery_date"]].copy()
+        for col in ["order_purchase_timestamp", "order_delivered_carrier_date",
+                    "order_delivered_customer_date", "order_estimated_delivery_date"]:
+            orders[col] = pd.to_datetime(orders[col], errors="coerce")
+        orders["wait_time"] = (
+            (orders["order_delivered_customer_date"] - orders["order_purchase_timestamp"]) / np.timedelta64(1, "D")
+        )
+        orders["delay_vs_expected"] = (
+            (orders["order_delivered_customer_date"] - orders["order_estimated_delivery_date"]) / np.timedelta64(1, "D")
+        ).clip(lower=0)
+        self.orders = orders
+
+        # Items: delay to carrier per item, then sorted by seller and by order
+        items = order_items[["order_id", "order_item_id", "seller_id", "product_id",
+                             "shipping_limit_date", "price", "freight_value"]].copy()
+        items["shipping_limit_date"] = pd.to_datetime(items["shipping_limit_date"], errors="coerce")
+        items["order_code"] = self.order_ids.get_indexer(items["order_id"])
+        carrier = orders["order_delivered_carrier_date"].to_numpy()[items["order_code"].clip(lower=0)]
+        items["delay_to_carrier"] = (
+            (pd.Series(carrier, index=items.index) - items["shipping_limit_date"]) / np.timedelta64(1, "D")
+        ).clip(lower=0)
+        items.loc[items["order_code"] < 0, "delay_to_carrier"] = np.nan
+
+        self.items_by_seller = CSRIndex(items, self.seller_ids.get_indexer(items["seller_id"]), len(self.seller_ids))
+        self.items_by_order = CSRIndex(items, items["order_code"].to_numpy(), len(self.order_ids))
+
+        reviews = order_reviews[["review_id", "order_id", "review_score", "review_creation_date"]].copy()
+        reviews["review_creation_date"] = pd.to_datetime(reviews["review_creation_date"], errors="coerce")
+        self.reviews_by_order = CSRIndex(reviews, self.order_ids.get_indexer(reviews["order_id"]), len(self.order_ids))
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def seller_code(self, seller_id: str) -> int:
+        """Hash lookup of the seller's code, -1 if unknown."""
+        try:
+            return int(self.seller_ids.get_loc(seller_id))
+        except KeyError:
+            return -1
+
+    def get_items(self, seller_id: str) -> pd.DataFrame:
+        code = self.seller_code(seller_id)
+        return self.items_by_seller.rows(code) if code >= 0 else self.items_by_seller.table.iloc[:0]
+
+    def get_order_items(self, order_id: str) -> pd.DataFrame:
+        """All items of an order, including the ones of other sellers."""
+        try:
+            code = int(self.order_ids.get_loc(order_id))
+        except KeyError:
+            return self.items_by_order.table.iloc[:0]
+        return self.items_by_order.rows(code)
+
+    def get_orders(self, seller_id: str) -> pd.DataFrame:
+        """Orders of a seller with wait_time / delay_vs_expected, one row per order."""
+        codes = self.get_items(seller_id)["order_code"].to_numpy()
+        codes = np.unique(codes[codes >= 0])
+        return self.orders.iloc[codes]
+
+    def get_reviews(self, seller_id: str) -> pd.DataFrame:
+        codes = self.get_orders(seller_id).index.to_numpy()
+        return self.reviews_by_order.table.iloc[self.reviews_by_order.positions(codes)]
+
+    def get_seller_detail(self, seller_id: str) -> dict[str, pd.DataFrame]:
+        """
+        Returns {"items", "orders", "reviews"} for one seller, read from
+        contiguous slices of the pre-sorted tables.
+        """
+        items = self.get_items(seller_id)
+        codes = items["order_code"].to_numpy()
+        codes = np.unique(codes[codes >= 0])
+        return {
+            "items": items,
+            "orders": self.orders.iloc[codes],
+            "reviews": self.reviews_by_order.table.iloc[self.reviews_by_order.positions(codes)],
+        }
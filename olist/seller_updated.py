@@ -1,30 +1,45 @@
 # olist/seller_updated.py
 from __future__ import annotations
 
+import os
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from olist.datasets import active_data_dir
+from olist.perf import instrument
 
+# Review cost per score; every per-order / per-state index attributes reviews with this map
+COST_MAP = {1: 100, 2: 50, 3: 40, 4: 0, 5: 0}
 
+
+@instrument
 class Seller:
     """
     CEO_request projesi için seller bazlı eğitim datası üretir.
-    CSV'leri repo kökündeki `data/` klasöründen Path ile okur.
+    CSV'leri repo kökündeki `data/` klasöründen Path ile okur
+    (OLIST_DATA_DIR ortam değişkeni varsayılan klasörü değiştirir;
+    `olist.datasets.use` ile seçilen veri seti ikisinden de önce gelir).
     """
 
+    FILES = {
+        "sellers": "olist_sellers_dataset.csv",
+        "orders": "olist_orders_dataset.csv",
+        "order_items": "olist_order_items_dataset.csv",
+        "order_reviews": "olist_order_reviews_dataset.csv",
+    }
+
     def __init__(self, data_dir: str | Path | None = None):
+        self.data_dir = Path(data_dir) if data_dir else self.default_data_dir()
+        self.data = self._load_data()
+
+    @staticmethod
+    def default_data_dir() -> Path:
         base_dir = Path(__file__).resolve().parent          # .../olist
         project_root = base_dir.parent                      # .../CEO_talebi_takim1
-        self.data_dir = Path(data_dir) if data_dir else (project_root / "data")
-        self.data = self._load_data()
+        return active_data_dir() or Path(os.environ.get("OLIST_DATA_DIR") or (project_root / "data"))
 
     def _load_data(self) -> dict[str, pd.DataFrame]:
-        required = {
-            "sellers": "olist_sellers_dataset.csv",
-            "orders": "olist_orders_dataset.csv",
-            "order_items": "olist_order_items_dataset.csv",
-            "order_reviews": "olist_order_reviews_dataset.csv",
-        }
+        required = self.FILES
 
         missing = [f for f in required.values() if not (self.data_dir / f).exists()]
         if missing:
@@ -86,6 +101,58 @@ class Seller:
         )
         return out
 
+    # -----------------------------
+    # Tail latency + approximate distinct counts (streaming sketches)
+    # -----------------------------
+    def get_seller_sketches(self, chunksize: int = 500_000, sketches: dict | None = None) -> dict:
+        """
+        Bellekteki order_items'ı chunksize satırlık parçalarla işler ve satıcı bazlı sketch'leri günceller:
+        - "wait_time", "delay_to_carrier": QuantileSketch (teslim edilmiş siparişler, gün)
+        - "orders", "customers": DistinctSketch (tüm siparişler)
+        Mevcut `sketches` verilirse onlara eklenir; farklı parçalar/süreçler `merge` ile birleşir.
+        Ham tablolar belleğe sığmıyorsa `stream_sketches` CSV'leri diskten parça parça okur.
+        """
+        items = self.data["order_items"]
+        chunks = (items.iloc[start:start + chunksize] for start in range(0, len(items), chunksize))
+        return _update_sketches(_order_lookup(self.data["orders"]), chunks, sketches)
+
+    @classmethod
+    def stream_sketches(cls, data_dir: str | Path | None = None, chunksize: int = 500_000,
+                        sketches: dict | None = None) -> dict:
+        """
+        get_seller_sketches, CSV'leri pd.read_csv(chunksize=...) ile okuyarak (yalnızca gereken sütunlar).
+        order_items hiçbir zaman tamamen belleğe alınmaz; orders'tan sipariş başına yalnızca
+        teslim durumu, tarihler ve customer_id tutulur.
+        """
+        data_dir = Path(data_dir) if data_dir else cls.default_data_dir()
+
+        def chunks(key, usecols):
+            return pd.read_csv(data_dir / cls.FILES[key], usecols=usecols, chunksize=chunksize)
+
+        orders = pd.concat(chunks("orders", ORDER_COLUMNS), ignore_index=True)
+        items = chunks("order_items", ["order_id", "seller_id", "shipping_limit_date"])
+        return _update_sketches(_order_lookup(orders), items, sketches)
+
+    def get_tail_metrics(self, quantiles=(0.5, 0.9, 0.99), sketches: dict | None = None) -> pd.DataFrame:
+        """
+        Returns a DataFrame with:
+        [seller_id, wait_time_p50, wait_time_p90, wait_time_p99,
+        delay_to_carrier_p50, delay_to_carrier_p90, delay_to_carrier_p99,
+        n_orders_approx, n_customers_approx]
+        """
+        sketches = sketches or self.get_seller_sketches()
+        parts = []
+        for metric in ["wait_time", "delay_to_carrier"]:
+            q = sketches[metric].quantiles(quantiles)
+            q.columns = [f"{metric}_p{round(x * 100):d}" for x in quantiles]
+            parts.append(q)
+        parts.append(sketches["orders"].estimate().rename("n_orders_approx"))
+        parts.append(sketches["customers"].estimate().rename("n_customers_approx"))
+
+        out = pd.concat(parts, axis=1)
+        out.index.name = "seller_id"
+        return out.reset_index()
+
     # -----------------------------
     # Active dates
     # -----------------------------
@@ -144,8 +211,7 @@ class Seller:
         merged["dim_is_one_star"] = (merged["review_score"] == 1).astype(int)
         merged["dim_is_five_star"] = (merged["review_score"] == 5).astype(int)
 
-        cost_map = {1: 100, 2: 50, 3: 40, 4: 0, 5: 0}
-        merged["review_cost"] = merged["review_score"].map(cost_map).fillna(0)
+        merged["review_cost"] = merged["review_score"].map(COST_MAP).fillna(0)
 
         out = merged.groupby("seller_id", as_index=False).agg(
             share_of_one_stars=("dim_is_one_star", "mean"),
@@ -181,3 +247,51 @@ class Seller:
             "cost_of_reviews", "revenues", "profits",
         ]
         return df[keep_cols]
+
+
+# -----------------------------
+# Sketch helpers (bellekteki tablolar ve CSV akışı için ortak)
+# -----------------------------
+ORDER_COLUMNS = ["order_id", "customer_id", "order_status", "order_purchase_timestamp",
+                 "order_delivered_carrier_date", "order_delivered_customer_date"]
+
+
+def _order_lookup(orders: pd.DataFrame) -> dict:
+    """Sipariş başına sketch'lerin ihtiyaç duyduğu alanlar (numpy dizileri, order_id index'iyle)."""
+    return {
+        "index": pd.Index(orders["order_id"]),
+        "delivered": (orders["order_status"] == "delivered").to_numpy(),
+        "customer_id": orders["customer_id"].to_numpy(dtype=object),
+        **{col: pd.to_datetime(orders[col], errors="coerce").to_numpy()
+           for col in ["order_purchase_timestamp", "order_delivered_carrier_date", "order_delivered_customer_date"]},
+    }
+
+
+def _update_sketches(orders: dict, item_chunks, sketches: dict | None = None) -> dict:
+    from olist.sketches import DistinctSketch, QuantileSketch
+
+    sketches = sketches or {
+        "wait_time": QuantileSketch(),
+        "delay_to_carrier": QuantileSketch(),
+        "orders": DistinctSketch(),
+        "customers": DistinctSketch(),
+    }
+    purchase = orders["order_purchase_timestamp"]
+    carrier = orders["order_delivered_carrier_date"]
+    customer_date = orders["order_delivered_customer_date"]
+    day = np.timedelta64(1, "D")
+    for chunk in item_chunks:
+        sellers = chunk["seller_id"].to_numpy(dtype=object)
+        pos = orders["index"].get_indexer(chunk["order_id"])
+        known = pos >= 0
+
+        sketches["orders"].update(sellers, chunk["order_id"].to_numpy(dtype=object))
+        sketches["customers"].update(sellers[known], orders["customer_id"][pos[known]])
+
+        ship = known.copy()
+        ship[known] = orders["delivered"][pos[known]]
+        p = pos[ship]
+        limit = pd.to_datetime(chunk["shipping_limit_date"], errors="coerce").to_numpy()[ship]
+        sketches["wait_time"].update(sellers[ship], (customer_date[p] - purchase[p]) / day)
+        sketches["delay_to_carrier"].update(sellers[ship], np.clip((carrier[p] - limit) / day, 0, None))
+    return sketches
@@ -0,0 +1,202 @@
+# olist/sketches.py
+"""
+Mergeable per-group sketches for streaming aggregation at bounded memory:
+
+- QuantileSketch: DDSketch-style log-bucketed histograms, one per group.
+  Any quantile is within `relative_accuracy` of the exact value.
+- DistinctSketch: HyperLogLog registers, one set per group
+  (relative standard error ≈ 1.04 / sqrt(2 ** precision): ~3.25% at the
+  default precision 10).
+
+Both are updated with whole arrays (`update(groups, values)`) and stored
+sparsely as sorted (group × slot) keys, so memory is bounded by
+min(observations, slots) per group no matter how long the history is.
+`merge` combines sketches built on other chunks or in other processes
+(they pickle as a few numpy arrays).
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+_U64_MAX = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+class _GroupSketch:
+    """Sparse (group code × slot) → value store; subclasses define how values combine."""
+
+    # number of slots per group
+    width: int = 1
+    _combine = np.add
+
+    def __init__(self):
+        self.labels = pd.Index([], dtype=object)
+        self._keys = np.empty(0, np.int64)
+        self._values = np.empty(0, self._dtype)
+
+    def _codes(self, groups) -> np.ndarray:
+        groups = pd.Index(groups, dtype=object)
+        new = groups.unique().difference(self.labels, sort=False)
+        if len(new):
+            self.labels = self.labels.append(new)
+        return self.labels.get_indexer(groups).astype(np.int64)
+
+    def _add(self, keys: np.ndarray, values: np.ndarray):
+        keys = np.concatenate([self._keys, keys])
+        values = np.concatenate([self._values, values.astype(self._dtype)])
+        self._keys, inverse = np.unique(keys, return_inverse=True)
+        out = np.zeros(len(self._keys), self._dtype)
+        self._combine.at(out, inverse, values)
+        self._values = out
+
+    def merge(self, other: "_GroupSketch") -> "_GroupSketch":
+        """Adds `other` (same type and parameters, any labels) into this sketch."""
+        if type(other) is not type(self) or other.params() != self.params():
+            raise ValueError(f"cannot merge {other!r} into {self!r}")
+        codes = self._codes(other.labels)
+        keys = codes[other._keys // self.width] * self.width + other._keys % self.width
+        self._add(keys, other._values)
+        return self
+
+    def params(self) -> tuple:
+        return ()
+
+    def _per_group(self):
+        """(group code, slot, value) of every stored slot, sorted by group then slot."""
+        return self._keys // self.width, self._keys % self.width, self._values
+
+    @property
+    def nbytes(self) -> int:
+        return self._keys.nbytes + self._values.nbytes
+
+    def __repr__(self):
+        return f"{type(self).__name__}(groups={len(self.labels)}, slots={len(self._keys)})"
+
+
+class QuantileSketch(_GroupSketch):
+    """
+    Per-group quantiles with relative error `relative_accuracy`
+    (values ≤ `min_value`, including negatives, count as 0).
+    """
+
+    _dtype = np.int64
+    _combine = np.add
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self._offset = math.ceil(math.log(min_value) / self._log_gamma)
+        # slot 0 holds values ≤ min_value; larger values are clipped to the last bucket
+        self.width = max_buckets
+        super().__init__()
+
+    def params(self) -> tuple:
+        return (self.relative_accuracy, self.min_value, self.width)
+
+    def update(self, groups, values):
+        values = np.asarray(values, dtype=float)
+        ok = ~np.isnan(values)
+        codes = self._codes(np.asarray(groups, dtype=object)[ok])
+        values = values[ok]
+        slots = np.zeros(len(values), np.int64)
+        positive = values > self.min_value
+        slots[positive] = np.clip(
+            np.ceil(np.log(values[positive]) / self._log_gamma).astype(np.int64) - self._offset + 1,
+            1, self.width - 1,
+        )
+        keys, counts = np.unique(codes * self.width + slots, return_counts=True)
+        self._add(keys, counts)
+        return self
+
+    def _value(self, slots: np.ndarray) -> np.ndarray:
+        exponent = slots + self._offset - 1
+        return np.where(slots == 0, 0.0, 2 * self.gamma ** exponent / (self.gamma + 1))
+
+    def count(self) -> pd.Series:
+        codes, _, counts = self._per_group()
+        return pd.Series(np.bincount(codes, weights=counts, minlength=len(self.labels)).astype(np.int64),
+                         index=self.labels)
+
+    def quantiles(self, qs=(0.5, 0.9, 0.99)) -> pd.DataFrame:
+        """One row per group, one column per quantile (NaN for empty groups)."""
+        codes, slots, counts = self._per_group()
+        n_groups = len(self.labels)
+        cum = np.cumsum(counts)
+        totals = np.bincount(codes, weights=counts, minlength=n_groups).astype(np.int64)
+        ends = np.cumsum(totals)
+        starts = ends - totals  # cumulative count before each group
+
+        out = {}
+        for q in qs:
+            # 0-based rank of the quantile inside each group, located in the global cumsum
+            rank = np.floor(q * np.maximum(totals - 1, 0)).astype(np.int64)
+            pos = np.searchsorted(cum, starts + rank, side="right").clip(max=max(len(cum) - 1, 0))
+            values = self._value(slots[pos]) if len(cum) else np.zeros(n_groups)
+            out[q] = np.where(totals > 0, values, np.nan)
+        return pd.DataFrame(out, index=self.labels)
+
+
+class DistinctSketch(_GroupSketch):
+    """
+    Per-group HyperLogLog distinct counts. Relative standard error is about
+    1.04 / sqrt(2 ** precision): ~3.25% at the default precision=10 (1024
+    registers per group), ~1.6% at 12. Groups below ~2.5 × 2 ** precision
+    distinct items fall back to linear counting and are much closer than that.
+    """
+
+    _dtype = np.uint8
+    _combine = np.maximum
+
+    def __init__(self, precision: int = 10):
+        self.precision = precision
+        self.width = 1 << precision
+        super().__init__()
+
+    def params(self) -> tuple:
+        return (self.precision,)
+
+    @staticmethod
+    def _leading_zeros(x: np.ndarray) -> np.ndarray:
+        x = x.copy()
+        n = np.zeros(len(x), np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            top_clear = x <= (_U64_MAX >> np.uint64(shift))
+            n[top_clear] += shift
+            x[top_clear] <<= np.uint64(shift)
+        n[x == 0] = 64
+        return n
+
+    def update(self, groups, items):
+        groups = np.asarray(groups, dtype=object)
+        items = np.asarray(items, dtype=object)
+        ok = ~pd.isna(items)
+        codes = self._codes(groups[ok])
+        h = pd.util.hash_array(items[ok])
+        registers = (h >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = h << np.uint64(self.precision)
+        rho = np.minimum(self._leading_zeros(rest) + 1, 64 - self.precision + 1)
+
+        # keep the max rho per (group, register) before merging into the store
+        frame = pd.DataFrame({"key": codes * self.width + registers, "rho": rho})
+        best = frame.groupby("key", sort=True)["rho"].max()
+        self._add(best.index.to_numpy(np.int64), best.to_numpy())
+        return self
+
+    def estimate(self) -> pd.Series:
+        """Estimated distinct items per group."""
+        codes, _, registers = self._per_group()
+        m = self.width
+        n_groups = len(self.labels)
+        present = np.bincount(codes, minlength=n_groups)
+        # registers never touched are 0 and contribute 2**0 each
+        z = np.bincount(codes, weights=np.exp2(-registers.astype(float)), minlength=n_groups) + (m - present)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / z
+        empty = m - present
+        small = (raw <= 2.5 * m) & (empty > 0)
+        estimate = np.where(small, m * np.log(m / np.maximum(empty, 1)), raw)
+        return pd.Series(estimate, index=self.labels)
@@ -0,0 +1,87 @@
+# olist/threshold_index.py
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Additive seller columns summed by every query (plus a seller count)
+ADDITIVE = ("quantity", "revenues", "cost_of_reviews")
+OPERATORS = ("<", "<=", ">", ">=")
+
+
+class ThresholdIndex:
+    """
+    Sorted per-metric indexes over the seller training data for rule
+    queries such as review_score < 3.2 and delay_to_carrier > 2.
+
+    For every metric the sellers are sorted once (NaN excluded) and the
+    additive columns are stored as prefix sums in that order, so a
+    single-metric threshold is a binary search plus two prefix-sum reads.
+    Compound rules intersect one boolean bitmap per condition.
+    """
+
+    def __init__(self, sellers: pd.DataFrame, metrics, additive=ADDITIVE):
+        self.seller_ids = pd.Index(sellers["seller_id"])
+        self.metrics = list(metrics)
+        # columns: n_sellers, *additive
+        self.values = np.column_stack([np.ones(len(sellers))] + [sellers[c].to_numpy(float) for c in additive])
+        self.columns = ["n_sellers", *additive]
+        self.totals = self.values.sum(axis=0)
+
+        self._sorted = {}
+        for metric in self.metrics:
+            x = sellers[metric].to_numpy(float)
+            order = np.argsort(x, kind="stable")[: int((~np.isnan(x)).sum())]  # NaN sort last
+            prefix = np.zeros((len(order) + 1, self.values.shape[1]))
+            np.cumsum(self.values[order], axis=0, out=prefix[1:])
+            self._sorted[metric] = (x[order], order, prefix)
+
+    def bounds(self, metric: str) -> tuple[float, float]:
+        x = self._sorted[metric][0]
+        return (float(x[0]), float(x[-1])) if len(x) else (0.0, 0.0)
+
+    def _range(self, metric: str, op: str, threshold: float) -> tuple[int, int]:
+        """[lo, hi) positions in the metric's sorted order matching `metric op threshold`."""
+        if op not in OPERATORS:
+            raise ValueError(f"unknown operator {op!r}, expected one of {OPERATORS}")
+        x = self._sorted[metric][0]
+        if op == "<":
+            return 0, int(np.searchsorted(x, threshold, side="left"))
+        if op == "<=":
+            return 0, int(np.searchsorted(x, threshold, side="right"))
+        if op == ">":
+            return int(np.searchsorted(x, threshold, side="right")), len(x)
+        return int(np.searchsorted(x, threshold, side="left")), len(x)
+
+    def mask(self, rules) -> np.ndarray:
+        """Bitmap of sellers matching every (metric, op, threshold) rule."""
+        out = np.ones(len(self.seller_ids), dtype=bool)
+        for metric, op, threshold in rules:
+            lo, hi = self._range(metric, op, threshold)
+            hit = np.zeros(len(out), dtype=bool)
+            hit[self._sorted[metric][1][lo:hi]] = True
+            out &= hit
+        return out
+
+    def matched_sums(self, rules) -> np.ndarray:
+        """Sums of [n_sellers, *additive] over the sellers matching all rules."""
+        rules = list(rules)
+        if not rules:
+            return np.zeros_like(self.totals)
+        if len(rules) == 1:
+            metric, op, threshold = rules[0]
+            lo, hi = self._range(metric, op, threshold)
+            prefix = self._sorted[metric][2]
+            return prefix[hi] - prefix[lo]
+        return self.mask(rules) @ self.values
+
+    def kept_totals(self, rules) -> dict:
+        """Totals after removing the sellers matching all rules (scenario_totals keys, IT cost excluded)."""
+        kept = dict(zip(self.columns, self.totals - self.matched_sums(rules)))
+        return {
+            "n_sellers": int(round(kept["n_sellers"])),
+            "n_items": int(round(kept["quantity"])),
+            "revenue": float(kept["revenues"]),
+            "review_cost": float(kept["cost_of_reviews"]),
+            "gross_profit": float(kept["revenues"] - kept["cost_of_reviews"]),
+        }
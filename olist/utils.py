@@ -1,6 +1,4 @@
 from math import radians, sin, cos, asin, sqrt
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 
 def haversine_distance(lon1, lat1, lon2, lat2):
@@ -38,6 +36,10 @@ def plot_kde_plot(df, variable, dimension):
     Plot a side by side kdeplot for `variable`, split
     by `dimension`.
     """
+    # Imported here so that importing olist (e.g. for haversine_distance)
+    # does not load matplotlib / seaborn in dashboard workers
+    import seaborn as sns
+
     g = sns.FacetGrid(df,
                       hue=dimension,
                       col=dimension)
@@ -3,7 +3,7 @@ from dash import html, dcc
 import dash_bootstrap_components as dbc
 
 # Navbar linkiyle uyumlu olduğundan emin olun (404 hatası almamak için)
-dash.register_page(__name__, path="/hakkinda", name="Metodoloji")
+dash.register_page(__name__, path="/hakkinda", name="Metodoloji", render_cache=())
 
 # Stil Sabitleri
 CARD_STYLE = {"borderRadius": "16px", "border": "none", "height": "100%"}
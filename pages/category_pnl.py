@@ -0,0 +1,217 @@
+# pages/category_pnl.py
+import dash
+from dash import html, dcc, dash_table, Input, Output, State
+from dash.dash_table.Format import Format, Scheme, Group
+import dash_bootstrap_components as dbc
+import pandas as pd
+import plotly.graph_objects as go
+
+from olist import datasets
+
+dash.register_page(__name__, path="/kategori-karlilik", name="Kategori Kârlılığı")
+
+# -----------------------------
+# Styling
+# -----------------------------
+CARD_STYLE = {"borderRadius": "16px", "border": "none"}
+COLOR_PROFIT = "#2ecc71"
+COLOR_LOSS = "#e74c3c"
+# Grafikte en iyi / en kötü kaç kategori gösterilir
+TOP_N = 12
+
+AGG_OPTIONS = [
+    {"label": "Ortalama", "value": "mean"},
+    {"label": "Medyan", "value": "median"},
+    {"label": "Toplam", "value": "sum"},
+]
+METRICS = {
+    "profits": ("Kâr (IT hariç)", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    "revenues": ("Gelir", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    "sales": ("Satış (BRL)", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    "cost_of_reviews": ("Review Maliyeti", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    "review_score": ("Ort. Puan", Format(precision=2, scheme=Scheme.fixed)),
+    "share_of_one_stars": ("1★ Oranı", Format(precision=1, scheme=Scheme.percentage)),
+    "wait_time": ("Bekleme (gün)", Format(precision=1, scheme=Scheme.fixed)),
+    "price": ("Fiyat", Format(precision=2, scheme=Scheme.fixed)),
+    "product_weight_g": ("Ağırlık (g)", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+}
+
+def brl(value: float) -> str:
+    return f"{value:,.0f} BRL"
+
+# -----------------------------
+# Veri: kategori × (sütun, agg) tablosu bir kez hesaplanır (olist/artifacts.py);
+# agg / filtre değişimi yalnızca bu tablodan dilim alır. Veri seti ?dataset= ile seçilir.
+# -----------------------------
+def load_categories(dataset=None) -> pd.DataFrame:
+    try:
+        return datasets.load(dataset, "product_categories")
+    except Exception as e:
+        print(f"Kategori tablosu yüklenemedi: {e}")
+        return pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=[None, None]))
+
+def category_options(table: pd.DataFrame) -> list[dict]:
+    return [{"label": c.replace("_", " "), "value": c} for c in table.index]
+
+def category_view(table: pd.DataFrame, agg: str, categories=None) -> pd.DataFrame:
+    view = table.xs(agg, axis=1, level=1) if len(table.columns) else pd.DataFrame()
+    if categories:
+        view = view[view.index.isin(categories)]
+    return view
+
+def pnl_totals(table: pd.DataFrame, categories=None) -> dict:
+    totals = category_view(table, "sum", categories)
+    return {
+        "sales": float(totals["sales"].sum()) if "sales" in totals else 0.0,
+        "revenues": float(totals["revenues"].sum()) if "revenues" in totals else 0.0,
+        "cost_of_reviews": float(totals["cost_of_reviews"].sum()) if "cost_of_reviews" in totals else 0.0,
+        "profits": float(totals["profits"].sum()) if "profits" in totals else 0.0,
+        "loss_categories": int((totals["profits"] < 0).sum()) if "profits" in totals else 0,
+        "n_categories": len(totals),
+    }
+
+def kpi_card(title, value, subtitle="", icon="", color="#2c3e50"):
+    return dbc.Card(
+        dbc.CardBody([
+            html.Div([
+                html.Span(icon, style={"fontSize": "20px", "marginRight": "8px"}),
+                html.Span(title, className="text-muted fw-semibold"),
+            ], style={"display": "flex", "alignItems": "center"}),
+            html.H3(value, className="mt-3 mb-1 fw-bold", style={"color": color}),
+            html.Div(subtitle, className="text-muted small"),
+        ]),
+        className="shadow-sm h-100",
+        style=CARD_STYLE,
+    )
+
+def kpi_cards(t: dict):
+    return [
+        dbc.Col(kpi_card("Satış", brl(t["sales"]), f"{t['n_categories']} kategori", "🛒"), md=3),
+        dbc.Col(kpi_card("Gelir (Komisyon)", brl(t["revenues"]), "Satışların %10'u", "💰"), md=3),
+        dbc.Col(kpi_card("Review Maliyeti", brl(t["cost_of_reviews"]), "Düşük puan kaynaklı", "🧾"), md=3),
+        dbc.Col(kpi_card("Kâr (IT hariç)", brl(t["profits"]), f"{t['loss_categories']} kategori zararda", "📈",
+                         color=COLOR_PROFIT if t["profits"] >= 0 else COLOR_LOSS), md=3),
+    ]
+
+def build_bar(view: pd.DataFrame, metric: str, agg: str):
+    label = METRICS[metric][0]
+    agg_label = next(o["label"] for o in AGG_OPTIONS if o["value"] == agg)
+    # tablo yüklenemediyse (boş görünüm) boş grafik
+    d = view[metric].dropna().sort_values() if metric in view else pd.Series(dtype=float)
+    if len(d) > 2 * TOP_N:
+        d = pd.concat([d.head(TOP_N), d.tail(TOP_N)])
+
+    fig = go.Figure(go.Bar(
+        x=d.to_numpy(), y=[c.replace("_", " ") for c in d.index], orientation="h",
+        marker_color=[COLOR_LOSS if v < 0 else COLOR_PROFIT for v in d.to_numpy()],
+        hovertemplate=f"<b>%{{y}}</b><br>{label} ({agg_label}): %{{x:,.2f}}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"<b>{label} — {agg_label}</b>",
+        height=max(400, 22 * len(d) + 100),
+        margin=dict(l=10, r=30, t=60, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(showgrid=True, gridcolor="#f1f1f1", zeroline=True, zerolinecolor="#2c3e50"),
+        yaxis=dict(tickfont=dict(size=12, color="#2c3e50")),
+        font=dict(family="Inter, Segoe UI, sans-serif"),
+        title_font=dict(size=18, color="#2c3e50"),
+    )
+    return fig
+
+def table_records(view: pd.DataFrame) -> list[dict]:
+    columns = [c for c in ["quantity", *METRICS] if c in view.columns]
+    return view[columns].reset_index().to_dict("records")
+
+TABLE_COLUMNS = (
+    [{"id": "category", "name": "Kategori", "type": "text"},
+     {"id": "quantity", "name": "Adet", "type": "numeric", "format": Format(group=Group.yes)}]
+    + [{"id": m, "name": label, "type": "numeric", "format": fmt} for m, (label, fmt) in METRICS.items()]
+)
+
+# -----------------------------
+# Layout
+# -----------------------------
+def layout(dataset=None, **kwargs):
+    table = load_categories(dataset)
+    view = category_view(table, "mean")
+    return dbc.Container(
+        [
+            html.Div([
+                html.H2("Kategori Kârlılığı — P&L", className="mt-4 mb-1 fw-bold", style={"color": "#2c3e50"}),
+                html.P("Ürün kategorilerinin satış, review maliyeti ve kâr katkısı.", className="text-muted mb-4"),
+            ]),
+
+            dbc.Card(
+                dbc.CardBody(
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div("📦 Kategori", className="text-muted small fw-semibold mb-1"),
+                            dcc.Dropdown(id="cat_filter", options=category_options(table), multi=True,
+                                         placeholder="Tüm kategoriler"),
+                        ], md=5),
+                        dbc.Col([
+                            html.Div("📊 Metrik", className="text-muted small fw-semibold mb-1"),
+                            dcc.Dropdown(id="cat_metric", value="profits", clearable=False,
+                                         options=[{"label": label, "value": m} for m, (label, _) in METRICS.items()]),
+                        ], md=3),
+                        dbc.Col([
+                            html.Div("∑ Ürün Bazında Toplama", className="text-muted small fw-semibold mb-1"),
+                            dbc.RadioItems(id="cat_agg", options=AGG_OPTIONS, value="mean", inline=True),
+                        ], md=4),
+                    ], className="g-3 align-items-center")
+                ),
+                className="shadow-sm mb-3",
+                style=CARD_STYLE,
+            ),
+
+            dbc.Row(kpi_cards(pnl_totals(table)), id="cat_kpi_row", className="g-3"),
+
+            dbc.Card(
+                dbc.CardBody(dcc.Graph(id="cat_bar", figure=build_bar(view, "profits", "mean"),
+                                       config={"displayModeBar": False})),
+                className="shadow-sm mt-3",
+                style=CARD_STYLE,
+            ),
+
+            dbc.Card(
+                dbc.CardBody(
+                    dash_table.DataTable(
+                        id="cat_table",
+                        columns=TABLE_COLUMNS,
+                        data=table_records(view),
+                        sort_action="native",
+                        page_size=20,
+                        style_table={"overflowX": "auto"},
+                        style_cell={"fontFamily": "Inter, Segoe UI, sans-serif", "fontSize": "13px", "padding": "6px"},
+                        style_header={"fontWeight": "700", "backgroundColor": "#f8f9fa"},
+                        style_data_conditional=[
+                            {"if": {"filter_query": "{profits} < 0", "column_id": "profits"}, "color": COLOR_LOSS},
+                        ],
+                    )
+                ),
+                className="shadow-sm mt-3",
+                style=CARD_STYLE,
+            ),
+        ],
+        fluid=True,
+        className="pb-5 px-4",
+    )
+
+# -----------------------------
+# Callback (agg / kategori / metrik → önceden hesaplanmış tablodan dilim)
+# -----------------------------
+@dash.callback(
+    Output("cat_kpi_row", "children"),
+    Output("cat_bar", "figure"),
+    Output("cat_table", "data"),
+    Input("cat_agg", "value"),
+    Input("cat_filter", "value"),
+    Input("cat_metric", "value"),
+    State("url", "search"),
+    prevent_initial_call=True,
+)
+def update_categories(agg, categories, metric, search=None):
+    table = load_categories(datasets.from_search(search))
+    view = category_view(table, agg or "mean", categories)
+    return kpi_cards(pnl_totals(table, categories)), build_bar(view, metric or "profits", agg or "mean"), table_records(view)
@@ -0,0 +1,258 @@
+# pages/customer_segments.py
+import dash
+from dash import html, dcc, Input, Output, State
+import dash_bootstrap_components as dbc
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from olist import datasets
+from olist.customer import PAYMENT_TYPES, SEGMENTS
+
+dash.register_page(__name__, path="/musteri-segmentleri", name="Müşteri Segmentleri")
+
+# -----------------------------
+# Stil ve Etiketler
+# -----------------------------
+CARD_STYLE = {"borderRadius": "16px", "border": "none"}
+SECTION_CARD_CLASS = "shadow-sm mt-3"
+
+SEGMENT_LABELS = {
+    "loyal": "Sadık",
+    "loyal_at_risk": "Riskli Sadık",
+    "new_high_value": "Yeni & Değerli",
+    "new": "Yeni",
+    "dormant_high_value": "Uyuyan Değerli",
+    "potential": "Potansiyel",
+    "lost": "Kayıp",
+}
+SEGMENT_COLORS = {
+    "loyal": "#1E8449",
+    "loyal_at_risk": "#F39C12",
+    "new_high_value": "#2E86C1",
+    "new": "#85C1E9",
+    "dormant_high_value": "#8E44AD",
+    "potential": "#95A5A6",
+    "lost": "#E74C3C",
+}
+# Segment başına önerilen aksiyon
+SEGMENT_ACTIONS = {
+    "loyal": "Sadakat programı, erken erişim kampanyaları.",
+    "loyal_at_risk": "Kişisel geri kazanım kuponu; teslimat deneyimini kontrol et.",
+    "new_high_value": "İkinci siparişe yönelik çapraz satış önerileri.",
+    "new": "Hoş geldin serisi, ikinci alışveriş indirimi.",
+    "dormant_high_value": "Yüksek değerli geri kazanım kampanyası.",
+    "potential": "Kategori bazlı hatırlatma e-postaları.",
+    "lost": "Düşük maliyetli toplu yeniden aktivasyon.",
+}
+PAYMENT_LABELS = {
+    "credit_card": "Kredi Kartı",
+    "boleto": "Boleto",
+    "voucher": "Kupon",
+    "debit_card": "Banka Kartı",
+    "other": "Diğer",
+}
+PAYMENT_COLORS = ["#2E86C1", "#F5B041", "#AF7AC5", "#48C9B0", "#BDC3C7"]
+VALUE_COLS = [f"{t}_value" for t in PAYMENT_TYPES]
+
+def brl(value: float) -> str:
+    return f"{value:,.0f} BRL"
+
+# -----------------------------
+# Veri (state × segment × R × M özet tablosu; müşteri sayısından bağımsız küçük)
+# Veri seti ?dataset= ile seçilir
+# -----------------------------
+def load_summary(dataset=None) -> pd.DataFrame:
+    try:
+        return datasets.load(dataset, "customer_segments")
+    except Exception as e:
+        print(f"Müşteri segmentleri yüklenemedi: {e}")
+        return pd.DataFrame(columns=["customer_state", "segment", "r_score", "m_score", "customers", "orders",
+                                     "repeaters", "monetary", "recency_sum", *VALUE_COLS])
+
+def state_options(summary: pd.DataFrame) -> list[dict]:
+    return [{"label": s, "value": s} for s in sorted(summary["customer_state"].astype(str).unique())]
+
+def filter_summary(summary: pd.DataFrame, states) -> pd.DataFrame:
+    if not states:
+        return summary
+    return summary[summary["customer_state"].astype(str).isin(states)]
+
+def build_kpis(s: pd.DataFrame) -> dict:
+    customers = s["customers"].sum()
+    return {
+        "customers": int(customers),
+        "repeat_rate": s["repeaters"].sum() / customers if customers else 0.0,
+        "avg_monetary": s["monetary"].sum() / customers if customers else 0.0,
+        "avg_recency": s["recency_sum"].sum() / customers if customers else 0.0,
+        "monetary": s["monetary"].sum(),
+    }
+
+def kpi_card(title, value, subtitle="", icon=""):
+    return dbc.Card(
+        dbc.CardBody([
+            html.Div([
+                html.Span(icon, style={"fontSize": "20px", "marginRight": "8px"}),
+                html.Span(title, className="text-muted fw-semibold"),
+            ], style={"display": "flex", "alignItems": "center"}),
+            html.H3(value, className="mt-3 mb-1 fw-bold", style={"color": "#2c3e50"}),
+            html.Div(subtitle, className="text-muted small"),
+        ]),
+        className="shadow-sm h-100",
+        style=CARD_STYLE,
+    )
+
+def kpi_cards(k: dict):
+    return [
+        dbc.Col(kpi_card("Müşteri", f"{k['customers']:,}", "Tekil müşteri (customer_unique_id)", "👥"), md=3),
+        dbc.Col(kpi_card("Tekrar Alım Oranı", f"{k['repeat_rate']:.1%}", "2+ sipariş veren müşteriler", "🔁"), md=3),
+        dbc.Col(kpi_card("Müşteri Başına Değer", brl(k["avg_monetary"]), f"Toplam {brl(k['monetary'])}", "💰"), md=3),
+        dbc.Col(kpi_card("Ortalama Yenilik", f"{k['avg_recency']:.0f} gün", "Son siparişten bu yana", "⏱️"), md=3),
+    ]
+
+def _layout(fig, title, height=380):
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        height=height,
+        margin=dict(l=10, r=20, t=60, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter, Segoe UI, sans-serif"),
+        title_font=dict(size=18, color="#2c3e50"),
+    )
+    return fig
+
+def by_segment(s: pd.DataFrame) -> pd.DataFrame:
+    d = s.groupby("segment", observed=False)[["customers", "monetary", *VALUE_COLS]].sum()
+    return d.reindex(list(SEGMENTS), fill_value=0)
+
+def build_segment_bar(s: pd.DataFrame):
+    d = by_segment(s)
+    labels = [SEGMENT_LABELS[x] for x in d.index]
+    share = d["monetary"] / max(d["monetary"].sum(), 1)
+    fig = go.Figure(go.Bar(
+        x=labels, y=d["customers"],
+        marker_color=[SEGMENT_COLORS[x] for x in d.index],
+        customdata=np.column_stack([d["monetary"], share]),
+        text=d["customers"], texttemplate="<b>%{text:,}</b>", textposition="outside", cliponaxis=False,
+        hovertemplate="<b>%{x}</b><br>Müşteri: %{y:,}<br>Gelir: %{customdata[0]:,.0f} BRL"
+                      "<br>Gelir Payı: %{customdata[1]:.1%}<extra></extra>",
+    ))
+    fig.update_yaxes(visible=False)
+    return _layout(fig, "Segment Büyüklükleri")
+
+def build_rm_heatmap(s: pd.DataFrame):
+    grid = (s.groupby(["m_score", "r_score"])["customers"].sum()
+            .unstack(fill_value=0)
+            .reindex(index=range(1, 6), columns=range(1, 6), fill_value=0))
+    fig = go.Figure(go.Heatmap(
+        z=grid.to_numpy(), x=[f"R{r}" for r in grid.columns], y=[f"M{m}" for m in grid.index],
+        colorscale="Blues", text=grid.to_numpy(), texttemplate="%{text:,}",
+        hovertemplate="Yenilik %{x} · Değer %{y}<br>Müşteri: %{z:,}<extra></extra>",
+        showscale=False,
+    ))
+    fig.update_xaxes(title="Yenilik skoru (5 = en yeni)")
+    fig.update_yaxes(title="Değer skoru (5 = en yüksek)")
+    return _layout(fig, "Yenilik × Değer Matrisi")
+
+def build_payment_mix(s: pd.DataFrame):
+    d = by_segment(s)
+    totals = d[VALUE_COLS].sum(axis=1).replace(0, 1)
+    labels = [SEGMENT_LABELS[x] for x in d.index]
+    fig = go.Figure([
+        go.Bar(name=PAYMENT_LABELS[t], y=labels, x=d[col] / totals, orientation="h", marker_color=color,
+               customdata=d[col], hovertemplate=f"<b>%{{y}}</b><br>{PAYMENT_LABELS[t]}: %{{x:.1%}}"
+                                                f" (%{{customdata:,.0f}} BRL)<extra></extra>")
+        for t, col, color in zip(PAYMENT_TYPES, VALUE_COLS, PAYMENT_COLORS)
+    ])
+    fig.update_layout(barmode="stack", legend=dict(orientation="h", y=-0.1))
+    fig.update_xaxes(tickformat=".0%", showgrid=False)
+    return _layout(fig, "Ödeme Tipine Göre Gelir Dağılımı")
+
+def build_action_table(s: pd.DataFrame):
+    d = by_segment(s)
+    rows = [
+        html.Tr([
+            html.Td(html.Span(SEGMENT_LABELS[seg], className="fw-bold", style={"color": SEGMENT_COLORS[seg]})),
+            html.Td(f"{int(row['customers']):,}"),
+            html.Td(brl(row["monetary"])),
+            html.Td(SEGMENT_ACTIONS[seg], className="text-muted"),
+        ])
+        for seg, row in d.iterrows()
+    ]
+    header = html.Thead(html.Tr([html.Th("Segment"), html.Th("Müşteri"), html.Th("Gelir"), html.Th("Önerilen Aksiyon")]))
+    return dbc.Table([header, html.Tbody(rows)], hover=True, responsive=True, className="mb-0 small")
+
+# -----------------------------
+# Layout
+# -----------------------------
+def layout(dataset=None, **kwargs):
+    summary = load_summary(dataset)
+    return dbc.Container(
+        [
+            html.Div([
+                html.H2("Müşteri Segmentasyonu — RFM", className="mt-4 mb-1 fw-bold", style={"color": "#2c3e50"}),
+                html.P("Müşterilerin yenilik (R), sıklık (F) ve parasal değer (M) skorlarına göre segmentlere ayrılması.",
+                       className="text-muted mb-4"),
+            ]),
+
+            dbc.Card(
+                dbc.CardBody(
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div("📍 Müşteri Eyaleti", className="text-muted small fw-semibold mb-1"),
+                            dcc.Dropdown(id="cust_states", options=state_options(summary), multi=True, placeholder="Tüm eyaletler"),
+                        ], md=6),
+                    ], className="g-3 align-items-center")
+                ),
+                className="shadow-sm mb-3",
+                style=CARD_STYLE,
+            ),
+
+            dbc.Row(kpi_cards(build_kpis(summary)), id="cust_kpi_row", className="g-3"),
+
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody(dcc.Graph(id="cust_segment_bar", figure=build_segment_bar(summary),
+                                                        config={"displayModeBar": False})),
+                                 className=SECTION_CARD_CLASS, style=CARD_STYLE), md=7),
+                dbc.Col(dbc.Card(dbc.CardBody(dcc.Graph(id="cust_rm_heatmap", figure=build_rm_heatmap(summary),
+                                                        config={"displayModeBar": False})),
+                                 className=SECTION_CARD_CLASS, style=CARD_STYLE), md=5),
+            ], className="g-3"),
+
+            dbc.Card(
+                dbc.CardBody(dcc.Graph(id="cust_payment_mix", figure=build_payment_mix(summary),
+                                       config={"displayModeBar": False})),
+                className=SECTION_CARD_CLASS,
+                style=CARD_STYLE,
+            ),
+
+            dbc.Card(
+                dbc.CardBody([
+                    html.H5("🎯 Segment Bazlı Aksiyonlar", className="mb-3 fw-bold", style={"color": "#2c3e50"}),
+                    html.Div(build_action_table(summary), id="cust_action_table"),
+                ]),
+                className=SECTION_CARD_CLASS,
+                style=CARD_STYLE,
+            ),
+        ],
+        fluid=True,
+        className="pb-5 px-4",
+    )
+
+# -----------------------------
+# Callback (eyalet filtresi → özet tablo dilimi → tüm görseller)
+# -----------------------------
+@dash.callback(
+    Output("cust_kpi_row", "children"),
+    Output("cust_segment_bar", "figure"),
+    Output("cust_rm_heatmap", "figure"),
+    Output("cust_payment_mix", "figure"),
+    Output("cust_action_table", "children"),
+    Input("cust_states", "value"),
+    State("url", "search"),
+    prevent_initial_call=True,
+)
+def update_segments(states, search=None):
+    s = filter_summary(load_summary(datasets.from_search(search)), states)
+    return kpi_cards(build_kpis(s)), build_segment_bar(s), build_rm_heatmap(s), build_payment_mix(s), build_action_table(s)
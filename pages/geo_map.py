@@ -0,0 +1,240 @@
+# pages/geo_map.py
+import dash
+from dash import html, dcc, Input, Output, State
+import dash_bootstrap_components as dbc
+import numpy as np
+import plotly.graph_objects as go
+
+from olist import datasets
+from olist.geo import StateFlows
+
+dash.register_page(__name__, path="/cografya", name="Coğrafi Performans", render_cache=("state_flows",))
+
+# -----------------------------
+# Stil ve Etiketler
+# -----------------------------
+CARD_STYLE = {"borderRadius": "16px", "border": "none"}
+SECTION_CARD_CLASS = "shadow-sm mt-3"
+
+METRIC_OPTIONS = [
+    {"label": "Teslim Süresi (gün)", "value": "wait_time"},
+    {"label": "Gecikme (gün)", "value": "delay_vs_expected"},
+    {"label": "Yorum Maliyeti (BRL)", "value": "review_cost"},
+    {"label": "Mesafe (km)", "value": "distance_km"},
+]
+METRIC_LABELS = {o["value"]: o["label"] for o in METRIC_OPTIONS}
+METRIC_FORMATS = {"wait_time": ".1f", "delay_vs_expected": ".2f", "review_cost": ".1f", "distance_km": ",.0f"}
+# Haritada çizilen eyaletler arası akış sayısı (en yoğun olanlar)
+MAX_FLOWS = 120
+LINE_COLORS = ["#2E86C1", "#48C9B0", "#F4D03F", "#E67E22", "#C0392B"]
+TOP_WORST = 15
+
+# -----------------------------
+# Veri (satıcı eyaleti × müşteri eyaleti matrisi; olist/geo.py). Veri seti ?dataset= ile seçilir
+# -----------------------------
+def load_flows(dataset=None) -> StateFlows:
+    try:
+        return datasets.load(dataset, "state_flows")
+    except Exception as e:
+        print(f"Eyalet akışları yüklenemedi: {e}")
+        return StateFlows.from_pairs([], [], np.zeros((0, len(StateFlows.METRICS))))
+
+def state_options(flows: StateFlows) -> list[dict]:
+    return [{"label": s, "value": s} for s in flows.states]
+
+def fmt(value: float, metric: str) -> str:
+    return "—" if np.isnan(value) else format(value, METRIC_FORMATS[metric])
+
+def kpi_card(title, value, subtitle="", icon=""):
+    return dbc.Card(
+        dbc.CardBody([
+            html.Div([
+                html.Span(icon, style={"fontSize": "20px", "marginRight": "8px"}),
+                html.Span(title, className="text-muted fw-semibold"),
+            ], style={"display": "flex", "alignItems": "center"}),
+            html.H3(value, className="mt-3 mb-1 fw-bold", style={"color": "#2c3e50"}),
+            html.Div(subtitle, className="text-muted small"),
+        ]),
+        className="shadow-sm h-100",
+        style=CARD_STYLE,
+    )
+
+def kpi_cards(flows: StateFlows, origins):
+    t = flows.totals(origins=origins).iloc[0]
+    return [
+        dbc.Col(kpi_card("Sipariş × Satıcı", f"{int(t['pairs']):,}",
+                         f"Eyalet içi pay (tümü): {flows.intra_state_share():.1%}", "📦"), md=3),
+        dbc.Col(kpi_card("Ort. Teslim Süresi", f"{fmt(t['wait_time'], 'wait_time')} gün",
+                         f"Gecikme: {fmt(t['delay_vs_expected'], 'delay_vs_expected')} gün", "🚚"), md=3),
+        dbc.Col(kpi_card("Yorum Maliyeti", f"{fmt(t['review_cost'], 'review_cost')} BRL",
+                         "Sipariş × satıcı başına ortalama", "⭐"), md=3),
+        dbc.Col(kpi_card("Ort. Mesafe", f"{fmt(t['distance_km'], 'distance_km')} km",
+                         "Satıcı → müşteri posta kodu merkezleri", "📍"), md=3),
+    ]
+
+def _layout(fig, title, height=420):
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        height=height,
+        margin=dict(l=10, r=20, t=60, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter, Segoe UI, sans-serif"),
+        title_font=dict(size=18, color="#2c3e50"),
+    )
+    return fig
+
+def build_map(flows: StateFlows, metric: str, origins, min_pairs: int):
+    label = METRIC_LABELS[metric]
+    lat = dict(zip(flows.states, flows.centroids[:, 0]))
+    lng = dict(zip(flows.states, flows.centroids[:, 1]))
+    fig = go.Figure()
+
+    # Eyaletler arası akışlar: en yoğun MAX_FLOWS akış, metriğin beşte birlik dilimine göre renkli
+    f = flows.flows(origins=origins, min_pairs=min_pairs)
+    f = f[(f["origin"] != f["destination"])
+          & f["origin"].map(lat).notna() & f["destination"].map(lat).notna()].head(MAX_FLOWS)
+    if len(f):
+        edges = np.unique(np.nanquantile(f[metric], np.linspace(0, 1, len(LINE_COLORS) + 1)))
+        bins = np.clip(np.searchsorted(edges, f[metric], side="right") - 1, 0, len(LINE_COLORS) - 1)
+        for b, color in enumerate(LINE_COLORS):
+            part = f[bins == b]
+            if part.empty:
+                continue
+            lons, lats = [], []
+            for o, d in zip(part["origin"], part["destination"]):
+                lons += [lng[o], lng[d], None]
+                lats += [lat[o], lat[d], None]
+            fig.add_trace(go.Scattergeo(
+                lon=lons, lat=lats, mode="lines", line=dict(width=1.5, color=color), opacity=0.7,
+                name=f"{label}: {fmt(part[metric].min(), metric)}–{fmt(part[metric].max(), metric)}",
+                hoverinfo="skip",
+            ))
+
+    # Müşteri eyaletleri: büyüklük = hacim, renk = metrik ortalaması
+    dest = flows.totals(origins=origins, by="destination")
+    dest = dest[(dest["pairs"] >= max(min_pairs, 1)) & dest.index.map(lat).notna()]
+    fig.add_trace(go.Scattergeo(
+        lon=dest.index.map(lng), lat=dest.index.map(lat), text=list(dest.index),
+        mode="markers+text", textposition="top center", textfont=dict(size=10),
+        marker=dict(size=6 + 34 * np.sqrt(dest["pairs"] / max(dest["pairs"].max(), 1)),
+                    color=dest[metric], colorscale="RdYlBu_r", showscale=True,
+                    colorbar=dict(title=label), line=dict(width=0.5, color="#ffffff")),
+        customdata=np.column_stack([dest["pairs"], dest[metric]]) if len(dest) else None,
+        hovertemplate=f"Müşteri eyaleti %{{text}}<br>Sipariş × satıcı: %{{customdata[0]:,}}"
+                      f"<br>{label}: %{{customdata[1]:{METRIC_FORMATS[metric]}}}<extra></extra>",
+        name="Müşteri eyaleti",
+        showlegend=False,
+    ))
+    fig.update_geos(
+        scope="south america", showcountries=True, countrycolor="#bbbbbb", showland=True, landcolor="#f4f6fb",
+        lataxis_range=[-35, 6], lonaxis_range=[-75, -32],
+    )
+    fig.update_layout(legend=dict(orientation="h", y=-0.05))
+    title = "Satıcı → Müşteri Eyalet Akışları" + (f" ({', '.join(origins)})" if origins else "")
+    return _layout(fig, title, height=620)
+
+def build_heatmap(flows: StateFlows, metric: str, origins, min_pairs: int):
+    m = flows.mean(metric, min_pairs)
+    if origins:
+        m = m.loc[[s for s in m.index if s in set(origins)]]
+    m = m.dropna(how="all").dropna(axis=1, how="all")
+    fig = go.Figure(go.Heatmap(
+        z=m.to_numpy(), x=list(m.columns), y=list(m.index), colorscale="RdYlBu_r",
+        hovertemplate=f"%{{y}} → %{{x}}<br>{METRIC_LABELS[metric]}: %{{z:{METRIC_FORMATS[metric]}}}<extra></extra>",
+        colorbar=dict(title=METRIC_LABELS[metric]),
+    ))
+    fig.update_xaxes(title="Müşteri eyaleti", dtick=1)
+    fig.update_yaxes(title="Satıcı eyaleti", dtick=1, autorange="reversed")
+    return _layout(fig, f"Eyalet × Eyalet Matrisi — {METRIC_LABELS[metric]}", height=max(420, 18 * len(m) + 160))
+
+def build_worst(flows: StateFlows, metric: str, origins, min_pairs: int):
+    f = flows.flows(origins=origins, min_pairs=min_pairs).nlargest(TOP_WORST, metric).iloc[::-1]
+    fig = go.Figure(go.Bar(
+        x=f[metric], y=f["origin"] + " → " + f["destination"], orientation="h", marker_color="#C0392B",
+        customdata=f["pairs"],
+        hovertemplate=f"%{{y}}<br>{METRIC_LABELS[metric]}: %{{x:{METRIC_FORMATS[metric]}}}"
+                      f"<br>Sipariş × satıcı: %{{customdata:,}}<extra></extra>",
+    ))
+    fig.update_xaxes(gridcolor="#f1f1f1")
+    return _layout(fig, f"En Kötü {TOP_WORST} Akış — {METRIC_LABELS[metric]}", height=480)
+
+# -----------------------------
+# Layout
+# -----------------------------
+def layout(dataset=None, **kwargs):
+    flows = load_flows(dataset)
+    return dbc.Container(
+        [
+            html.Div([
+                html.H2("Coğrafi Performans — Eyalet Akışları", className="mt-4 mb-1 fw-bold", style={"color": "#2c3e50"}),
+                html.P("Satıcı eyaletinden müşteri eyaletine teslim süresi, gecikme ve yorum maliyeti; "
+                       "lojistik modelinde mesafenin etkisinin haritadaki karşılığı.",
+                       className="text-muted mb-4"),
+            ]),
+
+            dbc.Card(
+                dbc.CardBody(
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div("📍 Satıcı Eyaleti (çıkış)", className="text-muted small fw-semibold mb-1"),
+                            dcc.Dropdown(id="geo_origin", options=state_options(flows), multi=True, placeholder="Tüm eyaletler"),
+                        ], md=3),
+                        dbc.Col([
+                            html.Div("📊 Metrik", className="text-muted small fw-semibold mb-1"),
+                            dbc.RadioItems(id="geo_metric", options=METRIC_OPTIONS, value="wait_time", inline=True),
+                        ], md=5),
+                        dbc.Col([
+                            html.Div("📦 Min. Sipariş × Satıcı", className="text-muted small fw-semibold mb-1"),
+                            dcc.Slider(id="geo_min_pairs", min=1, max=200, step=1, value=20,
+                                       marks={1: "1", 50: "50", 100: "100", 200: "200"}),
+                        ], md=4),
+                    ], className="g-3 align-items-center")
+                ),
+                className="shadow-sm mb-3",
+                style=CARD_STYLE,
+            ),
+
+            dbc.Row(kpi_cards(flows, None), id="geo_kpi_row", className="g-3"),
+
+            dbc.Card(
+                dbc.CardBody(dcc.Graph(id="geo_map", figure=build_map(flows, "wait_time", None, 20),
+                                       config={"displayModeBar": False})),
+                className=SECTION_CARD_CLASS,
+                style=CARD_STYLE,
+            ),
+
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody(dcc.Graph(id="geo_heatmap", figure=build_heatmap(flows, "wait_time", None, 20),
+                                                        config={"displayModeBar": False})),
+                                 className=SECTION_CARD_CLASS, style=CARD_STYLE), md=7),
+                dbc.Col(dbc.Card(dbc.CardBody(dcc.Graph(id="geo_worst", figure=build_worst(flows, "wait_time", None, 20),
+                                                        config={"displayModeBar": False})),
+                                 className=SECTION_CARD_CLASS, style=CARD_STYLE), md=5),
+            ], className="g-3"),
+        ],
+        fluid=True,
+        className="pb-5 px-4",
+    )
+
+# -----------------------------
+# Callback (eyalet / metrik / min. hacim → önceden hesaplanmış matristen dilim; ham coğrafya tablosuna dokunmaz)
+# -----------------------------
+@dash.callback(
+    Output("geo_kpi_row", "children"),
+    Output("geo_map", "figure"),
+    Output("geo_heatmap", "figure"),
+    Output("geo_worst", "figure"),
+    Input("geo_origin", "value"),
+    Input("geo_metric", "value"),
+    Input("geo_min_pairs", "value"),
+    State("url", "search"),
+    prevent_initial_call=True,
+)
+def update_geo(origins, metric, min_pairs, search=None):
+    flows = load_flows(datasets.from_search(search))
+    origins = origins or None
+    metric = metric or "wait_time"
+    min_pairs = int(min_pairs or 1)
+    return (kpi_cards(flows, origins), build_map(flows, metric, origins, min_pairs),
+            build_heatmap(flows, metric, origins, min_pairs), build_worst(flows, metric, origins, min_pairs))
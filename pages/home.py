@@ -1,12 +1,13 @@
 # pages/home.py
 import dash
-from dash import html, dcc
+from dash import html, dcc, Input, Output, State
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 
-from olist.seller_updated import Seller
+from olist import datasets
+from olist.scenario import compute_it_cost
 
-dash.register_page(__name__, path="/", name="Finansal Özet")
+dash.register_page(__name__, path="/", name="Finansal Özet", render_cache=("financial_index",))
 
 # -----------------------------
 # Styling (Geliştirilmiş BI Standartları)
@@ -33,15 +34,6 @@ HIGHLIGHT_BADGE_STYLE = {
     "letterSpacing": "0.5px"
 }
 
-# IT Maliyet Modeli
-ALPHA, BETA = 3157.27, 978.23
-
-def cost_of_it(n_sellers: int, quantity: float) -> float:
-    return ALPHA * (n_sellers**0.5) + BETA * (quantity**0.5)
-
-def load_sellers():
-    return Seller().get_training_data()
-
 def brl(value: float) -> str:
     return f"{value:,.0f} BRL"
 
@@ -72,23 +64,32 @@ def build_waterfall(k):
     COLOR_TOTAL = "#34495e"    # Kurumsal Lacivert (Ara Toplamlar için)
     COLOR_NET = "#0d6efd"      # Net Kâr için Mavi
 
+    steps = [
+        ("Abonelik", "relative", k["gelir_abonelik"], f"+{k['gelir_abonelik']/1e6:.1f}M"),
+        ("Komisyon", "relative", k["gelir_satis_komisyonu"], f"+{k['gelir_satis_komisyonu']/1e6:.1f}M"),
+        ("Toplam Gelir", "total", 0, f"<b>{k['toplam_gelir']/1e6:.1f}M</b>"),
+        ("Review", "relative", -k["maliyet_review"], f"-{k['maliyet_review']/1e6:.1f}M"),
+        ("Brüt Kâr", "total", 0, f"<b>{k['brut_kar']/1e6:.1f}M</b>"),
+        ("IT/Oper.", "relative", -k["it_maliyeti"], f"-{k['it_maliyeti']/1e6:.1f}M"),
+    ]
+    # Opsiyonel: taksitli ödemelerin finansman (peşin çekim) maliyeti
+    if k["maliyet_finansman"]:
+        steps.append(("Finansman", "relative", -k["maliyet_finansman"], f"-{k['maliyet_finansman']/1e6:.2f}M"))
+    steps.append((
+        "Net Kâr", "total", 0,
+        f"<span style='font-size:16px; color:#0d6efd'><b>{k['net_kar']/1e6:.2f}M</b></span>",
+    ))
+    x, measure, y, text = zip(*steps)
+
     fig = go.Figure(
         go.Waterfall(
             orientation="v",
-            measure=["relative", "relative", "total", "relative", "total", "relative", "total"],
-            x=["Abonelik", "Komisyon", "Toplam Gelir", "Review", "Brüt Kâr", "IT/Oper.", "Net Kâr"],
+            measure=list(measure),
+            x=list(x),
             textposition="outside",
             # Madde 2: Etiketleri belirginleştirme
-            text=[
-                f"+{k['gelir_abonelik']/1e6:.1f}M",
-                f"+{k['gelir_satis_komisyonu']/1e6:.1f}M",
-                f"<b>{k['toplam_gelir']/1e6:.1f}M</b>",
-                f"-{k['maliyet_review']/1e6:.1f}M",
-                f"<b>{k['brut_kar']/1e6:.1f}M</b>",
-                f"-{k['it_maliyeti']/1e6:.1f}M",
-                f"<span style='font-size:16px; color:#0d6efd'><b>{k['net_kar']/1e6:.2f}M</b></span>",
-            ],
-            y=[k["gelir_abonelik"], k["gelir_satis_komisyonu"], 0, -k["maliyet_review"], 0, -k["it_maliyeti"], 0],
+            text=list(text),
+            y=list(y),
             decreasing={"marker": {"color": COLOR_COST}},
             increasing={"marker": {"color": COLOR_REVENUE}},
             totals={"marker": {"color": COLOR_TOTAL}},
@@ -120,103 +121,171 @@ def build_waterfall(k):
 
     return fig
 
-# --- Veri Hesaplama Bölümü (Aynı Kaldı) ---
-sellers = load_sellers()
-gelir_satis_komisyonu = sellers["sales"].sum() * 0.10
-gelir_abonelik = sellers["months_on_olist"].sum() * 80
-toplam_gelir = float(sellers["revenues"].sum())
-maliyet_review = float(sellers["cost_of_reviews"].sum())
-n_sellers = int(sellers["seller_id"].nunique())
-quantity = float(sellers["quantity"].sum())
-it_maliyeti = float(cost_of_it(n_sellers, quantity))
-brut_kar = float(sellers["profits"].sum())
-net_kar = brut_kar - it_maliyeti
-
-k = {
-    "gelir_satis_komisyonu": float(gelir_satis_komisyonu),
-    "gelir_abonelik": float(gelir_abonelik),
-    "toplam_gelir": toplam_gelir,
-    "maliyet_review": maliyet_review,
-    "it_maliyeti": it_maliyeti,
-    "brut_kar": brut_kar,
-    "net_kar": net_kar,
-    "n_sellers": n_sellers,
-    "quantity": quantity,
-}
+def build_kpis(t: dict, with_financing: bool = False) -> dict:
+    """
+    FinancialIndex toplamlarından waterfall/KPI sözlüğünü üretir (IT maliyeti burada yeniden hesaplanır).
+    with_financing: taksit finansman maliyeti (olist/payment.py) net kârdan düşülür.
+    """
+    gelir_satis_komisyonu = t["sales"] * 0.10
+    gelir_abonelik = t["subscription_months"] * 80
+    toplam_gelir = gelir_satis_komisyonu + gelir_abonelik
+    maliyet_review = t["cost_of_reviews"]
+    it_maliyeti = float(compute_it_cost(t["n_sellers"], t["quantity"]))
+    maliyet_finansman = float(t.get("financing_cost", 0.0)) if with_financing else 0.0
+    brut_kar = toplam_gelir - maliyet_review
+    net_kar = brut_kar - it_maliyeti - maliyet_finansman
+
+    return {
+        "gelir_satis_komisyonu": float(gelir_satis_komisyonu),
+        "gelir_abonelik": float(gelir_abonelik),
+        "toplam_gelir": float(toplam_gelir),
+        "maliyet_review": float(maliyet_review),
+        "it_maliyeti": it_maliyeti,
+        "maliyet_finansman": maliyet_finansman,
+        "brut_kar": float(brut_kar),
+        "net_kar": float(net_kar),
+        "n_sellers": int(t["n_sellers"]),
+        "quantity": float(t["quantity"]),
+    }
 
-wf_fig = build_waterfall(k)
+def kpi_cards(k: dict):
+    return [
+        dbc.Col(kpi_card("Toplam Gelir", k["toplam_gelir"], "Abonelik + Komisyon", "💰"), md=3),
+        dbc.Col(kpi_card("Review Maliyeti", k["maliyet_review"], "Gecikme/İade Kaynaklı", "🧾"), md=3),
+        dbc.Col(kpi_card("IT / Operasyon", k["it_maliyeti"] + k["maliyet_finansman"],
+                         f"{k['n_sellers']} Satıcı Altyapısı" + (" + Taksit Finansmanı" if k["maliyet_finansman"] else ""),
+                         "🖥️"), md=3),
+        dbc.Col(kpi_card("Net Kâr", k["net_kar"], "Final Operasyonel Sonuç", "📈", highlight=True, badge_text="HEDEF KPI"), md=3),
+    ]
+
+# --- Veri Hesaplama Bölümü ---
+# Filtreler (eyalet × ay) finansal indeksin dilimleri toplanarak cevaplanır.
+# Hazır artefaktlar (python -m olist.build) varsa diskten yüklenir
+# Veri seti ?dataset= ile seçilir (olist/datasets.py; yüklü indeksler LRU önbellekte)
+def load_fin_index(dataset=None):
+    return datasets.load(dataset, "financial_index")
+
+def has_financing(index) -> bool:
+    # Ödeme verisi yoksa finansman metriği sıfırdır; anahtar devre dışı kalır
+    return index.query().get("financing_cost", 0.0) > 0
 
 # -----------------------------
 # Layout (Geliştirilmiş İçerik)
 # -----------------------------
-layout = dbc.Container(
-    [
-        html.Div([
-            html.H2("Finansal Özet — Mevcut Durum", className="mt-4 mb-1 fw-bold", style={"color": "#2c3e50"}),
-            html.P("Operasyonel maliyetlerin kârlılık üzerindeki doğrudan etkisini analiz edin.", className="text-muted mb-4"),
-        ]),
-
-        dbc.Row(
-            [
-                dbc.Col(kpi_card("Toplam Gelir", k["toplam_gelir"], "Abonelik + Komisyon", "💰"), md=3),
-                dbc.Col(kpi_card("Review Maliyeti", k["maliyet_review"], "Gecikme/İade Kaynaklı", "🧾"), md=3),
-                dbc.Col(kpi_card("IT / Operasyon", k["it_maliyeti"], f"{k['n_sellers']} Satıcı Altyapısı", "🖥️"), md=3),
-                dbc.Col(kpi_card("Net Kâr", k["net_kar"], "Final Operasyonel Sonuç", "📈", highlight=True, badge_text="HEDEF KPI"), md=3),
-            ],
-            className="g-3",
-        ),
+def layout(dataset=None, **kwargs):
+    index = load_fin_index(dataset)
+    months = index.months
+    last_month = len(months) - 1
+    k = build_kpis(index.query())
+    return dbc.Container(
+        [
+            html.Div([
+                html.H2("Finansal Özet — Mevcut Durum", className="mt-4 mb-1 fw-bold", style={"color": "#2c3e50"}),
+                html.P("Operasyonel maliyetlerin kârlılık üzerindeki doğrudan etkisini analiz edin.", className="text-muted mb-4"),
+            ]),
 
-        dbc.Card(
-            dbc.CardBody(
-                [
-                    html.Div([
-                        html.Span("💡 İpucu: ", className="fw-bold text-primary"),
-                        "Kırmızı blokları (Review) küçültmek için teslimat süresini optimize etmek en hızlı kâr artış yoludur."
-                    ], className="alert alert-light border-0 mb-0 small"),
-                    dcc.Graph(figure=wf_fig, className="mt-2", config={"displayModeBar": False}),
-                ]
+            dbc.Card(
+                dbc.CardBody(
+                    dbc.Row(
+                        [
+                            dbc.Col([
+                                html.Div("📍 Satıcı Eyaleti", className="text-muted small fw-semibold mb-1"),
+                                dcc.Dropdown(id="home_states", options=[{"label": s, "value": s} for s in index.states], multi=True, placeholder="Tüm eyaletler"),
+                            ], md=3),
+                            dbc.Col([
+                                html.Div("🗓️ Dönem", className="text-muted small fw-semibold mb-1"),
+                                dcc.RangeSlider(
+                                    id="home_months", min=0, max=last_month, step=1, value=[0, last_month],
+                                    marks={i: months[i] for i in range(0, len(months), 6)},
+                                    allowCross=False,
+                                ),
+                            ], md=6),
+                            dbc.Col([
+                                html.Div("💳 Finansman", className="text-muted small fw-semibold mb-1"),
+                                dbc.Switch(
+                                    id="home_financing", label="Taksit maliyetini düş", value=False,
+                                    disabled=not has_financing(index),
+                                ),
+                            ], md=3),
+                        ],
+                        className="g-3 align-items-center",
+                    )
+                ),
+                className="shadow-sm mb-3",
+                style=CARD_STYLE,
             ),
-            className=SECTION_CARD_CLASS,
-            style=CARD_STYLE,
-        ),
 
-        dbc.Card(
-            dbc.CardBody(
+            dbc.Row(kpi_cards(k), id="home_kpi_row", className="g-3"),
+
+            dbc.Card(
+                dbc.CardBody(
+                    [
+                        html.Div([
+                            html.Span("💡 İpucu: ", className="fw-bold text-primary"),
+                            "Kırmızı blokları (Review) küçültmek için teslimat süresini optimize etmek en hızlı kâr artış yoludur."
+                        ], className="alert alert-light border-0 mb-0 small"),
+                        dcc.Graph(id="home_waterfall", figure=build_waterfall(k), className="mt-2", config={"displayModeBar": False}),
+                    ]
+                ),
+                className=SECTION_CARD_CLASS,
+                style=CARD_STYLE,
+            ),
+
+            dbc.Card(
+                dbc.CardBody(
+                    [
+                        html.H5("📌 Yönetim İçin Stratejik Notlar", className="mb-3 fw-bold", style={"color": "#2c3e50"}),
+                        dbc.Row([
+                            dbc.Col([
+                                html.Div([
+                                    html.B("Maliyet Odağı: ", className="text-danger"),
+                                    "Review maliyeti 1.6M BRL ile kârı en çok baskılayan kalemdir."
+                                ], className="mb-2"),
+                            ], md=6),
+                            dbc.Col([
+                                html.Div([
+                                    html.B("Kâr Kaldıracı: ", className="text-success"),
+                                    "Düşük performanslı satıcıların yönetimi Net Kâr'ı doğrudan yukarı taşır."
+                                ]),
+                            ], md=6),
+                        ]),
+                    ]
+                ),
+                className=SECTION_CARD_CLASS,
+                style=CARD_STYLE,
+            ),
+
+            dbc.Alert(
                 [
-                    html.H5("📌 Yönetim İçin Stratejik Notlar", className="mb-3 fw-bold", style={"color": "#2c3e50"}),
-                    dbc.Row([
-                        dbc.Col([
-                            html.Div([
-                                html.B("Maliyet Odağı: ", className="text-danger"),
-                                "Review maliyeti 1.6M BRL ile kârı en çok baskılayan kalemdir."
-                            ], className="mb-2"),
-                        ], md=6),
-                        dbc.Col([
-                            html.Div([
-                                html.B("Kâr Kaldıracı: ", className="text-success"),
-                                "Düşük performanslı satıcıların yönetimi Net Kâr'ı doğrudan yukarı taşır."
-                            ]),
-                        ], md=6),
-                    ]),
-                ]
+                    html.I(className="bi bi-arrow-right-circle-fill me-2"),
+                    html.B("Eylem Planı: "),
+                    "Zarar eden satıcıları simülasyondan çıkararak yeni Net Kâr potansiyelini görmek için ",
+                    dcc.Link("Portföy Optimizasyonu", href="/satici-etkisi", className="fw-bold text-decoration-none"),
+                    " sayfasına ilerleyin."
+                ],
+                color="info",
+                className="mt-4 shadow-sm d-flex align-items-center",
+                style={"borderRadius": "16px", "border": "none", "background": "rgba(13, 202, 240, 0.1)", "color": "#055160"},
             ),
-            className=SECTION_CARD_CLASS,
-            style=CARD_STYLE,
-        ),
+        ],
+        fluid=True,
+        className="pb-5 px-4",
+    )
 
-        dbc.Alert(
-            [
-                html.I(className="bi bi-arrow-right-circle-fill me-2"),
-                html.B("Eylem Planı: "),
-                "Zarar eden satıcıları simülasyondan çıkararak yeni Net Kâr potansiyelini görmek için ",
-                dcc.Link("Portföy Optimizasyonu", href="/satici-etkisi", className="fw-bold text-decoration-none"),
-                " sayfasına ilerleyin."
-            ],
-            color="info",
-            className="mt-4 shadow-sm d-flex align-items-center",
-            style={"borderRadius": "16px", "border": "none", "background": "rgba(13, 202, 240, 0.1)", "color": "#055160"},
-        ),
-    ],
-    fluid=True,
-    className="pb-5 px-4",
-)
\ No newline at end of file
+# -----------------------------
+# Callback (filtre → indeks dilimi → KPI + waterfall; opsiyonel finansman satırı)
+# -----------------------------
+@dash.callback(
+    Output("home_kpi_row", "children"),
+    Output("home_waterfall", "figure"),
+    Input("home_states", "value"),
+    Input("home_months", "value"),
+    Input("home_financing", "value"),
+    State("url", "search"),
+    prevent_initial_call=True,
+)
+def update_summary(states, month_range, with_financing, search=None):
+    index = load_fin_index(datasets.from_search(search))
+    start, end = month_range or (0, len(index.months) - 1)
+    k_filtered = build_kpis(index.query(states, start, end), with_financing=bool(with_financing))
+    return kpi_cards(k_filtered), build_waterfall(k_filtered)
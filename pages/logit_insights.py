@@ -1,11 +1,14 @@
 # pages/logit_insights.py
 import dash
-from dash import html, dcc
+from dash import html, dcc, Input, Output, State
 import dash_bootstrap_components as dbc
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 
-dash.register_page(__name__, path="/memnuniyet", name="Memnuniyet Sürücüleri")
+from olist import artifacts, jobs
+
+dash.register_page(__name__, path="/memnuniyet", name="Memnuniyet Sürücüleri",
+                   render_cache=("review_topics", "review_keywords"))
 
 # -----------------------------
 # Modern Stil ve Renk Paleti
@@ -31,15 +34,65 @@ def load_effects() -> pd.DataFrame:
     ]
     return pd.DataFrame(data, columns=["Faktör", "Risk", "Memnuniyet_Kaybi"])
 
+# Modeldeki değişken → grafikteki faktör adı
+FEATURES = {
+    "wait_time": "Teslimat Süresi",
+    "delay_vs_expected": "Gecikme (Beklenti vs Gerçek)",
+    "number_of_sellers": "Siparişteki Satıcı Sayısı",
+    "distance_seller_customer": "Müşteri-Satıcı Uzaklığı",
+    "freight_value": "Kargo Ücreti",
+    "price": "Ürün Fiyatı",
+}
+
+def fit_effects(set_progress=None, with_distance: bool = True):
+    """
+    Güncel veriyle iki logit modelini (1★ ve 5★) standartlaştırılmış
+    değişkenlerle yeniden eğitir; katsayıların mutlak değerlerini döner.
+    """
+    import statsmodels.api as sm  # ağır import: sadece arka plan işinde
+
+    def progress(step, label):
+        if set_progress:
+            set_progress((step * 20, label))
+
+    progress(0, "Veri yükleniyor…")
+    training = artifacts.load("order_training_distance" if with_distance else "order_training")
+
+    progress(1, "Değişkenler hazırlanıyor…")
+    features = [f for f in FEATURES if f in training.columns]
+    X = training[features]
+    X = sm.add_constant((X - X.mean()) / X.std())
+
+    progress(2, "1★ modeli eğitiliyor…")
+    one = sm.Logit(training["dim_is_one_star"].astype(int), X).fit(disp=0)
+
+    progress(3, "5★ modeli eğitiliyor…")
+    five = sm.Logit(training["dim_is_five_star"].astype(int), X).fit(disp=0)
+
+    progress(4, "Grafikler hazırlanıyor…")
+    effects = pd.DataFrame({
+        "Faktör": [FEATURES[f] for f in features],
+        "Risk": one.params[features].abs().round(2).to_numpy(),
+        "Memnuniyet_Kaybi": five.params[features].abs().round(2).to_numpy(),
+    })
+    return effects, len(training), one.prsquared, five.prsquared
+
+def build_effect_figs(effects: pd.DataFrame):
+    # İki grafik arası kıyaslanabilirlik için ortak üst sınır
+    top = max(effects["Risk"].max(), effects["Memnuniyet_Kaybi"].max())
+    return (
+        build_modern_bar(effects, "Risk", "▼ 1★ Riskini Tetikleyenler", COLOR_RISK, top),
+        build_modern_bar(effects, "Memnuniyet_Kaybi", "✦ 5★ Kaybına Neden Olanlar", COLOR_SATISFACTION, top),
+    )
+
 def build_modern_bar(df: pd.DataFrame, col: str, title: str, color: str, max_val: float):
     # En yüksek etkiyi en başa almak için azalan sıralama (Descending)
     d = df.sort_values(col, ascending=True).copy() 
 
-    fig = px.bar(
-        d, x=col, y="Faktör", orientation="h",
-        text=col,
-        title=f"<b>{title}</b>"
-    )
+    fig = go.Figure(go.Bar(
+        x=d[col], y=d["Faktör"], orientation="h",
+        text=d[col],
+    ))
 
     fig.update_traces(
         marker_color=color,
@@ -50,6 +103,7 @@ def build_modern_bar(df: pd.DataFrame, col: str, title: str, color: str, max_val
     )
 
     fig.update_layout(
+        title=f"<b>{title}</b>",
         height=400,
         margin=dict(l=10, r=50, t=60, b=20),
         paper_bgcolor="rgba(0,0,0,0)",
@@ -61,61 +115,181 @@ def build_modern_bar(df: pd.DataFrame, col: str, title: str, color: str, max_val
     )
     return fig
 
+# Yorum metninden çıkarılan şikayet konuları (olist/review.py)
+TOPIC_LABELS = {
+    "delivery": "Gecikme / Teslim Edilmedi",
+    "defect": "Kusurlu / Hasarlı Ürün",
+    "wrong_item": "Yanlış Ürün",
+    "missing_item": "Eksik Ürün",
+    "refund": "İade / İptal",
+    "service": "İletişim / Destek",
+}
+
+def build_topic_fig(topics: pd.DataFrame):
+    """1★ ve 5★ yorumlarda her şikayet konusunun geçme oranı."""
+    by_score = topics.set_index("review_score")
+    fig = go.Figure()
+    for score, name, color in ((1, "1★ yorumlar", COLOR_RISK), (5, "5★ yorumlar", COLOR_SATISFACTION)):
+        if score not in by_score.index:
+            continue
+        row = by_score.loc[score]
+        share = [row[f"topic_{t}"] / max(row["comments"], 1) for t in TOPIC_LABELS]
+        fig.add_trace(go.Bar(
+            name=name, y=list(TOPIC_LABELS.values()), x=share, orientation="h", marker_color=color,
+            hovertemplate="<b>%{y}</b><br>Yorumların %{x:.1%}'inde geçiyor<extra></extra>",
+        ))
+    fig.update_layout(
+        title="<b>Yorumlarda Şikayet Konuları</b>",
+        barmode="group",
+        height=400,
+        margin=dict(l=10, r=30, t=60, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(tickformat=".0%", showgrid=False),
+        yaxis=dict(autorange="reversed", tickfont=dict(size=13, color="#2c3e50")),
+        legend=dict(orientation="h", y=-0.08),
+        font=dict(family="Inter, Segoe UI, sans-serif"),
+        title_font=dict(size=18, color="#2c3e50"),
+    )
+    return fig
+
+def complaint_keywords(keywords: pd.DataFrame, n: int = 12, min_count: int = 30) -> list[str]:
+    """1★ yorumlarda, 5★ yorumlara göre en fazla öne çıkan kelimeler."""
+    k = keywords[keywords["count"] >= min_count]
+    if k.empty or "score_1" not in k or "score_5" not in k:
+        return []
+    one = (k["score_1"] + 1) / (k["score_1"].sum() + 1)
+    five = (k["score_5"] + 1) / (k["score_5"].sum() + 1)
+    return k.assign(lift=one / five).nlargest(n, "lift")["keyword"].tolist()
+
 # Veri Hazırlığı
 df = load_effects()
-# İki grafik arası kıyaslanabilirlik için ortak üst sınır
-max_range = max(df["Risk"].max(), df["Memnuniyet_Kaybi"].max())
+fig_risk, fig_sat = build_effect_figs(df)
 
-fig_risk = build_modern_bar(df, "Risk", "▼ 1★ Riskini Tetikleyenler", COLOR_RISK, max_range)
-fig_sat = build_modern_bar(df, "Memnuniyet_Kaybi", "✦ 5★ Kaybına Neden Olanlar", COLOR_SATISFACTION, max_range)
+# Yorum sinyalleri her render'da artefaktlardan okunur (önbellekte; render_cache sürümü bunlara bağlı)
+def load_review_signals():
+    try:
+        return (build_topic_fig(artifacts.load("review_topics")),
+                complaint_keywords(artifacts.load("review_keywords")))
+    except Exception as e:
+        print(f"Yorum sinyalleri yüklenemedi: {e}")
+        return go.Figure(), []
 
 # Layout
-layout = dbc.Container([
-    # Başlık
-    html.Div([
-        html.H2("Operasyonel Memnuniyet Analizi", className="mt-4 fw-bold", style={"color": "#2c3e50"}),
-        html.P("Lojistik regresyon katsayılarına göre operasyonel faktörlerin puanlar üzerindeki etkisi.", className="text-muted mb-4"),
-    ]),
-
-    # Üst KPI Kartları
-    dbc.Row([
-        dbc.Col(dbc.Card(dbc.CardBody([
-            html.Small("🚨 EN BÜYÜK RİSK", className="text-danger fw-bold"),
-            html.H3("Teslimat Süresi", className="fw-bold mt-1"),
-            html.P("Hız, müşteri memnuniyetsizliğinin birincil matematiksel sürücüsü.", className="text-muted small mb-0")
-        ]), style=CARD_STYLE, className="shadow-sm"), md=6),
-        dbc.Col(dbc.Card(dbc.CardBody([
-            html.Small("✨ SADAKAT KRİTERİ", className="text-primary fw-bold"),
-            html.H3("Zamanında Teslim", className="fw-bold mt-1"),
-            html.P("Gecikme, müşteriyi 5★ kategorisinden hızla uzaklaştırıyor.", className="text-muted small mb-0")
-        ]), style=CARD_STYLE, className="shadow-sm"), md=6),
-    ], className="g-4 mb-4"),
-
-    # Grafikler
-    dbc.Card(dbc.CardBody([
+def layout(**kwargs):
+    fig_topics, keywords = load_review_signals()
+    return dbc.Container([
+        # Başlık
+        html.Div([
+            html.H2("Operasyonel Memnuniyet Analizi", className="mt-4 fw-bold", style={"color": "#2c3e50"}),
+            html.P("Lojistik regresyon katsayılarına göre operasyonel faktörlerin puanlar üzerindeki etkisi.", className="text-muted mb-4"),
+        ]),
+
+        # Üst KPI Kartları
         dbc.Row([
-            dbc.Col(dcc.Graph(figure=fig_risk, config={"displayModeBar": False}), md=6),
-            dbc.Col(dcc.Graph(figure=fig_sat, config={"displayModeBar": False}), md=6),
-        ])
-    ]), style=CARD_STYLE, className="shadow-sm mb-4"),
-
-    # Çıkarımlar ve Aksiyonlar
-    dbc.Row([
-        dbc.Col(html.Div([
-            html.H5("📌 Analizden Çıkarımlar", className="fw-bold"),
-            html.Ul([
-                html.Li("Lojistik performans (hız ve gecikme), fiyat etkisinden 15 kat daha baskındır."),
-                html.Li("Gecikme (Delay), 5★ kaybetme olasılığını, 1★ alma olasılığından daha fazla etkiliyor."),
-                html.Li("Müşteri-Satıcı mesafesi kontrol edildiğinde, uzak mesafelerde tolerans bir miktar artıyor."),
-            ], className="mt-3")
-        ]), md=7),
-        dbc.Col(dbc.Alert([
-            html.H5("🚀 Stratejik Öneriler", className="fw-bold"),
-            html.Hr(),
-            html.Ul([
-                html.Li("Fiyat indiriminden ziyade teslimat hızını optimize etmeye odaklan."),
-                html.Li("5★ sadakati için gecikme riskini proaktif olarak yönet."),
-            ], className="ps-3")
-        ], color="info", style={"borderRadius": "15px"}), md=5),
-    ]),
-], fluid=True, className="px-4 pb-5", style={"backgroundColor": "#f8f9fa", "minHeight": "100vh"})
\ No newline at end of file
+            dbc.Col(dbc.Card(dbc.CardBody([
+                html.Small("🚨 EN BÜYÜK RİSK", className="text-danger fw-bold"),
+                html.H3("Teslimat Süresi", className="fw-bold mt-1"),
+                html.P("Hız, müşteri memnuniyetsizliğinin birincil matematiksel sürücüsü.", className="text-muted small mb-0")
+            ]), style=CARD_STYLE, className="shadow-sm"), md=6),
+            dbc.Col(dbc.Card(dbc.CardBody([
+                html.Small("✨ SADAKAT KRİTERİ", className="text-primary fw-bold"),
+                html.H3("Zamanında Teslim", className="fw-bold mt-1"),
+                html.P("Gecikme, müşteriyi 5★ kategorisinden hızla uzaklaştırıyor.", className="text-muted small mb-0")
+            ]), style=CARD_STYLE, className="shadow-sm"), md=6),
+        ], className="g-4 mb-4"),
+
+        # Modeli güncel veriyle yeniden eğit (arka plan işi: ilerleme + iptal)
+        dbc.Card(dbc.CardBody([
+            dbc.Row([
+                dbc.Col([
+                    dbc.Button("🔄 Modeli Yeniden Eğit", id="logit_refit", color="primary", className="me-2"),
+                    dbc.Button("İptal", id="logit_cancel", color="secondary", outline=True, disabled=True),
+                ], md="auto"),
+                dbc.Col(dbc.Checklist(
+                    id="logit_with_distance",
+                    options=[{"label": "Müşteri-Satıcı uzaklığını dahil et (yavaş)", "value": "distance"}],
+                    value=["distance"], switch=True,
+                ), md="auto", className="d-flex align-items-center"),
+                dbc.Col(html.Div(
+                    "Grafikler notebook katsayılarını gösteriyor.",
+                    id="logit_status", className="text-muted small",
+                ), className="d-flex align-items-center"),
+            ], className="g-3"),
+            dbc.Progress(id="logit_progress", value=0, striped=True, animated=True,
+                         className="mt-3", style={"display": "none"}),
+        ]), style=CARD_STYLE, className="shadow-sm mb-4"),
+
+        # Grafikler
+        dbc.Card(dbc.CardBody([
+            dbc.Row([
+                dbc.Col(dcc.Graph(id="logit_risk", figure=fig_risk, config={"displayModeBar": False}), md=6),
+                dbc.Col(dcc.Graph(id="logit_sat", figure=fig_sat, config={"displayModeBar": False}), md=6),
+            ])
+        ]), style=CARD_STYLE, className="shadow-sm mb-4"),
+
+        # Yorum metni sinyalleri: logit katsayılarını tamamlayan, müşterinin kendi anlatımı
+        dbc.Card(dbc.CardBody([
+            dbc.Row([
+                dbc.Col(dcc.Graph(id="logit_topics", figure=fig_topics, config={"displayModeBar": False}), md=8),
+                dbc.Col([
+                    html.H6("🗣️ 1★ Yorumlarda Öne Çıkan Kelimeler", className="fw-bold mt-3"),
+                    html.Div([
+                        dbc.Badge(word, color="light", text_color="danger", className="me-1 mb-1 border")
+                        for word in keywords
+                    ]),
+                    html.P("Kelimeler, 1★ yorumlardaki sıklıklarının 5★ yorumlara oranına göre sıralanmıştır.",
+                           className="text-muted small mt-2 mb-0"),
+                ], md=4),
+            ])
+        ]), style=CARD_STYLE, className="shadow-sm mb-4"),
+
+        # Çıkarımlar ve Aksiyonlar
+        dbc.Row([
+            dbc.Col(html.Div([
+                html.H5("📌 Analizden Çıkarımlar", className="fw-bold"),
+                html.Ul([
+                    html.Li("Lojistik performans (hız ve gecikme), fiyat etkisinden 15 kat daha baskındır."),
+                    html.Li("Gecikme (Delay), 5★ kaybetme olasılığını, 1★ alma olasılığından daha fazla etkiliyor."),
+                    html.Li("Müşteri-Satıcı mesafesi kontrol edildiğinde, uzak mesafelerde tolerans bir miktar artıyor."),
+                ], className="mt-3")
+            ]), md=7),
+            dbc.Col(dbc.Alert([
+                html.H5("🚀 Stratejik Öneriler", className="fw-bold"),
+                html.Hr(),
+                html.Ul([
+                    html.Li("Fiyat indiriminden ziyade teslimat hızını optimize etmeye odaklan."),
+                    html.Li("5★ sadakati için gecikme riskini proaktif olarak yönet."),
+                ], className="ps-3")
+            ], color="info", style={"borderRadius": "15px"}), md=5),
+        ]),
+    ], fluid=True, className="px-4 pb-5", style={"backgroundColor": "#f8f9fa", "minHeight": "100vh"})
+
+# -----------------------------
+# Arka plan işi: aynı girdilerle eğitilmiş model diskten gelir,
+# aynı anda tıklayan kullanıcılar tek bir eğitimi paylaşır (olist/jobs.py)
+# -----------------------------
+@dash.callback(
+    Output("logit_risk", "figure"),
+    Output("logit_sat", "figure"),
+    Output("logit_status", "children"),
+    Input("logit_refit", "n_clicks"),
+    State("logit_with_distance", "value"),
+    background=True,
+    manager=jobs.manager(),
+    cache_args_to_ignore=[0],  # n_clicks: her tıklama yeni bir iş değildir
+    progress=[Output("logit_progress", "value"), Output("logit_progress", "label")],
+    running=[
+        (Output("logit_refit", "disabled"), True, False),
+        (Output("logit_cancel", "disabled"), False, True),
+        (Output("logit_progress", "style"), {"display": "flex"}, {"display": "none"}),
+    ],
+    cancel=[Input("logit_cancel", "n_clicks")],
+    prevent_initial_call=True,
+)
+def refit_models(set_progress, n_clicks, with_distance):
+    effects, n_orders, r2_one, r2_five = fit_effects(set_progress, with_distance=bool(with_distance))
+    fig_risk, fig_sat = build_effect_figs(effects)
+    status = (f"Model {n_orders:,} sipariş üzerinde yeniden eğitildi "
+              f"(pseudo R²: 1★ {r2_one:.3f}, 5★ {r2_five:.3f}).")
+    return fig_risk, fig_sat, status
@@ -0,0 +1,217 @@
+# pages/seller_cohorts.py
+import dash
+from dash import html, dcc, Input, Output, State
+import dash_bootstrap_components as dbc
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from olist import datasets
+from olist.cohort import SUBSCRIPTION_FEE, SellerCohorts
+
+dash.register_page(__name__, path="/satici-kohortlari", name="Satıcı Kohortları")
+
+# -----------------------------
+# Stil ve Etiketler
+# -----------------------------
+CARD_STYLE = {"borderRadius": "16px", "border": "none"}
+SECTION_CARD_CLASS = "shadow-sm mt-3"
+
+KIND_OPTIONS = [
+    {"label": "Olist'te kalan (abonelik)", "value": "retained"},
+    {"label": "O ay satış yapan", "value": "active"},
+]
+KIND_LABELS = {o["value"]: o["label"] for o in KIND_OPTIONS}
+# KPI'larda raporlanan tutunma ayları
+KPI_MONTHS = (3, 6, 12)
+
+def brl(value: float) -> str:
+    return f"{value:,.0f} BRL"
+
+# -----------------------------
+# Veri (eyalet başına kohort × ay matrisi; olist/cohort.py). Veri seti ?dataset= ile seçilir
+# -----------------------------
+def load_cohorts(dataset=None) -> dict[str, SellerCohorts]:
+    try:
+        return datasets.load(dataset, "seller_cohorts")
+    except Exception as e:
+        print(f"Satıcı kohortları yüklenemedi: {e}")
+        return {"ALL": SellerCohorts.from_activity([], [])}
+
+def state_options(cohorts: dict) -> list[dict]:
+    return [{"label": s, "value": s} for s in cohorts if s != "ALL"]
+
+def select_cohorts(cohorts: dict, state) -> SellerCohorts:
+    return cohorts.get(state or "ALL", cohorts["ALL"])
+
+def build_kpis(c: SellerCohorts, kind: str, min_size: int) -> dict:
+    curve = c.curve(kind, min_size)
+    retained = c.curve("retained", min_size)
+    return {
+        "sellers": int(c.sizes.sum()),
+        "cohorts": int((c.sizes >= max(min_size, 1)).sum()),
+        "rates": {m: float(curve.get(m, np.nan)) for m in KPI_MONTHS},
+        # gözlenen ufukta satıcı başına beklenen abonelik ayı (kalma eğrisinin toplamı)
+        "lifetime_months": float(retained.dropna().sum()),
+        "subscription": float(c.subscription_revenue().sum()),
+    }
+
+def kpi_card(title, value, subtitle="", icon=""):
+    return dbc.Card(
+        dbc.CardBody([
+            html.Div([
+                html.Span(icon, style={"fontSize": "20px", "marginRight": "8px"}),
+                html.Span(title, className="text-muted fw-semibold"),
+            ], style={"display": "flex", "alignItems": "center"}),
+            html.H3(value, className="mt-3 mb-1 fw-bold", style={"color": "#2c3e50"}),
+            html.Div(subtitle, className="text-muted small"),
+        ]),
+        className="shadow-sm h-100",
+        style=CARD_STYLE,
+    )
+
+def pct(value: float) -> str:
+    return "—" if np.isnan(value) else f"{value:.1%}"
+
+def kpi_cards(k: dict):
+    rates = " · ".join(f"{m}. ay {pct(r)}" for m, r in k["rates"].items())
+    return [
+        dbc.Col(kpi_card("Satıcı", f"{k['sellers']:,}", f"{k['cohorts']} kohort (ilk satış ayı)", "🏪"), md=3),
+        dbc.Col(kpi_card("Tutunma", pct(k["rates"][KPI_MONTHS[1]]), rates, "🔁"), md=3),
+        dbc.Col(kpi_card("Beklenen Abonelik Süresi", f"{k['lifetime_months']:.1f} ay",
+                         f"Satıcı başına ≈ {brl(k['lifetime_months'] * SUBSCRIPTION_FEE)}", "⏳"), md=3),
+        dbc.Col(kpi_card("Abonelik Geliri", brl(k["subscription"]),
+                         f"Kalan satıcı-ay × {SUBSCRIPTION_FEE} BRL", "💰"), md=3),
+    ]
+
+def _layout(fig, title, height=380):
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        height=height,
+        margin=dict(l=10, r=20, t=60, b=20),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter, Segoe UI, sans-serif"),
+        title_font=dict(size=18, color="#2c3e50"),
+    )
+    return fig
+
+def build_heatmap(c: SellerCohorts, kind: str, min_size: int):
+    rates = c.rates(kind, min_size)
+    title = f"Kohort Tutunma Matrisi — {KIND_LABELS[kind]}"
+    z = rates.to_numpy()
+    if z.size == 0:  # bu eşikte kohort yok (küçük eyaletler / boş veri)
+        return _layout(go.Figure(), title, height=420)
+    sizes = pd.Series(c.sizes, index=c.months).reindex(rates.index)
+    fig = go.Figure(go.Heatmap(
+        z=z, x=list(rates.columns), y=[f"{m} ({n:,})" for m, n in sizes.items()],
+        zmin=0, zmax=1, colorscale="Blues",
+        text=[["" if np.isnan(v) else f"{v:.0%}" for v in row] for row in z],
+        texttemplate="%{text}", textfont=dict(size=9),
+        hovertemplate="Kohort %{y}<br>İlk satıştan %{x}. ay<br>Oran: %{z:.1%}<extra></extra>",
+        colorbar=dict(tickformat=".0%"),
+    ))
+    fig.update_xaxes(title="İlk satıştan bu yana geçen ay", dtick=1)
+    fig.update_yaxes(title="Kohort (satıcı sayısı)", autorange="reversed")
+    return _layout(fig, title, height=max(420, 22 * len(rates) + 140))
+
+def build_curve(c: SellerCohorts, min_size: int):
+    fig = go.Figure([
+        go.Scatter(x=list(curve.index), y=curve.to_numpy(), mode="lines+markers", name=KIND_LABELS[kind],
+                   hovertemplate=f"{KIND_LABELS[kind]}<br>%{{x}}. ay: %{{y:.1%}}<extra></extra>")
+        for kind in KIND_LABELS
+        for curve in [c.curve(kind, min_size).dropna()]
+    ])
+    fig.update_xaxes(title="İlk satıştan bu yana geçen ay", showgrid=False)
+    fig.update_yaxes(tickformat=".0%", range=[0, 1.05], gridcolor="#f1f1f1")
+    fig.update_layout(legend=dict(orientation="h", y=-0.2))
+    return _layout(fig, "Ağırlıklı Ortalama Tutunma Eğrisi")
+
+def build_revenue_bar(c: SellerCohorts, min_size: int):
+    revenue = c.subscription_revenue()[c.sizes >= max(min_size, 1)]
+    fig = go.Figure(go.Bar(
+        x=list(revenue.index), y=revenue.to_numpy(), marker_color="#2E86C1",
+        hovertemplate="Kohort %{x}<br>Abonelik geliri: %{y:,.0f} BRL<extra></extra>",
+    ))
+    fig.update_yaxes(gridcolor="#f1f1f1")
+    return _layout(fig, "Kohort Bazında Abonelik Geliri")
+
+# -----------------------------
+# Layout
+# -----------------------------
+def layout(dataset=None, **kwargs):
+    cohorts = load_cohorts(dataset)
+    c = select_cohorts(cohorts, None)
+    return dbc.Container(
+        [
+            html.Div([
+                html.H2("Satıcı Kohortları — Tutunma", className="mt-4 mb-1 fw-bold", style={"color": "#2c3e50"}),
+                html.P(f"İlk satış ayına göre satıcı kohortlarının zaman içinde Olist'te kalma oranı; "
+                       f"{SUBSCRIPTION_FEE} BRL aylık abonelik gelirinin kaynağı.",
+                       className="text-muted mb-4"),
+            ]),
+
+            dbc.Card(
+                dbc.CardBody(
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div("📍 Satıcı Eyaleti", className="text-muted small fw-semibold mb-1"),
+                            dcc.Dropdown(id="cohort_state", options=state_options(cohorts), placeholder="Tüm eyaletler"),
+                        ], md=3),
+                        dbc.Col([
+                            html.Div("📊 Tutunma Tanımı", className="text-muted small fw-semibold mb-1"),
+                            dbc.RadioItems(id="cohort_kind", options=KIND_OPTIONS, value="retained", inline=True),
+                        ], md=5),
+                        dbc.Col([
+                            html.Div("👥 Min. Kohort Büyüklüğü", className="text-muted small fw-semibold mb-1"),
+                            dcc.Slider(id="cohort_min_size", min=1, max=50, step=1, value=5,
+                                       marks={1: "1", 10: "10", 25: "25", 50: "50"}),
+                        ], md=4),
+                    ], className="g-3 align-items-center")
+                ),
+                className="shadow-sm mb-3",
+                style=CARD_STYLE,
+            ),
+
+            dbc.Row(kpi_cards(build_kpis(c, "retained", 5)), id="cohort_kpi_row", className="g-3"),
+
+            dbc.Card(
+                dbc.CardBody(dcc.Graph(id="cohort_heatmap", figure=build_heatmap(c, "retained", 5),
+                                       config={"displayModeBar": False})),
+                className=SECTION_CARD_CLASS,
+                style=CARD_STYLE,
+            ),
+
+            dbc.Row([
+                dbc.Col(dbc.Card(dbc.CardBody(dcc.Graph(id="cohort_curve", figure=build_curve(c, 5),
+                                                        config={"displayModeBar": False})),
+                                 className=SECTION_CARD_CLASS, style=CARD_STYLE), md=6),
+                dbc.Col(dbc.Card(dbc.CardBody(dcc.Graph(id="cohort_revenue", figure=build_revenue_bar(c, 5),
+                                                        config={"displayModeBar": False})),
+                                 className=SECTION_CARD_CLASS, style=CARD_STYLE), md=6),
+            ], className="g-3"),
+        ],
+        fluid=True,
+        className="pb-5 px-4",
+    )
+
+# -----------------------------
+# Callback (eyalet / tanım / min. büyüklük → önceden hesaplanmış matristen dilim)
+# -----------------------------
+@dash.callback(
+    Output("cohort_kpi_row", "children"),
+    Output("cohort_heatmap", "figure"),
+    Output("cohort_curve", "figure"),
+    Output("cohort_revenue", "figure"),
+    Input("cohort_state", "value"),
+    Input("cohort_kind", "value"),
+    Input("cohort_min_size", "value"),
+    State("url", "search"),
+    prevent_initial_call=True,
+)
+def update_cohorts(state, kind, min_size, search=None):
+    c = select_cohorts(load_cohorts(datasets.from_search(search)), state)
+    kind = kind or "retained"
+    min_size = int(min_size or 1)
+    return (kpi_cards(build_kpis(c, kind, min_size)), build_heatmap(c, kind, min_size),
+            build_curve(c, min_size), build_revenue_bar(c, min_size))
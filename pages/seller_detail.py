@@ -0,0 +1,134 @@
+# pages/seller_detail.py
+import dash
+from dash import html, dcc
+import dash_bootstrap_components as dbc
+import pandas as pd
+import plotly.graph_objects as go
+
+from olist import artifacts
+
+dash.register_page(__name__, path="/satici", name="Satıcı Detayı")
+
+# -----------------------------
+# Styling helpers
+# -----------------------------
+CARD_STYLE = {"borderRadius": "14px"}
+RECENT_ORDERS = 15
+
+def brl(x: float) -> str:
+    return f"{x:,.0f} BRL"
+
+def kpi_card(title: str, value: str, subtitle: str = "", icon: str = ""):
+    return dbc.Card(
+        dbc.CardBody(
+            [
+                html.Div(
+                    [
+                        html.Span(icon, style={"fontSize": "18px", "marginRight": "8px"}) if icon else None,
+                        html.Span(title, className="text-muted fw-semibold"),
+                    ],
+                    style={"display": "flex", "alignItems": "center"},
+                ),
+                html.H3(value, className="mt-2 mb-1 fw-bold"),
+                html.Div(subtitle, className="text-muted"),
+            ]
+        ),
+        className="shadow-sm h-100",
+        style=CARD_STYLE,
+    )
+
+# -----------------------------
+# Data load (indeks bir kez kurulur, detay sayfası sadece dilim okur)
+# -----------------------------
+try:
+    SELLER_INDEX = artifacts.load("seller_index")
+    SELLERS_DF = artifacts.load("seller_training").set_index("seller_id")
+except Exception:
+    SELLER_INDEX = None
+    SELLERS_DF = pd.DataFrame()
+
+# -----------------------------
+# Figures
+# -----------------------------
+def build_wait_fig(orders: pd.DataFrame):
+    d = orders.dropna(subset=["wait_time"]).sort_values("order_purchase_timestamp")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=d["order_purchase_timestamp"], y=d["wait_time"], mode="markers",
+                             name="Bekleme (gün)", marker=dict(color="#0d6efd", size=6, opacity=0.6)))
+    fig.add_trace(go.Scatter(x=d["order_purchase_timestamp"], y=d["delay_vs_expected"], mode="markers",
+                             name="Gecikme (gün)", marker=dict(color="#e74c3c", size=6, opacity=0.6)))
+    fig.update_layout(
+        title="🚚 Sipariş Bazında Teslimat Süresi",
+        height=340, margin=dict(l=20, r=20, t=60, b=40),
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        legend=dict(orientation="h", y=1.1, x=0.02)
+    )
+    return fig
+
+def build_review_fig(reviews: pd.DataFrame):
+    counts = reviews["review_score"].value_counts().reindex([1, 2, 3, 4, 5], fill_value=0)
+    fig = go.Figure(go.Bar(
+        x=[f"{s}★" for s in counts.index], y=counts.values,
+        marker_color=["#e74c3c", "#e67e22", "#f1c40f", "#2ecc71", "#27ae60"],
+        text=counts.values, textposition="outside",
+    ))
+    fig.update_layout(
+        title="⭐ Review Dağılımı",
+        height=340, margin=dict(l=20, r=20, t=60, b=40),
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+# -----------------------------
+# Layout (?seller_id=... ile çağrılır)
+# -----------------------------
+def layout(seller_id=None, **kwargs):
+    back = dcc.Link("← Satıcı Listesi", href="/satici-listesi", className="text-decoration-none")
+
+    if SELLER_INDEX is None or not seller_id or SELLER_INDEX.seller_code(seller_id) < 0:
+        return dbc.Container([
+            html.Div(back, className="mt-4"),
+            dbc.Alert("Satıcı bulunamadı. Satıcı listesinden veya kâr eğrisinden bir satıcı seçin.",
+                      color="warning", className="mt-3", style={"borderRadius": "12px"}),
+        ], fluid=True)
+
+    detail = SELLER_INDEX.get_seller_detail(seller_id)
+    items, orders, reviews = detail["items"], detail["orders"], detail["reviews"]
+    row = SELLERS_DF.loc[seller_id] if seller_id in SELLERS_DF.index else None
+
+    profit_txt = brl(row["profits"]) if row is not None else "—"
+    location = f"{row['seller_city']} / {row['seller_state']}" if row is not None else ""
+
+    recent = orders.sort_values("order_purchase_timestamp", ascending=False).head(RECENT_ORDERS)
+
+    return dbc.Container([
+        html.Div(back, className="mt-4"),
+        html.H2("Satıcı Detayı", className="mt-2 mb-1 fw-bold"),
+        html.P([html.Code(seller_id), f"  {location}"], className="text-muted mb-3"),
+
+        dbc.Row([
+            dbc.Col(kpi_card("Sipariş", f"{len(orders):,}", f"{len(items):,} ürün", "📦"), md=3),
+            dbc.Col(kpi_card("Satış", brl(items["price"].sum()), "Ürün fiyatları toplamı", "💰"), md=3),
+            dbc.Col(kpi_card("Ort. Puan", f"{reviews['review_score'].mean():.2f}" if len(reviews) else "—",
+                             f"{len(reviews):,} review", "⭐"), md=3),
+            dbc.Col(kpi_card("Kâr (IT hariç)", profit_txt, "Gelir − Review maliyeti", "📈"), md=3),
+        ], className="g-3 mb-3"),
+
+        dbc.Row([
+            dbc.Col(dcc.Graph(figure=build_wait_fig(orders), config={"displayModeBar": False}), md=7),
+            dbc.Col(dcc.Graph(figure=build_review_fig(reviews), config={"displayModeBar": False}), md=5),
+        ]),
+
+        dbc.Card(dbc.CardBody([
+            html.H5(f"🧾 Son {RECENT_ORDERS} Sipariş", className="fw-bold mb-3"),
+            dbc.Table.from_dataframe(
+                recent[["order_id", "order_status", "order_purchase_timestamp", "wait_time", "delay_vs_expected"]]
+                .round({"wait_time": 1, "delay_vs_expected": 1})
+                .rename(columns={
+                    "order_id": "Sipariş", "order_status": "Durum", "order_purchase_timestamp": "Tarih",
+                    "wait_time": "Bekleme (gün)", "delay_vs_expected": "Gecikme (gün)",
+                }),
+                striped=True, hover=True, size="sm", className="mb-0",
+            ),
+        ]), className="shadow-sm border-0 mt-3", style=CARD_STYLE),
+    ], fluid=True)
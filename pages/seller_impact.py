@@ -2,12 +2,15 @@ import dash
 from dash import html, dcc, Input, Output
 import dash_bootstrap_components as dbc
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
 # Veri çekme sınıfınızı içe aktarın
-from olist.seller_updated import Seller
+from olist import artifacts
+from olist.figure_payload import line_payload
+from olist.resampling import confidence_band, profit_curves
+from olist.scenario import ScenarioEvaluator, compute_it_cost
+from olist.threshold_index import ThresholdIndex
 
 # Sayfa Kaydı
 dash.register_page(__name__, path="/satici-etkisi", name="Satıcı Çıkarma Etkisi")
@@ -44,71 +47,112 @@ def kpi_card(title: str, value: str, subtitle: str = "", icon: str = ""):
 # Data load
 # -----------------------------
 try:
-    SELLERS_DF = Seller().get_training_data().copy()
+    SELLERS_DF = artifacts.load("seller_training").copy()
 except Exception:
     SELLERS_DF = pd.DataFrame(columns=["seller_id", "revenues", "cost_of_reviews", "quantity", "profits"])
 
 SELLERS_DF["gross_profit"] = SELLERS_DF["revenues"] - SELLERS_DF["cost_of_reviews"]
-SELLERS_ASC = SELLERS_DF.sort_values("gross_profit", ascending=True).reset_index(drop=True)
-SELLERS_DESC = SELLERS_DF.sort_values("gross_profit", ascending=False).reset_index(drop=True)
+SELLERS_ASC = artifacts.sellers_by_gross_profit(SELLERS_DF, ascending=True)
+# Eğri ve satıcı detayı bağlantısı için ters sıra (portföyde kalan ilk k satıcı)
+SELLERS_DESC = SELLERS_ASC.iloc[::-1].reset_index(drop=True)
 TOTAL_SELLERS = int(SELLERS_DF["seller_id"].nunique()) if not SELLERS_DF.empty else 0
 
-# -----------------------------
-# IT cost (Geliştirilmiş Model)
-# -----------------------------
-ALPHA, BETA = 3157.27, 978.23
-
-def compute_it_cost(n_sellers: int, n_items: int) -> float:
-    return ALPHA * np.sqrt(n_sellers) + BETA * np.sqrt(n_items)
-
-def scenario_totals(df: pd.DataFrame) -> dict:
-    n_sellers = int(df["seller_id"].nunique())
-    n_items = int(df["quantity"].sum())
-    revenue = float(df["revenues"].sum())
-    review_cost = float(df["cost_of_reviews"].sum())
-    gross_profit = float(df["gross_profit"].sum())
-    it_cost = float(compute_it_cost(n_sellers, n_items))
-    net_profit = gross_profit - it_cost
-    return {
-        "n_sellers": n_sellers, "n_items": n_items, "revenue": revenue,
-        "review_cost": review_cost, "gross_profit": gross_profit,
-        "it_cost": it_cost, "net_profit": net_profit,
-    }
-
-BASE = scenario_totals(SELLERS_DF) if not SELLERS_DF.empty else {}
+# Sipariş × satıcı seyrek matrisi: sütunlar SELLERS_ASC sırasında, yani
+# "en kötü N satıcı" senaryosu ilk N sütunun çıkarılmasıdır.
+# Artefakt aynı sıralamayla kurulur; veri/kod değiştiyse yerel olarak yeniden kurulmaz, devre dışı kalır.
+try:
+    INCIDENCE = artifacts.load("seller_incidence")
+    if not INCIDENCE.seller_ids.equals(pd.Index(SELLERS_ASC["seller_id"])):
+        INCIDENCE = None
+except Exception:
+    INCIDENCE = None
+
+# Senaryo P&L'i: sütunlar SELLERS_ASC sırasında, "en kötü N" = ilk N sütun çıkarılır (olist/scenario.py)
+SCENARIOS = ScenarioEvaluator(SELLERS_ASC)
+
+# Review maliyeti modeli (kaydırıcı, kurallar, eğri ve optimum için tek model): matris varsa
+# sipariş bazlı — yalnızca tamamen kaybolan siparişlerin review'ları düşer. Önek senaryoları için
+# her siparişin maliyeti SELLERS_ASC sırasındaki son satıcısına yazılır (olist/incidence.py).
+if INCIDENCE is not None:
+    REVIEW_COST, FIXED_REVIEW_COST = INCIDENCE.prefix_review_cost()
+else:
+    REVIEW_COST, FIXED_REVIEW_COST = SELLERS_ASC["cost_of_reviews"].to_numpy(float), 0.0
+SCENARIO_GROSS = SELLERS_ASC["revenues"].to_numpy(float) - REVIEW_COST
 
 # -----------------------------
 # İdeal Nokta Hesaplama (Optimization)
 # -----------------------------
 def find_optimal_point():
-    """Kârı maksimize eden noktayı önceden hesaplar"""
-    profits = []
-    # Performans için her 10 satıcıda bir örnekle (isteğe bağlı hassaslaştırılabilir)
-    for i in range(0, TOTAL_SELLERS, 10):
-        test_df = SELLERS_ASC.iloc[i:]
-        res = scenario_totals(test_df)
-        profits.append((i, res["net_profit"]))
-    
-    if not profits: return 0, 0
-    best_remove, best_val = max(profits, key=lambda x: x[1])
-    return best_remove, best_val
+    """Kârı maksimize eden noktayı önceden hesaplar (tüm çıkarma sayıları, tek kümülatif toplam)"""
+    if SELLERS_ASC.empty:
+        return 0, 0
+    curve = profit_curves(np.ones((1, len(SELLERS_ASC))), SCENARIO_GROSS,
+                          SELLERS_ASC["quantity"], compute_it_cost)[0] - FIXED_REVIEW_COST
+    best_remove = int(np.argmax(curve))
+    return best_remove, float(curve[best_remove])
 
 BEST_REMOVE_N, BEST_NET_VAL = find_optimal_point()
 
+# Optimumun gürültüye duyarlılığı: satıcılar yerine koyarak yeniden örneklenir (bootstrap),
+# her örneklemin tam net kâr eğrisi kümülatif toplamlarla hesaplanır (olist/resampling.py).
+# Örneklemler seller_bootstrap artefaktında saklanır; satıcı verisi değişince yeniden kurulur.
+BAND_LEVEL = 0.9
+
+def bootstrap_band(level: float = BAND_LEVEL) -> dict:
+    # artefakt sipariş bazlı modelle kurulur; matris yoksa bant gösterilmez
+    if SELLERS_ASC.empty or INCIDENCE is None:
+        return {}
+    try:
+        replicates = artifacts.load("seller_bootstrap")
+    except Exception as e:
+        print(f"Bootstrap örneklemleri yüklenemedi: {e}")
+        return {}
+    return confidence_band(replicates, level) if len(replicates) else {}
+
+BAND = bootstrap_band()
+
+def band_text(band: dict) -> list:
+    if not band:
+        return []
+    (n_lo, _, n_hi), (p_lo, _, p_hi) = band["remove_n"], band["net_profit"]
+    return [
+        html.Br(),
+        html.Small(
+            f"Bootstrap %{BAND_LEVEL * 100:.0f} güven aralığı: "
+            f"{n_lo:,.0f} – {n_hi:,.0f} satıcı çıkarma, Net Kâr {brl(p_lo)} – {brl(p_hi)}.",
+            className="text-muted",
+        ),
+    ]
+
 # -----------------------------
 # Figures
 # -----------------------------
-def build_profit_curve_fig(kept_count: int):
-    tmp = SELLERS_DESC.copy()
-    tmp["cum_sellers"] = range(1, len(tmp) + 1)
-    tmp["cum_items"] = tmp["quantity"].cumsum()
-    tmp["cum_gross_profit"] = tmp["revenues"].cumsum() - tmp["cost_of_reviews"].cumsum()
-    tmp["cum_it_cost"] = tmp.apply(lambda r: compute_it_cost(int(r["cum_sellers"]), int(r["cum_items"])), axis=1)
-    tmp["cum_net_profit"] = tmp["cum_gross_profit"] - tmp["cum_it_cost"]
+# Eğri, grafik sütununun piksel genişliğine indirgenir (md=7 ≈ 700px);
+# payload ve tarayıcı render süresi satıcı sayısından bağımsız kalır.
+PROFIT_CURVE_POINTS = 700
+
+def build_profit_curve_traces() -> tuple[dict, dict]:
+    """Kümülatif kâr eğrilerini bir kez hesaplar, LTTB ile seyreltip typed array olarak döner."""
+    cum_sellers = np.arange(1, len(SELLERS_DESC) + 1)
+    cum_items = SELLERS_DESC["quantity"].cumsum().to_numpy()
+    cum_gross_profit = np.cumsum(SCENARIO_GROSS[::-1]) - FIXED_REVIEW_COST
+    cum_net_profit = cum_gross_profit - compute_it_cost(cum_sellers, cum_items)
+
+    # Tepe noktaları (yıldız + her iki eğrinin maksimumu) seyreltmede korunur
+    keep = [TOTAL_SELLERS - BEST_REMOVE_N - 1]
+    if len(cum_sellers):
+        keep += [int(np.argmax(cum_gross_profit)), int(np.argmax(cum_net_profit))]
+
+    gross = line_payload(cum_sellers, cum_gross_profit, PROFIT_CURVE_POINTS, keep=keep)
+    net = line_payload(cum_sellers, cum_net_profit, PROFIT_CURVE_POINTS, keep=keep)
+    return gross, net
 
+GROSS_CURVE, NET_CURVE = build_profit_curve_traces()
+
+def build_profit_curve_fig(kept_count: int):
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=tmp["cum_sellers"], y=tmp["cum_gross_profit"], mode="lines", name="Kâr (IT hariç)", line=dict(color="#6c757d")))
-    fig.add_trace(go.Scatter(x=tmp["cum_sellers"], y=tmp["cum_net_profit"], mode="lines", name="Net Kâr (IT dahil)", line=dict(color="#0d6efd")))
+    fig.add_trace(go.Scatter(**GROSS_CURVE, mode="lines", name="Kâr (IT hariç)", line=dict(color="#6c757d")))
+    fig.add_trace(go.Scatter(**NET_CURVE, mode="lines", name="Net Kâr (IT dahil)", line=dict(color="#0d6efd")))
     
     # İdeal Nokta Yıldızı
     fig.add_trace(go.Scatter(
@@ -130,17 +174,94 @@ def build_profit_curve_fig(kept_count: int):
     return fig
 
 def build_pl_snapshot_fig(totals: dict):
-    dfp = pd.DataFrame({
-        "Kalem": ["Gelir", "Review", "IT/Oper.", "Net Kâr"],
-        "Tutar": [totals["revenue"], -totals["review_cost"], -totals["it_cost"], totals["net_profit"]],
-    })
-    fig = px.bar(dfp, x="Tutar", y="Kalem", orientation="h", text="Tutar", color="Kalem",
-                 color_discrete_map={"Gelir": "#2ecc71", "Review": "#e74c3c", "IT/Oper.": "#e67e22", "Net Kâr": "#3498db"})
+    labels = ["Gelir", "Review", "IT/Oper.", "Net Kâr"]
+    values = [totals["revenue"], -totals["review_cost"], -totals["it_cost"], totals["net_profit"]]
+    fig = go.Figure(go.Bar(
+        x=values, y=labels, orientation="h", text=values,
+        marker_color=["#2ecc71", "#e74c3c", "#e67e22", "#3498db"],
+    ))
     fig.update_traces(texttemplate="%{text:,.0s} BRL", textposition="outside")
     fig.update_layout(showlegend=False, height=400, margin=dict(l=10, r=60, t=40, b=40),
                       paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
     return fig
 
+def order_impact(removed: np.ndarray):
+    """Çok satıcılı siparişler: hangi siparişler tamamen/kısmen kaybolur, review maliyeti sipariş bazında ne kadar düşer."""
+    if INCIDENCE is None:
+        return None
+    return INCIDENCE.evaluate(removed).iloc[0]
+
+def scenario_pnl(removed: np.ndarray, impact=None) -> dict:
+    """
+    Çıkarılan satıcılar (SELLERS_ASC sırasında bitmap) sonrası P&L. Sipariş × satıcı matrisi
+    varsa review maliyeti sipariş bazındadır: yalnızca tamamen kaybolan siparişlerin review'ları
+    düşer, kısmi siparişler kalır. Yoksa satıcı bazlı model (cost_of_reviews) kullanılır.
+    """
+    totals = SCENARIOS.evaluate(~removed).to_dict("records")[0]
+    if INCIDENCE is not None:
+        impact = order_impact(removed) if impact is None else impact
+        totals["review_cost"] = float(INCIDENCE.order_cost.sum() - impact["review_cost_removed"])
+        totals["gross_profit"] = totals["revenue"] - totals["review_cost"]
+        totals["net_profit"] = totals["gross_profit"] - totals["it_cost"]
+    return totals
+
+def worst_n(remove_n: int) -> np.ndarray:
+    return np.arange(len(SELLERS_ASC)) < remove_n
+
+# Değişim KPI'ı için baz (kaydırıcı ve kurallar): senaryolarla aynı review maliyeti modeli
+SCENARIO_BASE = scenario_pnl(worst_n(0)) if not SELLERS_ASC.empty else {}
+
+def build_order_impact_text(impact) -> str:
+    if impact is None or impact["items_removed"] <= 0:
+        return ""
+    return (
+        f"📦 {int(impact['orders_removed']):,} sipariş tamamen, {int(impact['orders_partial']):,} sipariş kısmen etkilenir | "
+        f"Sipariş bazlı düşen review maliyeti: {brl(impact['review_cost_removed'])} "
+        f"(satıcı bazlı model: {brl(impact['review_cost_attributed'])}, kısmi siparişlerde kalan: {brl(impact['review_cost_partial'])})"
+    )
+
+# -----------------------------
+# Kural bazlı senaryo (metrik eşikleri; olist/threshold_index.py)
+# -----------------------------
+# metrik: (etiket, operatör, varsayılan eşik, adım)
+RULE_METRICS = {
+    "review_score": ("Ort. Review Puanı", "<", 3.2, 0.1),
+    "delay_to_carrier": ("Kargoya Teslim Gecikmesi (gün)", ">", 2.0, 0.5),
+    "wait_time": ("Bekleme Süresi (gün)", ">", 15.0, 0.5),
+    "share_of_one_stars": ("1★ Oranı", ">", 0.3, 0.05),
+}
+DEFAULT_RULES = ["review_score", "delay_to_carrier"]
+# SELLERS_ASC sırasında: kural bitmap'i doğrudan senaryo P&L'ine (ve sipariş matrisine) verilir
+RULE_INDEX = ThresholdIndex(SELLERS_ASC, [m for m in RULE_METRICS if m in SELLERS_ASC.columns])
+
+def rule_totals(rules) -> dict:
+    removed = RULE_INDEX.mask(rules) if rules else np.zeros(len(SELLERS_ASC), dtype=bool)
+    return scenario_pnl(removed)
+
+def rule_slider(metric: str):
+    label, op, default, step = RULE_METRICS[metric]
+    lo, hi = RULE_INDEX.bounds(metric)
+    lo, hi = np.floor(lo / step) * step, np.ceil(hi / step) * step
+    return dbc.Col([
+        html.Div(f"{label} {op}", className="text-muted small fw-semibold"),
+        dcc.Slider(id=f"rule_{metric}", min=lo, max=hi, step=step, value=float(np.clip(default, lo, hi)),
+                   marks=None, tooltip={"placement": "bottom", "always_visible": True}),
+    ], md=3)
+
+def rule_outputs(enabled, thresholds: dict):
+    rules = [(m, RULE_METRICS[m][1], t) for m, t in thresholds.items() if m in (enabled or []) and t is not None]
+    totals = rule_totals(rules)
+    removed = TOTAL_SELLERS - totals["n_sellers"]
+    delta = totals["net_profit"] - SCENARIO_BASE["net_profit"] if SCENARIO_BASE else 0.0
+    rule_txt = " ve ".join(f"{RULE_METRICS[m][0]} {op} {t:g}" for m, op, t in rules) or "Kural seçilmedi"
+    kpis = [
+        dbc.Col(kpi_card("Kurala Uyan", f"{removed}", "Çıkarılan satıcı", "🧹"), md=3),
+        dbc.Col(kpi_card("Kalan", f"{totals['n_sellers']}", "Aktif satıcı sayısı", "🏪"), md=3),
+        dbc.Col(kpi_card("Net Kâr", brl(totals["net_profit"]), f"IT maliyeti: {brl(totals['it_cost'])}", "📈"), md=3),
+        dbc.Col(kpi_card("Değişim", f"{'+' if delta >= 0 else ''}{brl(delta)}", "Baz duruma kıyasla", "🧭"), md=3),
+    ]
+    return f"📋 {rule_txt}", kpis, build_pl_snapshot_fig(totals)
+
 # -----------------------------
 # Layout
 # -----------------------------
@@ -154,7 +275,8 @@ layout = dbc.Container([
             html.I(className="bi bi-graph-up-arrow me-2"),
             html.B("Optimum Senaryo: "),
             f"En düşük performanslı {BEST_REMOVE_N} satıcı çıkarıldığında Net Kâr ",
-            html.B(brl(BEST_NET_VAL)), " seviyesine ulaşarak maksimize ediliyor."
+            html.B(brl(BEST_NET_VAL)), " seviyesine ulaşarak maksimize ediliyor.",
+            *band_text(BAND),
         ])
     ], color="primary", className="shadow-sm border-0 mb-3", style={"borderRadius": "12px"}),
 
@@ -165,16 +287,35 @@ layout = dbc.Container([
             tooltip={"placement": "bottom", "always_visible": True},
             marks={0: '0', BEST_REMOVE_N: {'label': 'İDEAL', 'style': {'color': '#0d6efd', 'fontWeight': 'bold'}}, TOTAL_SELLERS: str(TOTAL_SELLERS)}
         ),
-        html.Div(id="scenario_line", className="text-center mt-2 fw-bold text-primary")
+        html.Div(id="scenario_line", className="text-center mt-2 fw-bold text-primary"),
+        html.Div(id="order_impact_line", className="text-center mt-1 small text-muted"),
     ]), className="shadow-sm border-0 mb-3", style=CARD_STYLE),
 
     dbc.Row(id="kpi_row", className="g-3 mb-3"),
 
     dbc.Row([
-        dbc.Col(dcc.Graph(id="profit_curve", config={"displayModeBar": False}), md=7),
+        dbc.Col([
+            dcc.Graph(id="profit_curve", config={"displayModeBar": False}),
+            html.Div("🔍 Eğri üzerindeki bir noktaya tıklayarak o sıradaki satıcının detayına gidin.", className="text-muted small"),
+            dcc.Location(id="profit_curve_nav", refresh="callback-nav"),
+        ], md=7),
         dbc.Col(dcc.Graph(id="pl_snapshot", config={"displayModeBar": False}), md=5),
     ]),
 
+    # Kural Bazlı Senaryo
+    dbc.Card(dbc.CardBody([
+        html.H5("📋 Kural Bazlı Senaryo", className="fw-bold mb-1"),
+        html.Div("Seçili kuralların hepsine uyan satıcılar portföyden çıkarılır.", className="text-muted small mb-2"),
+        dbc.Checklist(
+            id="rule_enabled", value=DEFAULT_RULES, inline=True, className="mb-2",
+            options=[{"label": RULE_METRICS[m][0], "value": m} for m in RULE_INDEX.metrics],
+        ),
+        dbc.Row([rule_slider(m) for m in RULE_INDEX.metrics], className="g-3"),
+        html.Div(id="rule_line", className="text-center mt-3 fw-bold text-primary"),
+        dbc.Row(id="rule_kpi_row", className="g-3 mt-1"),
+        dcc.Graph(id="rule_pl_snapshot", config={"displayModeBar": False}),
+    ]), className="shadow-sm border-0 mt-3", style=CARD_STYLE),
+
     # Stratejik Notlar Bölümü
     dbc.Row([
         dbc.Col(
@@ -183,7 +324,7 @@ layout = dbc.Container([
                 html.Ul([
                     html.Li([html.B("Operasyonel Yük: "), "Zarar eden satıcılar sadece ciro kaybı değil, yüksek 'Review' maliyeti ile Net Kâr'ı eritiyor."]),
                     html.Li([html.B("Ölçek Ekonomisi: "), "IT maliyetleri satıcı sayısı ile doğrusal değil, karekök oranında azalıyor."]),
-                    html.Li([html.B("Altın Oran: "), f"Portföyün %{(BEST_REMOVE_N/TOTAL_SELLERS)*100:.1f} kadarını temizlemek teknik olarak en kârlı noktadır."]),
+                    html.Li([html.B("Altın Oran: "), f"Portföyün %{(BEST_REMOVE_N / max(TOTAL_SELLERS, 1))*100:.1f} kadarını temizlemek teknik olarak en kârlı noktadır."]),
                 ])
             ]), className="shadow-sm border-0 mt-3", style=CARD_STYLE),
             md=12
@@ -203,14 +344,16 @@ layout = dbc.Container([
     Output("profit_curve", "figure"),
     Output("pl_snapshot", "figure"),
     Output("scenario_line", "children"),
+    Output("order_impact_line", "children"),
     Output("kpi_row", "children"),
     Input("remove_sellers", "value"),
 )
 def update_scenario(remove_n):
     if remove_n is None: remove_n = 0
     
-    kept_df = SELLERS_ASC.iloc[int(remove_n):].copy()
-    totals = scenario_totals(kept_df)
+    removed = worst_n(int(remove_n))
+    impact = order_impact(removed)
+    totals = scenario_pnl(removed, impact)
     
     kept_count = totals["n_sellers"]
     removed_count = TOTAL_SELLERS - kept_count
@@ -218,7 +361,7 @@ def update_scenario(remove_n):
     fig_left = build_profit_curve_fig(kept_count)
     fig_right = build_pl_snapshot_fig(totals)
     
-    delta = totals["net_profit"] - BASE["net_profit"]
+    delta = totals["net_profit"] - SCENARIO_BASE["net_profit"] if SCENARIO_BASE else 0.0
     delta_txt = f"{'+' if delta >= 0 else ''}{brl(delta)}"
     
     scenario_text = f"🧹 {removed_count} satıcı çıkarıldı | 📈 Yeni Net Kâr: {brl(totals['net_profit'])}"
@@ -230,4 +373,29 @@ def update_scenario(remove_n):
         dbc.Col(kpi_card("Değişim", delta_txt, "Baz duruma kıyasla", "🧭"), md=3),
     ]
     
-    return fig_left, fig_right, scenario_text, kpis
\ No newline at end of file
+    return fig_left, fig_right, scenario_text, build_order_impact_text(impact), kpis
+
+@dash.callback(
+    Output("rule_line", "children"),
+    Output("rule_kpi_row", "children"),
+    Output("rule_pl_snapshot", "figure"),
+    Input("rule_enabled", "value"),
+    *[Input(f"rule_{m}", "value") for m in RULE_INDEX.metrics],
+)
+def update_rules(enabled, *thresholds):
+    # eşik → ikili arama ile kural bitmap'i, kesişimi sipariş matrisinde değerlendirilir
+    return rule_outputs(enabled, dict(zip(RULE_INDEX.metrics, thresholds)))
+
+@dash.callback(
+    Output("profit_curve_nav", "href"),
+    Input("profit_curve", "clickData"),
+    prevent_initial_call=True,
+)
+def open_seller_detail(click_data):
+    # x = portföydeki satıcı sayısı → kâra göre azalan sıradaki x. satıcı
+    if not click_data or not click_data.get("points"):
+        return dash.no_update
+    rank = int(click_data["points"][0]["x"])
+    if not 1 <= rank <= len(SELLERS_DESC):
+        return dash.no_update
+    return f"/satici?seller_id={SELLERS_DESC['seller_id'].iloc[rank - 1]}"
@@ -0,0 +1,151 @@
+# pages/seller_leaderboard.py
+import dash
+from dash import html, dcc, dash_table, Input, Output
+from dash.dash_table.Format import Format, Scheme, Group
+import dash_bootstrap_components as dbc
+import pandas as pd
+
+from olist import artifacts
+from olist.leaderboard import SellerTable
+
+dash.register_page(__name__, path="/satici-listesi", name="Satıcı Listesi")
+
+# -----------------------------
+# Styling helpers
+# -----------------------------
+CARD_STYLE = {"borderRadius": "14px"}
+PAGE_SIZE = 25
+TOP_K = 10
+
+def brl(x: float) -> str:
+    return f"{x:,.0f} BRL"
+
+def detail_href(seller_id: str) -> str:
+    return f"/satici?seller_id={seller_id}"
+
+# -----------------------------
+# Data load
+# -----------------------------
+COLUMNS = [
+    ("seller_id", "Satıcı", "text", None),
+    ("seller_state", "Eyalet", "text", None),
+    ("seller_city", "Şehir", "text", None),
+    ("n_orders", "Sipariş", "numeric", Format(group=Group.yes)),
+    ("quantity", "Ürün Adedi", "numeric", Format(group=Group.yes)),
+    ("sales", "Satış (BRL)", "numeric", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    ("review_score", "Ort. Puan", "numeric", Format(precision=2, scheme=Scheme.fixed)),
+    ("share_of_one_stars", "1★ Oranı", "numeric", Format(precision=1, scheme=Scheme.percentage)),
+    ("wait_time", "Bekleme (gün)", "numeric", Format(precision=1, scheme=Scheme.fixed)),
+    ("wait_time_p90", "Bekleme p90", "numeric", Format(precision=1, scheme=Scheme.fixed)),
+    ("delay_to_carrier_p90", "Kargoya Gecikme p90", "numeric", Format(precision=1, scheme=Scheme.fixed)),
+    ("cost_of_reviews", "Review Maliyeti", "numeric", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    ("revenues", "Gelir", "numeric", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+    ("profits", "Kâr (IT hariç)", "numeric", Format(precision=0, scheme=Scheme.fixed, group=Group.yes)),
+]
+COLUMN_IDS = [c[0] for c in COLUMNS]
+
+# Uzun kuyruk (p90) ortalamanın gizlediği 1★ riskini gösterir (olist/sketches.py)
+TAIL_COLUMNS = ["wait_time_p90", "delay_to_carrier_p90"]
+
+try:
+    SELLERS_DF = artifacts.load("seller_training").merge(
+        artifacts.load("seller_tail_metrics")[["seller_id"] + TAIL_COLUMNS], on="seller_id", how="left"
+    )[COLUMN_IDS].copy()
+except Exception:
+    SELLERS_DF = pd.DataFrame(columns=COLUMN_IDS)
+
+# Sıralama permütasyonları ve filtre maskeleri tablo nesnesinde önbelleklenir
+TABLE = SellerTable(SELLERS_DF)
+TOTAL_SELLERS = TABLE.n
+
+# Zarar eden satıcılar: tam sıralama yerine kısmi seçim (top-K)
+WORST = SELLERS_DF.iloc[TABLE.top_k("profits", TOP_K, ascending=True)] if TOTAL_SELLERS else SELLERS_DF
+LOSS_MAKERS = int((SELLERS_DF["profits"] < 0).sum()) if TOTAL_SELLERS else 0
+TOTAL_LOSS = float(SELLERS_DF.loc[SELLERS_DF["profits"] < 0, "profits"].sum()) if TOTAL_SELLERS else 0.0
+
+# -----------------------------
+# Layout
+# -----------------------------
+layout = dbc.Container([
+    html.H2("Satıcı Listesi — Kâr / Zarar Sürücüleri", className="mt-4 mb-1 fw-bold"),
+    html.P("Portföy simülasyonunun çıkardığı satıcıları sıralayın, filtreleyin ve inceleyin.", className="text-muted mb-3"),
+
+    dbc.Row([
+        dbc.Col(dbc.Card(dbc.CardBody([
+            html.Div("🏪 Toplam Satıcı", className="text-muted fw-semibold"),
+            html.H3(f"{TOTAL_SELLERS:,}", className="mt-2 mb-0 fw-bold"),
+        ]), className="shadow-sm h-100", style=CARD_STYLE), md=4),
+        dbc.Col(dbc.Card(dbc.CardBody([
+            html.Div("🧯 Zarar Eden Satıcı", className="text-muted fw-semibold"),
+            html.H3(f"{LOSS_MAKERS:,}", className="mt-2 mb-0 fw-bold text-danger"),
+        ]), className="shadow-sm h-100", style=CARD_STYLE), md=4),
+        dbc.Col(dbc.Card(dbc.CardBody([
+            html.Div("📉 Toplam Zarar", className="text-muted fw-semibold"),
+            html.H3(brl(TOTAL_LOSS), className="mt-2 mb-0 fw-bold text-danger"),
+        ]), className="shadow-sm h-100", style=CARD_STYLE), md=4),
+    ], className="g-3 mb-3"),
+
+    dbc.Card(dbc.CardBody([
+        html.H5(f"🚨 En Çok Zarar Ettiren {TOP_K} Satıcı", className="fw-bold mb-3"),
+        html.Ul([
+            html.Li([dcc.Link(html.Code(r.seller_id), href=detail_href(r.seller_id)), f" ({r.seller_state}) — ", html.B(brl(r.profits))])
+            for r in WORST.itertuples()
+        ], className="mb-0 small"),
+    ]), className="shadow-sm border-0 mb-3", style=CARD_STYLE),
+
+    dbc.Card(dbc.CardBody([
+        html.Div("🔎 Filtre örnekleri: SP, < 0, >= 4.5 — sütun başlığına tıklayarak sıralayın.", className="text-muted small mb-2"),
+        dash_table.DataTable(
+            id="leaderboard_table",
+            columns=[
+                {"name": name, "id": col, "type": typ, **({"format": fmt} if fmt else {}),
+                 **({"presentation": "markdown"} if col == "seller_id" else {})}
+                for col, name, typ, fmt in COLUMNS
+            ],
+            page_current=0,
+            page_size=PAGE_SIZE,
+            page_count=max(1, -(-TOTAL_SELLERS // PAGE_SIZE)),
+            page_action="custom",
+            sort_action="custom",
+            sort_mode="single",
+            sort_by=[{"column_id": "profits", "direction": "asc"}],
+            filter_action="custom",
+            filter_query="",
+            virtualization=True,
+            fixed_rows={"headers": True},
+            style_table={"height": "640px", "overflowY": "auto"},
+            style_cell={"fontFamily": "Inter, sans-serif", "fontSize": "13px", "padding": "6px", "minWidth": "90px"},
+            style_header={"fontWeight": "700", "backgroundColor": "#f4f6fb"},
+            style_data_conditional=[
+                {"if": {"filter_query": "{profits} < 0", "column_id": "profits"}, "color": "#e74c3c", "fontWeight": "700"},
+            ],
+        ),
+        html.Div(id="leaderboard_count", className="text-muted small mt-2"),
+    ]), className="shadow-sm border-0", style=CARD_STYLE),
+], fluid=True)
+
+# -----------------------------
+# Callback (sunucu taraflı sayfalama: sadece görünen sayfa gönderilir)
+# -----------------------------
+@dash.callback(
+    Output("leaderboard_table", "data"),
+    Output("leaderboard_table", "page_count"),
+    Output("leaderboard_count", "children"),
+    Input("leaderboard_table", "page_current"),
+    Input("leaderboard_table", "page_size"),
+    Input("leaderboard_table", "sort_by"),
+    Input("leaderboard_table", "filter_query"),
+)
+def update_table(page_current, page_size, sort_by, filter_query):
+    page_current = page_current or 0
+    page_size = page_size or PAGE_SIZE
+
+    rows, total = TABLE.page(page_current, page_size, sort_by, filter_query)
+    page_count = max(1, -(-total // page_size))
+
+    # Satıcı kimliği detay sayfasına bağlanır (/satici?seller_id=...)
+    records = rows.to_dict("records")
+    for r in records:
+        r["seller_id"] = f"[{r['seller_id']}]({detail_href(r['seller_id'])})"
+
+    return records, page_count, f"{total:,} satıcı eşleşti"
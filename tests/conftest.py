@@ -0,0 +1,8 @@
+import dash
+import pytest
+
+
+@pytest.fixture(scope="session")
+def pages_app():
+    """Dash app for importing single page modules (register_page needs one); no page folder is scanned."""
+    return dash.Dash(__name__, use_pages=True, pages_folder="")
@@ -0,0 +1,44 @@
+"""Every artifact lists the modules its builder reads, so code changes invalidate stored pickles."""
+import ast
+import importlib.util
+import inspect
+import re
+from pathlib import Path
+
+import pytest
+
+from olist import artifacts
+
+# Imported everywhere, but they do not shape artifact contents
+INFRASTRUCTURE = {"olist.perf", "olist.datasets"}
+
+
+def module_imports(module: str) -> set[str]:
+    """olist modules imported at module level (function-level imports are not followed)."""
+    tree = ast.parse(Path(importlib.util.find_spec(module).origin).read_text())
+    found = set()
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("olist"):
+            if node.module == "olist":
+                found.update(f"olist.{a.name}" for a in node.names)
+            else:
+                found.add(node.module)
+        elif isinstance(node, ast.Import):
+            found.update(a.name for a in node.names if a.name.startswith("olist."))
+    return found - INFRASTRUCTURE
+
+
+@pytest.mark.parametrize("name", sorted(artifacts.REGISTRY))
+def test_sources_cover_builder(name):
+    art = artifacts.REGISTRY[name]
+    sources = set(art.sources)
+    code = inspect.getsource(art.build)
+
+    for loader, modules in artifacts.LOADER_SOURCES.items():
+        if f"ctx.{loader}" in code:
+            assert set(modules) <= sources, f"{name} reads ctx.{loader}"
+    for module in re.findall(r"from (olist\.\w+) import", code):
+        assert module in sources, f"{name} imports {module}"
+    for module in art.sources:
+        missing = module_imports(module) - sources
+        assert not missing, f"{name}: {module} imports {sorted(missing)}"
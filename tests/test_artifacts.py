@@ -0,0 +1,43 @@
+import pytest
+
+from olist import artifacts, datasets
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    """Two artifacts without inputs that record the BuildContext they were built with."""
+    monkeypatch.setenv(artifacts.ARTIFACT_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(artifacts, "REGISTRY", {})
+    monkeypatch.setattr(artifacts, "_fingerprints", {})
+    monkeypatch.setattr(datasets, "CACHE", datasets.LRUCache(1 << 20))
+    monkeypatch.setattr(artifacts, "CACHE", datasets.CACHE)
+    contexts = []
+    for name in ("first", "second"):
+        artifacts.artifact(name, inputs=lambda: [], sources=())(lambda ctx, name=name: contexts.append(ctx) or name)
+    return contexts
+
+
+def test_shared_build_reuses_one_context(registry):
+    with artifacts.shared_build():
+        artifacts.load("first")
+        artifacts.load("second")
+    assert len(registry) == 2 and registry[0] is registry[1]
+
+
+def test_separate_loads_get_their_own_context(registry):
+    artifacts.load("first", force=True)
+    artifacts.load("second", force=True)
+    assert registry[0] is not registry[1]
+
+
+def test_fingerprint_is_memoized(registry, monkeypatch):
+    calls = []
+    compute = artifacts._fingerprint
+    monkeypatch.setattr(artifacts, "_fingerprint", lambda art, inputs: calls.append(art.name) or compute(art, inputs))
+    assert artifacts.fingerprint("first") == artifacts.fingerprint("first")
+    assert calls == ["first"]
+    monkeypatch.setattr(artifacts, "FINGERPRINT_TTL_S", 0.0)
+    artifacts._fingerprints.clear()
+    artifacts.fingerprint("first")
+    artifacts.fingerprint("first")
+    assert calls == ["first"] * 3
@@ -0,0 +1,17 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="module")
+def page(pages_app):
+    return importlib.import_module("pages.category_pnl")
+
+
+def test_layout_with_empty_fallback(page, monkeypatch):
+    empty = pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=[None, None]))
+    monkeypatch.setattr(page, "load_categories", lambda dataset=None: empty)
+    assert page.layout() is not None
+    kpis, fig, records = page.update_categories("sum", None, "profits")
+    assert len(fig.data[0].x) == 0 and records == []
@@ -0,0 +1,50 @@
+import threading
+
+from olist import datasets
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = datasets.LRUCache(10, weigh=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    assert cache.get("a") == "xxxx"      # b is now the oldest
+    cache.put("c", "xxxx")
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert (len(cache), cache.bytes, cache.evictions) == (2, 8, 1)
+    # replacing a key re-weighs it
+    cache.put("a", "x")
+    assert cache.bytes == 5
+
+
+def test_newest_entry_is_always_kept():
+    cache = datasets.LRUCache(10, weigh=len)
+    cache.put("a", "xxxx")
+    cache.put("big", "x" * 50)
+    assert len(cache) == 1 and "big" in cache
+    assert cache.bytes == 50 and cache.stats()["keys"] == ["big"]
+
+
+def test_use_is_isolated_per_thread(monkeypatch):
+    monkeypatch.setenv(datasets.DATASETS_ENV, "one=/tmp/one,two=/tmp/two")
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def worker(name):
+        with datasets.use(name):
+            barrier.wait()               # both threads are inside `use` at once
+            seen[name] = (datasets.active_name(), datasets.active_data_dir())
+            barrier.wait()
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ("one", "two")]
+    with datasets.use("two"):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert datasets.active_name() == "two"
+    assert datasets.active_name() is None
+    assert seen["one"][0] == "one" and seen["one"][1].name == "one"
+    assert seen["two"][0] == "two" and seen["two"][1].name == "two"
+    # unknown names fall back to the default dataset
+    with datasets.use("missing"):
+        assert datasets.active_name() == datasets.DEFAULT and datasets.active_data_dir() is None
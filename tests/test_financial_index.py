@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from olist.financial_index import FinancialIndex
+from olist.seller_updated import COST_MAP
+
+
+def test_sellers_without_sale_dates():
+    data = {
+        "orders": pd.DataFrame({"order_id": ["o1", "o2"],
+                                "order_purchase_timestamp": ["2017-01-10", "2017-03-05"]}),
+        "order_items": pd.DataFrame({"order_id": ["o1", "o2"], "seller_id": ["a", "a"], "price": [10.0, 20.0]}),
+        "order_reviews": pd.DataFrame({"order_id": ["o1"], "review_score": [1]}),
+    }
+    sellers = pd.DataFrame({
+        "seller_id": ["a", "b"], "seller_state": ["SP", "RJ"],
+        "date_first_sale": ["2017-01-10", None], "date_last_sale": ["2017-03-05", None],
+        "months_on_olist": [3.0, 0.0],
+    })
+    index = FinancialIndex.build(data, sellers)
+    assert index.months == ["2017-01", "2017-02", "2017-03"]
+    totals = index.query()
+    assert (totals["sales"], totals["cost_of_reviews"], totals["subscription_months"]) == (30.0, 100.0, 3.0)
+    # b has no sale: never counted as active
+    assert totals["n_sellers"] == 1
+    assert index.query(states=["RJ"])["n_sellers"] == 0
+
+
+def test_query_matches_pandas_groupby():
+    data = {
+        "orders": pd.DataFrame({"order_id": ["o1", "o2", "o3", "o4", "o5"],
+                                "order_purchase_timestamp": ["2017-01-10", "2017-02-05", "2017-02-20",
+                                                             "2017-04-01", None]}),
+        "order_items": pd.DataFrame({"order_id": ["o1", "o1", "o2", "o3", "o4", "o5"],
+                                     "seller_id": ["a", "b", "a", "c", "b", "c"],
+                                     "price": [10.0, 5.0, 20.0, 7.0, 30.0, 99.0]}),
+        "order_reviews": pd.DataFrame({"order_id": ["o1", "o2", "o4"], "review_score": [1, 3, 5]}),
+    }
+    # approval dates deliberately disagree with the purchase months
+    sellers = pd.DataFrame({
+        "seller_id": ["a", "b", "c"], "seller_state": ["SP", "RJ", "SP"],
+        "date_first_sale": ["2016-12-01", "2017-03-01", None], "date_last_sale": ["2017-05-01", None, None],
+        "months_on_olist": [2.0, 3.0, 1.0],
+    })
+    index = FinancialIndex.build(data, sellers)
+
+    month = pd.to_datetime(data["orders"].set_index("order_id")["order_purchase_timestamp"]).dt.to_period("M")
+    rows = data["order_items"].assign(month=lambda d: d["order_id"].map(month)).dropna(subset=["month"])
+    rows = rows.merge(sellers[["seller_id", "seller_state"]], on="seller_id")
+    reviews = rows.merge(data["order_reviews"], on="order_id")
+    reviews["cost"] = reviews["review_score"].map(COST_MAP)
+    span = rows.groupby("seller_id")["month"].agg(["min", "max"])
+    periods = pd.PeriodIndex(index.months, freq="M")
+
+    for states in [None, ["SP"], ["RJ"]]:
+        for start in range(len(periods)):
+            for end in range(start, len(periods)):
+                lo, hi = periods[start], periods[end]
+                in_state = rows["seller_state"].isin(states) if states else True
+                sel = rows[in_state & rows["month"].between(lo, hi)]
+                rev = reviews[(reviews["seller_state"].isin(states) if states else True)
+                              & reviews["month"].between(lo, hi)]
+                active = span[(span["min"] <= hi) & (span["max"] >= lo)].index
+                if states:
+                    active = active[sellers.set_index("seller_id").loc[active, "seller_state"].isin(states)]
+                got = index.query(states, start, end)
+                assert got["sales"] == pytest.approx(sel["price"].sum())
+                assert got["quantity"] == len(sel)
+                assert got["cost_of_reviews"] == pytest.approx(rev["cost"].sum())
+                assert got["n_sellers"] == len(active)
+    assert index.query()["subscription_months"] == pytest.approx(6.0)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from olist.geo import StateFlows
+
+PAIRS = pd.DataFrame({
+    "origin": ["SP", "SP", "SP", "RJ", "RJ", "MG"],
+    "destination": ["SP", "RJ", "RJ", "SP", None, "SP"],   # one missing destination
+    "wait_time": [2.0, 5.0, 7.0, 4.0, 9.0, np.nan],        # one NaN metric
+    "delay_vs_expected": [0.0, 1.0, 0.0, 3.0, 0.0, 2.0],
+    "review_cost": [0.0, 100.0, 40.0, 0.0, 50.0, 100.0],
+    "distance_km": [10.0, 400.0, 420.0, 390.0, np.nan, 500.0],
+})
+
+
+def flows():
+    return StateFlows.from_pairs(PAIRS["origin"], PAIRS["destination"], PAIRS[list(StateFlows.METRICS)].to_numpy())
+
+
+def expected(by):
+    """Direct groupby: pairs without a destination are dropped, NaN metrics skipped by mean."""
+    rows = PAIRS.dropna(subset=["destination"])
+    grouped = rows.groupby(by)
+    out = grouped[list(StateFlows.METRICS)].mean()
+    out.insert(0, "pairs", grouped.size())
+    return out
+
+
+def test_flows_match_groupby_mean():
+    got = flows().flows().set_index(["origin", "destination"]).sort_index()
+    want = expected(["origin", "destination"]).sort_index()
+    pd.testing.assert_frame_equal(got, want, check_dtype=False, check_names=False)
+
+
+def test_totals_by_state_match_groupby_mean():
+    sf = flows()
+    for by in ["origin", "destination"]:
+        got = sf.totals(by=by)
+        # states with no pair on that side are listed with 0 pairs and no means
+        want = expected(by).reindex(got.index).fillna({"pairs": 0})
+        pd.testing.assert_frame_equal(got, want, check_dtype=False, check_names=False)
+    overall = sf.totals().iloc[0]
+    rows = PAIRS.dropna(subset=["destination"])
+    assert overall["pairs"] == len(rows)
+    assert overall["wait_time"] == rows["wait_time"].mean()
+
+
+def test_mean_matrix_and_filters():
+    sf = flows()
+    assert sf.states == ["MG", "RJ", "SP"]
+    matrix = sf.mean("wait_time")
+    assert matrix.loc["SP", "RJ"] == 6.0
+    # the MG → SP pair has no wait time: the cell exists but has no mean
+    assert np.isnan(matrix.loc["MG", "SP"]) and sf.flows(origins="MG")["pairs"].tolist() == [1]
+    assert sf.totals(origins=["SP"], destinations=["RJ"]).iloc[0]["pairs"] == 2
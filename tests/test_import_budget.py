@@ -0,0 +1,11 @@
+import subprocess
+import sys
+
+from benchmarks.import_budget import PROJECT_ROOT
+
+
+def test_import_budget():
+    """benchmarks/import_budget.py in a fresh interpreter: every module within budget, no eager heavy imports."""
+    out = subprocess.run([sys.executable, "-m", "benchmarks.import_budget"],
+                         cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert out.returncode == 0, out.stdout + out.stderr
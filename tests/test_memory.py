@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from olist import datasets, memory
+
+
+def test_dataset_cache_entries_are_reported(monkeypatch):
+    cache = datasets.LRUCache(1 << 30)
+    monkeypatch.setattr(datasets, "CACHE", cache)
+    frame = pd.DataFrame({"x": np.arange(1000)})
+    cache.put(("training", "fp1"), frame)
+    cache.put(("pair", "fp2"), (np.arange(1000.0), pd.Series(np.ones(1000))))
+    # the same artifact of a second dataset
+    cache.put(("training", "fp3"), frame.copy())
+
+    tables = memory.collect()
+    assert {"datasets.CACHE[training@fp1]", "datasets.CACHE[training@fp3]",
+            "datasets.CACHE[pair][0]", "datasets.CACHE[pair][1]"} <= set(tables)
+    r = memory.report({"datasets.CACHE[training@fp1]": tables["datasets.CACHE[training@fp1]"]}, duplicates=False)
+    assert r["tables"][0]["columns"] == {"x": 8000}
@@ -0,0 +1,66 @@
+import tracemalloc
+
+import pytest
+
+from olist import perf
+
+MB = 1024 ** 2
+
+
+@pytest.fixture
+def trace_memory(monkeypatch):
+    monkeypatch.setattr(perf, "TRACE_MEMORY", True)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    yield
+    if started:
+        tracemalloc.stop()
+
+
+def test_alloc_bytes_is_the_peak_of_freed_memory(trace_memory):
+    with perf._Measure() as m:
+        buf = bytearray(4 * MB)
+        del buf
+    assert m.alloc_bytes >= 4 * MB
+
+
+def test_nested_peak_reaches_the_outer_block(trace_memory):
+    with perf._Measure() as outer:
+        with perf._Measure() as inner:
+            buf = bytearray(4 * MB)
+            del buf
+        small = bytearray(MB)
+    del small
+    assert inner.alloc_bytes >= 4 * MB
+    assert outer.alloc_bytes >= inner.alloc_bytes
+    assert perf._memory.peaks == []
+
+
+def test_requests_do_not_hold_the_memory_lock(trace_memory, monkeypatch):
+    import threading
+
+    import flask
+
+    monkeypatch.setattr(perf, "ENABLED", True)
+    server = flask.Flask(__name__)
+    perf.install(server)
+
+    @server.route("/probe")
+    def probe():
+        # another request thread could start a measured block right now
+        free = []
+
+        def try_lock():
+            free.append(perf._memory_lock.acquire(blocking=False))
+            if free[0]:
+                perf._memory_lock.release()
+
+        t = threading.Thread(target=try_lock)
+        t.start()
+        t.join()
+        return {"free": free[0]}
+
+    client = server.test_client()
+    assert client.get("/probe").get_json() == {"free": True}
+    assert "warning" in client.get("/_perf").get_json()
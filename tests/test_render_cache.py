@@ -0,0 +1,61 @@
+import gzip
+import json
+
+import flask
+import pytest
+
+from olist import render_cache
+
+ROUTE = {"output": "..._pages_content.children...", "inputs": [
+    {"id": "_pages_location", "property": "pathname", "value": "/x"},
+    {"id": "_pages_location", "property": "search", "value": ""},
+]}
+
+
+class FakeApp:
+    """Flask server with a stand-in for the Dash pages routing callback."""
+
+    def __init__(self):
+        self.server = flask.Flask(__name__)
+        self.renders = 0
+
+        @self.server.post("/_dash-update-component")
+        def update():
+            self.renders += 1
+            return flask.jsonify({"response": {"_pages_content": {"children": "x" * 2000}}})
+
+    @staticmethod
+    def strip_relative_path(path):
+        return path.strip("/")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(render_cache, "CACHE", render_cache.datasets.LRUCache(1 << 20, weigh=lambda p: p.nbytes))
+    monkeypatch.setattr(render_cache, "cached_pages",
+                        lambda: {"x": {"path": "/x", "render_cache": (), "layout": lambda **kw: None}})
+    app = FakeApp()
+    render_cache.install(app)
+    return app
+
+
+def test_miss_is_gzipped_and_revalidates(app):
+    client = app.server.test_client()
+    miss = client.post("/_dash-update-component", json=ROUTE, headers={"Accept-Encoding": "gzip"})
+    assert miss.headers["X-Render-Cache"] == "miss" and miss.headers["Content-Encoding"] == "gzip"
+    body = json.loads(gzip.decompress(miss.get_data()))
+    assert body["response"]["_pages_content"]["children"] == "x" * 2000
+
+    etag = miss.headers["ETag"]
+    not_modified = client.post("/_dash-update-component", json=ROUTE, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.get_data() == b""
+    hit = client.post("/_dash-update-component", json=ROUTE, headers={"If-None-Match": 'W/"other"'})
+    assert hit.status_code == 200 and hit.headers["X-Render-Cache"] == "hit"
+    assert json.loads(hit.get_data()) == body
+    assert app.renders == 1
+
+
+def test_dataset_key_only_for_dataset_layouts():
+    assert render_cache._takes_dataset(lambda dataset=None, **kwargs: None)
+    assert not render_cache._takes_dataset(lambda **kwargs: None)
+    assert not render_cache._takes_dataset(object())
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from olist import resampling
+from olist.scenario import compute_it_cost
+
+
+@pytest.fixture
+def sellers():
+    rng = np.random.default_rng(7)
+    return rng.normal(50, 200, size=40), rng.integers(1, 30, size=40)
+
+
+def test_unit_weights_match_the_cumulative_curve(sellers):
+    gross, quantity = sellers
+    curve = resampling.profit_curves(np.ones((1, len(gross))), gross, quantity, compute_it_cost)[0]
+    # the seller impact page's curve: sellers kept, best first (removal order reversed)
+    kept = np.arange(1, len(gross) + 1)
+    cum_net = np.cumsum(gross[::-1]) - compute_it_cost(kept, np.cumsum(quantity[::-1]))
+    np.testing.assert_allclose(curve, cum_net[::-1])
+    assert np.argmax(curve) == len(gross) - 1 - np.argmax(cum_net)
+
+
+def test_bootstrap_weights_rows_sum_to_sellers():
+    weights = resampling.bootstrap_weights(5, 12, seed=3)
+    assert weights.shape == (5, 12)
+    assert (weights.sum(axis=1) == 12).all()
+
+
+def test_seed_reproducible_across_jobs(sellers, monkeypatch):
+    gross, quantity = sellers
+    # several chunks, so threads actually split the work
+    monkeypatch.setattr(resampling, "CHUNK_BYTES", 8 * 4 * len(gross) * 7)
+    runs = [resampling.bootstrap_optimum(gross, quantity, compute_it_cost, n_replicates=50, seed=11, n_jobs=n)
+            for n in (1, 2, 4)]
+    for run in runs[1:]:
+        pd.testing.assert_frame_equal(run, runs[0])
+    other = resampling.bootstrap_optimum(gross, quantity, compute_it_cost, n_replicates=50, seed=12, n_jobs=1)
+    assert not other.equals(runs[0])
+
+
+def test_confidence_band():
+    replicates = pd.DataFrame({"remove_n": np.arange(101), "net_profit": np.linspace(0.0, 1.0, 101)})
+    band = resampling.confidence_band(replicates, level=0.9)
+    assert band["remove_n"] == pytest.approx((5.0, 50.0, 95.0))
+    assert band["net_profit"] == pytest.approx((0.05, 0.5, 0.95))
@@ -0,0 +1,41 @@
+import flask
+import pandas as pd
+import pytest
+
+from olist import artifacts, scenario
+
+SELLERS = pd.DataFrame({"seller_id": ["a", "b"], "quantity": [1, 2], "revenues": [500.0, 800.0],
+                        "cost_of_reviews": [100.0, 50.0]})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(scenario, "default_evaluator", lambda: scenario.ScenarioEvaluator(SELLERS))
+    server = flask.Flask(__name__)
+    scenario.install(server)
+    return server.test_client()
+
+
+@pytest.mark.parametrize("payload", [{"removed": []}, {"keep": []}])
+def test_empty_batch(client, payload):
+    r = client.post("/api/scenarios", json=payload)
+    assert r.status_code == 200
+    assert r.get_json()["n"] == 0
+
+
+def test_keep_and_removed_agree(client):
+    removed = client.post("/api/scenarios", json={"removed": [["a"], []]}).get_json()
+    keep = client.post("/api/scenarios", json={"keep": [[0, 1], [1, 1]]}).get_json()
+    assert removed == keep and removed["columns"]["revenue"] == [800.0, 1300.0]
+
+
+def test_default_evaluator_follows_fingerprint(monkeypatch):
+    fingerprint = {"seller_training": "v1"}
+    monkeypatch.setattr(artifacts, "fingerprint", lambda name: fingerprint[name])
+    # a fresh copy per load: the evaluator is keyed on the data version, not the object
+    monkeypatch.setattr(artifacts, "load", lambda name: SELLERS.copy())
+    monkeypatch.setattr(scenario, "_evaluator", None)
+    first = scenario.default_evaluator()
+    assert scenario.default_evaluator() is first
+    fingerprint["seller_training"] = "v2"
+    assert scenario.default_evaluator() is not first
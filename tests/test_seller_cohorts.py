@@ -0,0 +1,39 @@
+import importlib
+
+import numpy as np
+import pytest
+
+from olist.cohort import SellerCohorts
+
+
+@pytest.fixture(scope="module")
+def page(pages_app):
+    return importlib.import_module("pages.seller_cohorts")
+
+
+@pytest.fixture
+def small_state():
+    # three sellers, first sales in two months: every cohort is below the default min size (5)
+    return SellerCohorts.from_activity(["a", "a", "b", "c"], np.array([0, 1, 0, 1]) + 2017 * 12)
+
+
+def test_heatmap_without_cohorts_above_min_size(page, small_state):
+    fig = page.build_heatmap(small_state, "retained", 5)
+    assert len(fig.data) == 0
+
+
+def test_heatmap_labels_observed_cells(page, small_state):
+    fig = page.build_heatmap(small_state, "retained", 1)
+    assert fig.data[0].text[0][0] == "100%"
+
+
+def test_update_for_small_state(page, small_state, monkeypatch):
+    monkeypatch.setattr(page, "load_cohorts", lambda dataset=None: {"ALL": small_state, "AC": small_state})
+    for state, min_size in [("AC", 5), (None, 50), ("AC", 1)]:
+        kpis, heatmap, curve, revenue = page.update_cohorts(state, "retained", min_size)
+        assert len(kpis) == 4
+
+
+def test_layout_with_empty_fallback(page, monkeypatch):
+    monkeypatch.setattr(page, "load_cohorts", lambda dataset=None: {"ALL": SellerCohorts.from_activity([], [])})
+    assert page.layout() is not None
@@ -0,0 +1,71 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+from olist.incidence import OrderSellerIncidence
+from olist.scenario import ScenarioEvaluator
+
+
+@pytest.fixture(scope="module")
+def page(pages_app):
+    return importlib.import_module("pages.seller_impact")
+
+
+@pytest.fixture
+def sellers(page, monkeypatch):
+    """c alone sold o2 (2★, cost 50); a and b share o1 (1★, cost 100). Scenario order: c, a, b."""
+    sellers = pd.DataFrame({
+        "seller_id": ["c", "a", "b"], "quantity": [1, 1, 1], "revenues": [100.0, 500.0, 800.0],
+        "cost_of_reviews": [50.0, 100.0, 100.0],
+    })
+    data = {
+        "order_items": pd.DataFrame({"order_id": ["o1", "o1", "o2"], "seller_id": ["a", "b", "c"],
+                                     "price": [10.0, 20.0, 30.0]}),
+        "order_reviews": pd.DataFrame({"order_id": ["o1", "o2"], "review_score": [1, 2]}),
+    }
+    monkeypatch.setattr(page, "SELLERS_ASC", sellers)
+    monkeypatch.setattr(page, "TOTAL_SELLERS", 3)
+    monkeypatch.setattr(page, "SCENARIOS", ScenarioEvaluator(sellers))
+    monkeypatch.setattr(page, "INCIDENCE", OrderSellerIncidence(data, sellers["seller_id"]))
+    return page
+
+
+def test_review_cost_is_order_level_with_incidence(sellers):
+    page = sellers
+    # o1 is reviewed once, not once per seller
+    assert page.scenario_pnl(page.worst_n(0))["review_cost"] == 150.0
+    totals = page.scenario_pnl(page.worst_n(1))
+    assert totals["review_cost"] == 100.0
+    assert totals["net_profit"] == 1300.0 - 100.0 - totals["it_cost"]
+    # removing a leaves o1 partial: its review cost stays
+    impact = page.order_impact(page.worst_n(2))
+    assert page.scenario_pnl(page.worst_n(2), impact)["review_cost"] == 100.0
+    assert "kısmen" in page.build_order_impact_text(impact)
+
+
+def test_prefix_review_cost_matches_order_level_scenarios(sellers):
+    page = sellers
+    cost, fixed = page.INCIDENCE.prefix_review_cost()
+    for n in range(4):
+        expected = page.scenario_pnl(page.worst_n(n))["review_cost"]
+        assert fixed + cost[n:].sum() == expected
+
+
+def test_rules_share_the_slider_baseline(sellers, monkeypatch):
+    page = sellers
+    index = page.ThresholdIndex(page.SELLERS_ASC.assign(score=[1.0, 2.0, 3.0]), ["score"])
+    monkeypatch.setattr(page, "RULE_INDEX", index)
+    assert page.rule_totals([]) == page.scenario_pnl(page.worst_n(0))
+    assert page.rule_totals([("score", "<", 0.0)]) == page.scenario_pnl(page.worst_n(0))
+    # removing b alone keeps o1 (a still sells in it)
+    assert page.rule_totals([("score", ">", 2.5)])["review_cost"] == 150.0
+
+
+def test_seller_level_model_without_incidence(sellers, monkeypatch):
+    page = sellers
+    monkeypatch.setattr(page, "INCIDENCE", None)
+    assert page.order_impact(page.worst_n(1)) is None
+    assert page.scenario_pnl(page.worst_n(0))["review_cost"] == 250.0
+    assert page.scenario_pnl(page.worst_n(1))["review_cost"] == 200.0
+    assert page.build_order_impact_text(None) == ""
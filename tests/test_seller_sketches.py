@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from olist.seller_updated import Seller
+
+
+def test_streamed_sketches_match_in_memory(tmp_path):
+    orders = pd.DataFrame({
+        "order_id": ["o1", "o2", "o3"], "customer_id": ["c1", "c2", "c1"],
+        "order_status": ["delivered", "delivered", "canceled"],
+        "order_purchase_timestamp": ["2017-01-01", "2017-01-02", "2017-01-03"],
+        "order_delivered_carrier_date": ["2017-01-03", "2017-01-04", None],
+        "order_delivered_customer_date": ["2017-01-06", "2017-01-12", None],
+    })
+    items = pd.DataFrame({
+        "order_id": ["o1", "o2", "o3", "o2"], "seller_id": ["a", "a", "b", "b"],
+        "shipping_limit_date": ["2017-01-02", "2017-01-05", "2017-01-04", "2017-01-03"],
+        "price": [10.0, 20.0, 30.0, 40.0],
+    })
+    orders.to_csv(tmp_path / Seller.FILES["orders"], index=False)
+    items.to_csv(tmp_path / Seller.FILES["order_items"], index=False)
+
+    seller = Seller.__new__(Seller)
+    seller.data = {"orders": orders, "order_items": items}
+    in_memory = seller.get_seller_sketches(chunksize=3)
+    streamed = Seller.stream_sketches(tmp_path, chunksize=3)
+
+    for name in ["wait_time", "delay_to_carrier"]:
+        expected = in_memory[name].quantiles((0.5,)).sort_index()
+        pd.testing.assert_frame_equal(streamed[name].quantiles((0.5,)).sort_index(), expected)
+    for name in ["orders", "customers"]:
+        pd.testing.assert_series_equal(streamed[name].estimate().sort_index(),
+                                       in_memory[name].estimate().sort_index())
+    # b: o3 is not delivered, o2 waited 10 days
+    assert streamed["wait_time"].quantiles((0.5,)).loc["b"].iloc[0] == pytest.approx(10.0, rel=0.02)
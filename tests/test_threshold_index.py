@@ -0,0 +1,62 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from olist.threshold_index import OPERATORS, ThresholdIndex
+
+SELLERS = pd.DataFrame({
+    "seller_id": list("abcdefgh"),
+    "score": [1.0, 2.0, 2.0, np.nan, 3.0, 2.0, np.nan, 4.5],
+    "delay": [0.0, 5.0, np.nan, 1.0, 1.0, 3.0, 2.0, 0.0],
+    "quantity": [1, 2, 3, 4, 5, 6, 7, 8],
+    "revenues": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0],
+    "cost_of_reviews": [100.0, 0.0, 50.0, 40.0, 0.0, 100.0, 0.0, 50.0],
+})
+COMPARE = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+
+def brute_force(rules) -> np.ndarray:
+    """pandas filter: NaN never matches a rule."""
+    match = pd.Series(True, index=SELLERS.index)
+    for metric, op, threshold in rules:
+        match &= COMPARE[op](SELLERS[metric], threshold).fillna(False)
+    matched = SELLERS[match]
+    return np.array([len(matched), matched["quantity"].sum(), matched["revenues"].sum(),
+                     matched["cost_of_reviews"].sum()], dtype=float)
+
+
+@pytest.fixture(scope="module")
+def index():
+    return ThresholdIndex(SELLERS, ["score", "delay"])
+
+
+# every observed value (exact ties) plus values between and outside them
+THRESHOLDS = [0.0, 1.0, 1.5, 2.0, 3.0, 4.5, 5.0, 6.0]
+
+
+@pytest.mark.parametrize("op", OPERATORS)
+def test_single_rule_prefix_path(index, op):
+    for metric, threshold in itertools.product(["score", "delay"], THRESHOLDS):
+        rules = [(metric, op, threshold)]
+        np.testing.assert_allclose(index.matched_sums(rules), brute_force(rules))
+        # the mask path agrees with the prefix-sum path
+        np.testing.assert_allclose(index.mask(rules) @ index.values, brute_force(rules))
+
+
+def test_compound_rules_mask_path(index):
+    for op1, op2 in itertools.product(OPERATORS, repeat=2):
+        for t1, t2 in itertools.product([1.0, 2.0, 3.0], [0.0, 1.0, 3.0]):
+            rules = [("score", op1, t1), ("delay", op2, t2)]
+            np.testing.assert_allclose(index.matched_sums(rules), brute_force(rules))
+
+
+def test_no_rules_and_kept_totals(index):
+    assert not index.matched_sums([]).any()
+    kept = index.kept_totals([("score", ">=", 2.0)])
+    # a, plus d and g (NaN score), are kept
+    assert (kept["n_sellers"], kept["n_items"], kept["revenue"]) == (3, 12, 120.0)
+    assert kept["gross_profit"] == kept["revenue"] - kept["review_cost"]
+    with pytest.raises(ValueError):
+        index.matched_sums([("score", "==", 2.0)])